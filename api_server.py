@@ -7,27 +7,51 @@ This allows the React frontend to interact with the construction estimator backe
 Endpoints:
 - POST /api/natural_search: Full-text search
 - POST /api/vector_search: Semantic vector search
+- POST /api/vector_search_batch: Semantic search for many queries at once
 - POST /api/quick_calculate: Cost calculation
 - POST /api/show_rate_details: Detailed resource breakdown
+- POST /api/show_rate_details_stream: The same breakdown streamed as NDJSON
+- POST /api/compare_variants: Side-by-side rate comparison
+- POST /api/batch: Run several of the above calls in one request
+- GET /api/natural_search, /api/vector_search, /api/show_rate_details,
+  /api/compare_variants: Cacheable query-string variants of the above
 - GET /health: Health check endpoint
 
 Author: Construction Estimator Team
 """
 
+import asyncio
+import hashlib
+import inspect
 import logging
 import os
-from typing import Optional, List
+import re
+import threading
+from contextlib import asynccontextmanager, suppress
+from functools import partial
+from typing import Any, Dict, Optional, List, Tuple
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+import anyio
+import anyio.to_thread
+import orjson
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 import uvicorn
 
 from src.database.db_manager import DatabaseManager
+from src.database.sqlite_pool import SqlitePool
 from src.search.search_engine import SearchEngine
-from src.search.cost_calculator import CostCalculator
+from src.search.cost_calculator import CostCalculator, cost_summary
+from src.search.embedding_cache import EmbeddingCache
 from src.search.rate_comparator import RateComparator
+from src.search.semantic_cache import SemanticCache
 from src.search.vector_engine import VectorSearchEngine
 
 
@@ -38,15 +62,451 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Database path and worker settings
+DB_PATH = os.getenv("DATABASE_PATH", "data/processed/estimates.db")
+
+# Number of worker threads available for blocking DB/search calls
+THREADPOOL_TOKENS = int(os.getenv("THREADPOOL_TOKENS", "100"))
+
+# Pooled read connections per worker. Each one carries its own page cache
+# and mmap (READ_PRAGMAS), so keep this near the core count, not the number
+# of threads.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(os.cpu_count() or 4)))
+
+# Seconds a request waits for a pooled connection before answering 503
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# Responses smaller than this many bytes are sent uncompressed
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+
+# Idle keep-alive timeout; keep above the reverse proxy's upstream keepalive
+KEEP_ALIVE_TIMEOUT = int(os.getenv("KEEP_ALIVE_TIMEOUT", "65"))
+
+# max-age for Cache-Control on GET responses (nginx/CDN/browser caching)
+GET_CACHE_MAX_AGE = int(os.getenv("GET_CACHE_MAX_AGE", "60"))
+
+# Seconds between background database health checks
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+
+# In-process cache for search results (per worker)
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "4096"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "300"))
+
+search_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+search_cache_lock = threading.Lock()
+
+# Shared search result cache across workers (disabled if REDIS_URL is unset)
+REDIS_URL = os.getenv("REDIS_URL")
+REDIS_CACHE_TTL = int(os.getenv("REDIS_CACHE_TTL", "600"))
+
+# Semantic cache for vector search (empty path disables it)
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH", "data/cache/semantic_cache.db")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "86400"))
+
+# Query embeddings shared by all workers and kept across restarts
+# (empty path disables it)
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH", "data/cache/embedding_cache.db"
+)
+
+
+# Rate code anywhere in a query, e.g. "ГЭСНп10-05-001-01" or "10-05-001"
+_RATE_CODE_IN_QUERY_RE = re.compile(r"\d{2}-\d{2}-\d{3}")
+
+# Whole identifier is a rate code, e.g. "10-05-001-01" or "ГЭСНп10-05-001-01"
+_RATE_CODE_RE = re.compile(r"^[А-ЯЁа-яёA-Z]*\d{1,3}-\d{2}-\d{3}-\d{2}$")
+
+
+def init_services(app: FastAPI) -> None:
+    """
+    Connect to the database and initialize services on app.state.
+
+    Called from the lifespan handler, so each uvicorn worker opens its own
+    SQLite connections once, after fork. SearchEngine/CostCalculator are
+    request-scoped (see get_conn below).
+
+    Sets app.state attributes: db_pool, db_slots, rate_comparator,
+    semantic_cache, embedding_cache, vector_engine.
+
+    Raises:
+        FileNotFoundError: If the database file does not exist
+    """
+    if not Path(DB_PATH).exists():
+        logger.error("Database file not found: %s", DB_PATH)
+        raise FileNotFoundError(f"Database file not found: {DB_PATH}")
+
+    logger.info("Initializing API server with database: %s", DB_PATH)
+
+    # Requests check a connection out of the pool for their duration
+    db_pool = SqlitePool(DB_PATH, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT)
+    db_pool.open()
+    logger.info("SqlitePool connected successfully (%d connections)", DB_POOL_SIZE)
+
+    # Load the FTS5 index before the first request (optimized at build time)
+    db_pool.prewarm(optimize=False)
+
+    app.state.db_pool = db_pool
+    # One slot per connection; see pooled_connection()
+    app.state.db_slots = anyio.Semaphore(DB_POOL_SIZE)
+    app.state.rate_comparator = RateComparator(DB_PATH, db_manager=db_pool)
+    app.state.semantic_cache = None
+    app.state.embedding_cache = None
+    app.state.vector_engine = None
+
+    # Initialize VectorSearchEngine
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if openai_api_key:
+        if SEMANTIC_CACHE_PATH:
+            app.state.semantic_cache = SemanticCache(
+                SEMANTIC_CACHE_PATH,
+                similarity_threshold=SEMANTIC_CACHE_THRESHOLD,
+                ttl=SEMANTIC_CACHE_TTL,
+            )
+            app.state.semantic_cache.open()
+
+        if EMBEDDING_CACHE_PATH:
+            app.state.embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH)
+            app.state.embedding_cache.open()
+
+        app.state.vector_engine = VectorSearchEngine(
+            db_manager=db_pool,
+            api_key=openai_api_key,
+            base_url=os.getenv("OPENAI_BASE_URL"),
+            semantic_cache=app.state.semantic_cache,
+            embedding_cache=app.state.embedding_cache,
+        )
+        logger.info("VectorSearchEngine initialized")
+    else:
+        logger.warning("OPENAI_API_KEY not set - vector search unavailable")
+
+    logger.info("All services initialized successfully")
+
+
+def close_services(app: FastAPI) -> None:
+    """Close the database connections opened by init_services()."""
+    with search_cache_lock:
+        search_cache.clear()
+
+    semantic_cache = getattr(app.state, "semantic_cache", None)
+    if semantic_cache:
+        semantic_cache.close()
+
+    embedding_cache = getattr(app.state, "embedding_cache", None)
+    if embedding_cache:
+        embedding_cache.close()
+
+    db_pool = getattr(app.state, "db_pool", None)
+    if db_pool and db_pool.is_open:
+        db_pool.close()
+        logger.info("Database connections closed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Per-worker startup/shutdown.
+
+    Configures the worker thread pool used to offload blocking calls,
+    initializes services once the worker process has started and runs the
+    background database health check.
+    """
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = THREADPOOL_TOKENS
+    logger.info("Thread pool limiter set to %d tokens", THREADPOOL_TOKENS)
+
+    init_services(app)
+    app.state.db_healthy = app.state.db_pool.is_open
+    health_task = asyncio.create_task(health_loop(app))
+
+    app.state.redis = None
+    if REDIS_URL:
+        import redis.asyncio
+
+        app.state.redis = redis.asyncio.from_url(REDIS_URL)
+        logger.info("Redis search cache enabled")
+
+    try:
+        yield
+    finally:
+        health_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await health_task
+
+        if app.state.redis:
+            await app.state.redis.aclose()
+            app.state.redis = None
+        close_services(app)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking (sync DB/search) call in the worker thread pool.
+
+    Keeps the event loop free to serve other requests while SQLite
+    queries and embedding API calls are in progress.
+    """
+    return await anyio.to_thread.run_sync(partial(func, *args, **kwargs))
+
+
+async def health_loop(app: FastAPI) -> None:
+    """
+    Periodically check the database and store the result in app.state.
+
+    /health only reads app.state.db_healthy, so probes never touch SQLite.
+    """
+    while True:
+        try:
+            async with pooled_connection(app.state.db_pool, app.state.db_slots) as conn:
+                await run_blocking(conn.execute_query, "SELECT 1")
+            healthy = True
+        except Exception as e:
+            logger.warning("Database health check failed: %s", e)
+            healthy = False
+
+        if healthy != app.state.db_healthy:
+            logger.info("Database health changed: healthy=%s", healthy)
+        app.state.db_healthy = healthy
+
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+
+
+@asynccontextmanager
+async def db_slot(slots: anyio.Semaphore):
+    """
+    Reserve one pooled connection's worth of database access.
+
+    slots has one token per pooled connection and every use of the pool
+    from a request holds one, so a slot holder always finds a free
+    connection. Waiting therefore happens here, on the event loop, and never
+    in a worker thread: otherwise waiting checkouts could take every thread
+    while connection holders wait for one to run their queries.
+
+    Raises:
+        TimeoutError: If no slot became free within DB_POOL_TIMEOUT
+    """
+    with anyio.fail_after(DB_POOL_TIMEOUT):
+        await slots.acquire()
+
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+@asynccontextmanager
+async def pooled_connection(db_pool: SqlitePool, slots: anyio.Semaphore):
+    """
+    Check a connection out of the pool without blocking the event loop.
+
+    The connection is returned to the pool on exit.
+
+    Raises:
+        TimeoutError: If no connection became free within DB_POOL_TIMEOUT
+    """
+    async with db_slot(slots):
+        checkout = db_pool.acquire()
+
+        # Shielded so a cancelled request cannot leave a checked-out
+        # connection behind without reaching the release below
+        with anyio.CancelScope(shield=True):
+            conn = await run_blocking(checkout.__enter__)
+
+        try:
+            yield conn
+        finally:
+            checkout.__exit__(None, None, None)
+
+
+async def run_pooled(slots: anyio.Semaphore, func, *args, **kwargs):
+    """
+    Run a blocking call that checks connections out of the pool itself.
+
+    For services built on the pool (SearchEngine over SqlitePool,
+    VectorSearchEngine, RateComparator). They use one connection at a time,
+    so holding a slot for the call keeps them from waiting on the pool in a
+    worker thread.
+    """
+    async with db_slot(slots):
+        return await run_blocking(func, *args, **kwargs)
+
+
+# FastAPI dependencies reading the per-worker services from app.state
+async def get_conn(request: Request):
+    """Request-scoped pooled connection."""
+    state = request.app.state
+    async with pooled_connection(state.db_pool, state.db_slots) as conn:
+        yield conn
+
+
+def get_db_pool(request: Request) -> SqlitePool:
+    """
+    The worker's connection pool, for endpoints that check out lazily.
+
+    Services built on the pool itself check a connection out per query
+    inside the worker thread, so nothing is taken until a query runs.
+    """
+    return request.app.state.db_pool
+
+
+def get_db_slots(request: Request) -> anyio.Semaphore:
+    """The worker's connection slots (see db_slot)."""
+    return request.app.state.db_slots
+
+
+def get_search_engine(conn: DatabaseManager = Depends(get_conn)) -> SearchEngine:
+    """SearchEngine bound to the request's connection."""
+    return SearchEngine(conn)
+
+
+def get_cost_calculator(
+    conn: DatabaseManager = Depends(get_conn),
+) -> CostCalculator:
+    """CostCalculator bound to the request's connection."""
+    return CostCalculator(conn)
+
+
+def get_vector_engine(request: Request) -> Optional[VectorSearchEngine]:
+    """VectorSearchEngine, or None if OPENAI_API_KEY is not configured."""
+    return request.app.state.vector_engine
+
+
+def get_rate_comparator(request: Request) -> RateComparator:
+    """Shared RateComparator."""
+    return request.app.state.rate_comparator
+
+
+def get_redis(request: Request):
+    """Redis client for the shared search cache, or None if disabled."""
+    return request.app.state.redis
+
+
+def _redis_key(key: tuple) -> str:
+    """Build the shared Redis key for a search cache key."""
+    digest = hashlib.sha256("|".join(map(str, key)).encode("utf-8")).hexdigest()
+    return f"search:{digest}"
+
+
+async def pooled_vector_search(
+    vector_engine: VectorSearchEngine, slots: anyio.Semaphore, query: str, **kwargs
+) -> list:
+    """
+    Run VectorSearchEngine.search() holding a connection slot only for the scan.
+
+    The semantic cache lookup and the query embedding (an OpenAI round trip)
+    run in a worker thread without a slot, so slow embedding calls do not
+    keep connections from natural_search and the other pooled endpoints.
+
+    Args:
+        vector_engine: Worker's VectorSearchEngine
+        slots: Connection slots held while the vector scan runs
+        query: Search query
+        **kwargs: limit, filters and similarity_threshold for the search
+
+    Returns:
+        List of result dicts
+    """
+    cached, query_vector = await run_blocking(
+        vector_engine.prepare_search, query, **kwargs
+    )
+    if cached is not None:
+        return cached
+
+    results = await run_pooled(
+        slots, vector_engine.search_with_embedding, query_vector, **kwargs
+    )
+    await run_blocking(
+        vector_engine.store_results, query, query_vector, results=results, **kwargs
+    )
+    return results
+
+
+async def cached_search(key: tuple, redis_client, search, **kwargs) -> list:
+    """
+    Return search results from the cache or run the search.
+
+    Looks up the in-process TTL cache first, then the shared Redis cache
+    (if REDIS_URL is set), and only runs the search on a miss in both.
+    Redis errors are logged and treated as misses.
+
+    Results for queries containing a rate code that fill the whole limit are
+    not cached: these are prefix lookups whose result set is truncated and
+    cheap to recompute from the rate_code index.
+
+    Args:
+        key: Cache key (endpoint name plus all parameters affecting results)
+        redis_client: Shared Redis client, or None if disabled
+        search: Async search function to await on a cache miss (it takes
+            its connection slot itself, e.g. run_pooled)
+        **kwargs: Arguments passed to search (must include query and limit)
+
+    Returns:
+        List of result dicts
+    """
+    with search_cache_lock:
+        results = search_cache.get(key)
+    if results is not None:
+        logger.debug("Search cache hit: %s", key)
+        return results
+
+    redis_key = _redis_key(key) if redis_client else None
+
+    if redis_key:
+        try:
+            cached = await redis_client.get(redis_key)
+            if cached is not None:
+                logger.debug("Redis cache hit: %s", key)
+                results = orjson.loads(cached)
+                with search_cache_lock:
+                    search_cache[key] = results
+                return results
+        except Exception as e:
+            logger.warning("Redis cache get failed: %s", e)
+
+    results = await search(**kwargs)
+    results = results if isinstance(results, list) else []
+
+    truncated = len(results) == kwargs["limit"]
+    if truncated and _RATE_CODE_IN_QUERY_RE.search(kwargs["query"]):
+        return results
+
+    with search_cache_lock:
+        search_cache[key] = results
+
+    if redis_key:
+        try:
+            await redis_client.setex(redis_key, REDIS_CACHE_TTL, orjson.dumps(results))
+        except Exception as e:
+            logger.warning("Redis cache set failed: %s", e)
+
+    return results
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (faster than stdlib json)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Construction Estimator API",
     description="HTTP REST API for construction rate search and cost calculation",
     version="1.0.0",
     root_path="/api",  # For reverse proxy path routing
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
+@app.exception_handler(TimeoutError)
+async def pool_timeout_handler(request: Request, exc: TimeoutError):
+    """Answer 503 when no pooled connection became free in time."""
+    logger.warning("Database busy: %s", exc)
+    return ORJSONResponse(status_code=503, content={"detail": "Database busy"})
+
+
 # CORS middleware for frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -56,42 +516,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Gzip large JSON bodies (search results, resource breakdowns)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
 
-# Database initialization
-DB_PATH = os.getenv("DATABASE_PATH", "data/processed/estimates.db")
-
-if not Path(DB_PATH).exists():
-    logger.error(f"Database file not found: {DB_PATH}")
-    raise FileNotFoundError(f"Database file not found: {DB_PATH}")
-
-logger.info(f"Initializing API server with database: {DB_PATH}")
-
-db_manager = DatabaseManager(DB_PATH)
-db_manager.connect()
-logger.info("DatabaseManager connected successfully")
 
-search_engine = SearchEngine(db_manager)
-cost_calculator = CostCalculator(db_manager)
-rate_comparator = RateComparator(DB_PATH)
-
-# Initialize VectorSearchEngine
-openai_api_key = os.getenv("OPENAI_API_KEY")
-if openai_api_key:
-    vector_engine = VectorSearchEngine(
-        db_manager=db_manager,
-        api_key=openai_api_key,
-        base_url=os.getenv("OPENAI_BASE_URL"),
-    )
-    logger.info("VectorSearchEngine initialized")
-else:
-    vector_engine = None
-    logger.warning("OPENAI_API_KEY not set - vector search unavailable")
+# Pydantic models for request/response validation
+class APIRequest(BaseModel):
+    """Base request model: strict, read-only fields, whitespace-trimmed strings."""
 
-logger.info("All services initialized successfully")
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True, frozen=True)
 
 
-# Pydantic models for request/response validation
-class SearchRequest(BaseModel):
+class SearchRequest(APIRequest):
     query: str = Field(..., min_length=1, description="Search query")
     limit: int = Field(default=20, ge=1, le=100, description="Maximum results")
     unit_type: Optional[str] = Field(
@@ -99,7 +535,7 @@ class SearchRequest(BaseModel):
     )
 
 
-class VectorSearchRequest(BaseModel):
+class VectorSearchRequest(APIRequest):
     query: str = Field(..., min_length=1, description="Search query")
     limit: int = Field(default=20, ge=1, le=100, description="Maximum results")
     unit_type: Optional[str] = Field(None, description="Unit type filter")
@@ -108,60 +544,111 @@ class VectorSearchRequest(BaseModel):
     )
 
 
-class QuickCalculateRequest(BaseModel):
-    rate_identifier: str = Field(..., description="Rate code or search query")
+class VectorSearchBatchRequest(APIRequest):
+    queries: List[VectorSearchRequest] = Field(
+        ..., min_length=1, max_length=100, description="Vector search requests"
+    )
+
+
+class QuickCalculateRequest(APIRequest):
+    rate_identifier: str = Field(
+        ..., min_length=1, description="Rate code or search query"
+    )
     quantity: float = Field(..., gt=0, description="Quantity to calculate")
 
 
-class RateDetailsRequest(BaseModel):
-    rate_code: str = Field(..., description="Rate code")
+class RateDetailsRequest(APIRequest):
+    rate_code: str = Field(..., min_length=1, description="Rate code")
     quantity: float = Field(default=1.0, gt=0, description="Quantity for calculation")
 
 
-class CompareRequest(BaseModel):
-    rate_codes: List[str] = Field(..., min_items=2, description="Rate codes to compare")
+class CompareRequest(APIRequest):
+    rate_codes: List[str] = Field(
+        ..., min_length=2, max_length=20, description="Rate codes to compare"
+    )
     quantity: float = Field(..., gt=0, description="Quantity for comparison")
 
 
+class BatchItem(APIRequest):
+    endpoint: str = Field(..., description="Endpoint name, e.g. natural_search")
+    body: Dict[str, Any] = Field(default_factory=dict, description="Request body")
+
+
+class BatchRequest(APIRequest):
+    requests: Dict[str, BatchItem] = Field(
+        ..., min_length=1, max_length=20, description="Named calls to execute"
+    )
+
+
 # API Endpoints
 @app.get("/health")
-async def health_check():
-    """Health check endpoint for container orchestration"""
-    return {
-        "status": "healthy",
-        "service": "construction-estimator-api",
-        "database": "connected" if db_manager.connection else "disconnected",
-        "vector_search": "enabled" if vector_engine else "disabled",
-    }
+async def health_check(request: Request):
+    """
+    Health check endpoint for container orchestration.
+
+    Returns the result of the last background database check (see
+    health_loop), 503 if the database is unreachable.
+    """
+    healthy = getattr(request.app.state, "db_healthy", False)
+    return ORJSONResponse(
+        status_code=200 if healthy else 503,
+        content={
+            "status": "healthy" if healthy else "unhealthy",
+            "service": "construction-estimator-api",
+            "database": "connected" if healthy else "disconnected",
+            "vector_search": (
+                "enabled" if request.app.state.vector_engine else "disabled"
+            ),
+        },
+    )
 
 
 @app.post("/natural_search")
-async def natural_search(request: SearchRequest):
+async def natural_search(
+    request: SearchRequest,
+    db_pool: SqlitePool = Depends(get_db_pool),
+    db_slots: anyio.Semaphore = Depends(get_db_slots),
+    redis_client=Depends(get_redis),
+):
     """
     Full-text search for construction rates using Russian text query.
 
     Returns matching rates with their codes, names, units, and costs.
+    Cache hits are answered without touching the connection pool; on a
+    miss the search checks connections out in the worker thread.
     """
     try:
-        logger.info(f"natural_search: query='{request.query}', limit={request.limit}")
+        logger.info(
+            "natural_search: query='%s', limit=%d", request.query, request.limit
+        )
 
         filters = {"unit_type": request.unit_type} if request.unit_type else None
-        results = search_engine.search(
-            query=request.query, filters=filters, limit=request.limit
+        key = ("natural_search", request.query, request.unit_type, request.limit)
+        results_list = await cached_search(
+            key,
+            redis_client,
+            partial(run_pooled, db_slots, SearchEngine(db_pool).search),
+            query=request.query,
+            filters=filters,
+            limit=request.limit,
         )
 
-        # Results are already a list of dicts
-        results_list = results if isinstance(results, list) else []
-
         return {"success": True, "count": len(results_list), "results": results_list}
 
+    except TimeoutError:
+        raise  # No free pooled connection: 503 from pool_timeout_handler
     except Exception as e:
-        logger.error(f"natural_search error: {str(e)}", exc_info=True)
+        logger.error("natural_search error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/vector_search")
-async def vector_search(request: VectorSearchRequest):
+async def vector_search(
+    request: VectorSearchRequest,
+    vector_engine: Optional[VectorSearchEngine] = Depends(get_vector_engine),
+    db_slots: anyio.Semaphore = Depends(get_db_slots),
+    redis_client=Depends(get_redis),
+):
     """
     Semantic vector search for construction rates using embeddings.
 
@@ -174,27 +661,128 @@ async def vector_search(request: VectorSearchRequest):
         )
 
     try:
-        logger.info(f"vector_search: query='{request.query}', limit={request.limit}")
+        logger.info(
+            "vector_search: query='%s', limit=%d", request.query, request.limit
+        )
 
         filters = {"unit_type": request.unit_type} if request.unit_type else None
-        results = vector_engine.search(
+        key = (
+            "vector_search",
+            request.query,
+            request.unit_type,
+            request.limit,
+            request.similarity_threshold,
+        )
+        results_list = await cached_search(
+            key,
+            redis_client,
+            partial(pooled_vector_search, vector_engine, db_slots),
             query=request.query,
             limit=request.limit,
             filters=filters,
             similarity_threshold=request.similarity_threshold,
         )
 
-        results_list = results if isinstance(results, list) else []
-
         return {"success": True, "count": len(results_list), "results": results_list}
 
+    except TimeoutError:
+        raise  # No free pooled connection: 503 from pool_timeout_handler
+    except Exception as e:
+        logger.error("vector_search error: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/vector_search_batch")
+async def vector_search_batch(
+    request: VectorSearchBatchRequest,
+    vector_engine: Optional[VectorSearchEngine] = Depends(get_vector_engine),
+    db_slots: anyio.Semaphore = Depends(get_db_slots),
+):
+    """
+    Semantic vector search for several queries in one call.
+
+    All queries are embedded with a single OpenAI API request, then the
+    vector searches run in parallel in the worker thread pool.
+    """
+    if not vector_engine:
+        raise HTTPException(
+            status_code=503,
+            detail="Vector search not available - OPENAI_API_KEY not configured",
+        )
+
+    try:
+        queries = request.queries
+        logger.info("vector_search_batch: %d queries", len(queries))
+
+        embeddings = await run_blocking(
+            vector_engine.embed_many, [q.query for q in queries]
+        )
+
+        batch_results = await asyncio.gather(
+            *[
+                run_pooled(
+                    db_slots,
+                    vector_engine.search_with_embedding,
+                    embedding,
+                    limit=q.limit,
+                    filters={"unit_type": q.unit_type} if q.unit_type else None,
+                    similarity_threshold=q.similarity_threshold,
+                )
+                for embedding, q in zip(embeddings, queries)
+            ]
+        )
+
+        return {
+            "success": True,
+            "count": len(batch_results),
+            "results": [
+                {"query": q.query, "count": len(results), "results": results}
+                for q, results in zip(queries, batch_results)
+            ],
+        }
+
+    except TimeoutError:
+        raise  # No free pooled connection: 503 from pool_timeout_handler
     except Exception as e:
-        logger.error(f"vector_search error: {str(e)}", exc_info=True)
+        logger.error("vector_search_batch error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _calculate_identifier(
+    search_engine: SearchEngine,
+    cost_calculator: CostCalculator,
+    rate_identifier: str,
+    quantity: float,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Calculate cost for a rate code, or for the best FTS match of a description.
+
+    Identifiers that are a whole rate code go straight to the primary-key
+    lookup without an FTS query.
+
+    Returns:
+        Tuple of (CostCalculator.calculate() result, whether search was used)
+
+    Raises:
+        ValueError: If no rate matches the identifier
+    """
+    rate_identifier = rate_identifier.strip()
+    if _RATE_CODE_RE.match(rate_identifier):
+        return cost_calculator.calculate(rate_identifier, quantity), False
+
+    results = search_engine.search(rate_identifier, limit=1)
+    if not results:
+        raise ValueError(f"No rates found matching '{rate_identifier}'")
+
+    return cost_calculator.calculate(results[0]["rate_code"], quantity), True
+
+
 @app.post("/quick_calculate")
-async def quick_calculate(request: QuickCalculateRequest):
+async def quick_calculate(
+    request: QuickCalculateRequest,
+    search_engine: SearchEngine = Depends(get_search_engine),
+    cost_calculator: CostCalculator = Depends(get_cost_calculator),
+):
     """
     Calculate cost for a rate with auto-detection of input type.
 
@@ -204,36 +792,38 @@ async def quick_calculate(request: QuickCalculateRequest):
     """
     try:
         logger.info(
-            f"quick_calculate: identifier='{request.rate_identifier}', quantity={request.quantity}"
+            "quick_calculate: identifier='%s', quantity=%s",
+            request.rate_identifier,
+            request.quantity,
         )
 
-        result = cost_calculator.quick_calculate(
-            rate_identifier=request.rate_identifier, quantity=request.quantity
+        result, search_used = await run_blocking(
+            _calculate_identifier,
+            search_engine,
+            cost_calculator,
+            request.rate_identifier,
+            request.quantity,
         )
 
         return {
-            "success": True,
-            "rate_info": {
-                "rate_code": result["rate_code"],
-                "rate_full_name": result["rate_full_name"],
-                "unit_type": result["unit_type"],
-            },
-            "cost_per_unit": round(result["cost_per_unit"], 2),
-            "total_cost": round(result["total_cost"], 2),
-            "material_cost": round(result["material_cost"], 2),
-            "labor_cost": round(result["labor_cost"], 2),
-            "machinery_cost": round(result["machinery_cost"], 2),
+            **cost_summary(result),
+            "search_used": search_used,
+            "quantity": result["quantity"],
         }
 
     except ValueError as e:
+        logger.info("quick_calculate not found: %s", e)
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        logger.error(f"quick_calculate error: {str(e)}", exc_info=True)
+        logger.error("quick_calculate error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/show_rate_details")
-async def show_rate_details(request: RateDetailsRequest):
+async def show_rate_details(
+    request: RateDetailsRequest,
+    cost_calculator: CostCalculator = Depends(get_cost_calculator),
+):
     """
     Get comprehensive resource breakdown for a rate.
 
@@ -242,32 +832,79 @@ async def show_rate_details(request: RateDetailsRequest):
     """
     try:
         logger.info(
-            f"show_rate_details: rate_code='{request.rate_code}', quantity={request.quantity}"
+            "show_rate_details: rate_code='%s', quantity=%s",
+            request.rate_code,
+            request.quantity,
         )
 
-        result = cost_calculator.get_detailed_breakdown(
-            rate_code=request.rate_code, quantity=request.quantity
+        result = await run_blocking(
+            cost_calculator.get_detailed_breakdown,
+            rate_code=request.rate_code,
+            quantity=request.quantity,
         )
 
         return {
-            "success": True,
-            "rate_info": result["rate_info"],
-            "total_cost": round(result["calculated_total"], 2),
-            "cost_per_unit": round(result["cost_per_unit"], 2),
-            "materials": round(result["materials"], 2),
-            "resources": round(result["resources"], 2),
+            **cost_summary(result),
             "breakdown": result.get("breakdown", []),
         }
 
     except ValueError as e:
+        logger.info("show_rate_details not found: %s", e)
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error("show_rate_details error: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/show_rate_details_stream")
+async def show_rate_details_stream(
+    request: RateDetailsRequest,
+    cost_calculator: CostCalculator = Depends(get_cost_calculator),
+):
+    """
+    Stream the resource breakdown for a rate as NDJSON.
+
+    The first line holds the same fields as /show_rate_details without
+    breakdown, plus breakdown_count; each following line is one breakdown
+    item. Errors are reported as regular JSON before streaming starts.
+    """
+    try:
+        logger.info(
+            "show_rate_details_stream: rate_code='%s', quantity=%s",
+            request.rate_code,
+            request.quantity,
+        )
+
+        result = await run_blocking(
+            cost_calculator.get_detailed_breakdown,
+            rate_code=request.rate_code,
+            quantity=request.quantity,
+        )
+
+    except ValueError as e:
+        logger.info("show_rate_details_stream not found: %s", e)
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        logger.error(f"show_rate_details error: {str(e)}", exc_info=True)
+        logger.error("show_rate_details_stream error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+    breakdown = result.get("breakdown", [])
+    header = {**cost_summary(result), "breakdown_count": len(breakdown)}
+
+    async def lines():
+        yield orjson.dumps(header) + b"\n"
+        for item in breakdown:
+            yield orjson.dumps(item) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 
 @app.post("/compare_variants")
-async def compare_variants(request: CompareRequest):
+async def compare_variants(
+    request: CompareRequest,
+    rate_comparator: RateComparator = Depends(get_rate_comparator),
+    db_slots: anyio.Semaphore = Depends(get_db_slots),
+):
     """
     Compare multiple rates side-by-side for cost analysis.
 
@@ -275,11 +912,17 @@ async def compare_variants(request: CompareRequest):
     """
     try:
         logger.info(
-            f"compare_variants: codes={request.rate_codes}, quantity={request.quantity}"
+            "compare_variants: codes=%s, quantity=%s",
+            request.rate_codes,
+            request.quantity,
         )
 
-        result = rate_comparator.compare_rates(
-            rate_codes=request.rate_codes, quantity=request.quantity
+        # Duplicates would otherwise be reported as missing codes
+        result = await run_pooled(
+            db_slots,
+            rate_comparator.compare_rates,
+            rate_codes=list(dict.fromkeys(request.rate_codes)),
+            quantity=request.quantity,
         )
 
         return {
@@ -288,16 +931,228 @@ async def compare_variants(request: CompareRequest):
             "comparison": result["comparison"],
         }
 
+    except ValueError as e:
+        logger.info("compare_variants not found: %s", e)
+        raise HTTPException(status_code=404, detail=str(e))
+    except TimeoutError:
+        raise  # No free pooled connection: 503 from pool_timeout_handler
     except Exception as e:
-        logger.error(f"compare_variants error: {str(e)}", exc_info=True)
+        logger.error("compare_variants error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Endpoints that can be called through /batch: name -> (handler, request model)
+BATCH_HANDLERS = {
+    "natural_search": (natural_search, SearchRequest),
+    "vector_search": (vector_search, VectorSearchRequest),
+    "quick_calculate": (quick_calculate, QuickCalculateRequest),
+    "show_rate_details": (show_rate_details, RateDetailsRequest),
+    "compare_variants": (compare_variants, CompareRequest),
+}
+
+# How /batch supplies handler dependencies, by parameter name:
+# services bound to a pooled connection, and services read from app.state
+_CONNECTION_SERVICES = {
+    "search_engine": SearchEngine,
+    "cost_calculator": CostCalculator,
+}
+_STATE_SERVICES = {
+    "db_pool": "db_pool",
+    "db_slots": "db_slots",
+    "vector_engine": "vector_engine",
+    "rate_comparator": "rate_comparator",
+    "redis_client": "redis",
+}
+
+
+async def _run_batch_item(item: BatchItem, state) -> Dict[str, Any]:
+    """
+    Validate and execute one /batch item by calling its handler directly.
+
+    Args:
+        item: Batch item
+        state: app.state with the per-worker services
+
+    Returns:
+        Dict with HTTP-like status and response body
+    """
+    if item.endpoint not in BATCH_HANDLERS:
+        detail = f"Unknown endpoint: {item.endpoint}"
+        return {"status": 404, "body": {"detail": detail}}
+
+    handler, model = BATCH_HANDLERS[item.endpoint]
+
+    try:
+        request = model(**item.body)
+    except ValidationError as e:
+        return {"status": 422, "body": {"detail": jsonable_encoder(e.errors())}}
+
+    params = inspect.signature(handler).parameters
+    kwargs = {
+        name: getattr(state, attr)
+        for name, attr in _STATE_SERVICES.items()
+        if name in params
+    }
+    conn_services = {
+        name: cls for name, cls in _CONNECTION_SERVICES.items() if name in params
+    }
+
+    try:
+        if not conn_services:
+            return {"status": 200, "body": await handler(request, **kwargs)}
+
+        async with pooled_connection(state.db_pool, state.db_slots) as conn:
+            kwargs.update({name: cls(conn) for name, cls in conn_services.items()})
+            return {"status": 200, "body": await handler(request, **kwargs)}
+    except HTTPException as e:
+        return {"status": e.status_code, "body": {"detail": e.detail}}
+    except TimeoutError:
+        return {"status": 503, "body": {"detail": "Database busy"}}
+
+
+@app.post("/batch")
+async def batch(request: BatchRequest, http_request: Request):
+    """
+    Execute several API calls in one round-trip.
+
+    Calls run concurrently and are dispatched to the endpoint handlers
+    in-process. Each response carries its own status, so one failing call
+    does not fail the batch.
+
+    Example body:
+        {"requests": {
+            "search": {"endpoint": "natural_search", "body": {"query": "перегородки"}},
+            "details": {"endpoint": "show_rate_details",
+                        "body": {"rate_code": "10-05-001-01", "quantity": 150}}
+        }}
+    """
+    names = list(request.requests)
+    logger.info("batch: %d calls (%s)", len(names), ", ".join(names))
+
+    outcomes = await asyncio.gather(
+        *[
+            _run_batch_item(request.requests[name], http_request.app.state)
+            for name in names
+        ],
+        return_exceptions=True,
+    )
+
+    responses = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("batch call '%s' failed: %s", name, outcome)
+            outcome = {"status": 500, "body": {"detail": str(outcome)}}
+        responses[name] = outcome
+
+    return {"responses": responses}
+
+
+# Cacheable GET variants of the read-only endpoints
+def _from_query(model, **params):
+    """
+    Build a request model from query parameters.
+
+    Raises:
+        RequestValidationError: If parameters are invalid (returned as 422)
+    """
+    try:
+        return model(**{k: v for k, v in params.items() if v is not None})
+    except ValidationError as e:
+        errors = [{**err, "loc": ("query", *err["loc"])} for err in e.errors()]
+        raise RequestValidationError(errors) from None
+
+
+def _cacheable(content: Dict[str, Any]) -> ORJSONResponse:
+    """Wrap a successful GET result with a public Cache-Control header."""
+    return ORJSONResponse(
+        content=content,
+        headers={"Cache-Control": f"public, max-age={GET_CACHE_MAX_AGE}"},
+    )
+
+
+@app.get("/natural_search")
+async def natural_search_get(
+    query: str,
+    limit: int = 20,
+    unit_type: Optional[str] = None,
+    db_pool: SqlitePool = Depends(get_db_pool),
+    db_slots: anyio.Semaphore = Depends(get_db_slots),
+    redis_client=Depends(get_redis),
+):
+    """GET variant of POST /natural_search."""
+    request = _from_query(SearchRequest, query=query, limit=limit, unit_type=unit_type)
+    return _cacheable(await natural_search(request, db_pool, db_slots, redis_client))
+
+
+@app.get("/vector_search")
+async def vector_search_get(
+    query: str,
+    limit: int = 20,
+    unit_type: Optional[str] = None,
+    similarity_threshold: float = 0.0,
+    vector_engine: Optional[VectorSearchEngine] = Depends(get_vector_engine),
+    db_slots: anyio.Semaphore = Depends(get_db_slots),
+    redis_client=Depends(get_redis),
+):
+    """GET variant of POST /vector_search."""
+    request = _from_query(
+        VectorSearchRequest,
+        query=query,
+        limit=limit,
+        unit_type=unit_type,
+        similarity_threshold=similarity_threshold,
+    )
+    return _cacheable(
+        await vector_search(request, vector_engine, db_slots, redis_client)
+    )
+
+
+@app.get("/show_rate_details")
+async def show_rate_details_get(
+    rate_code: str,
+    quantity: float = 1.0,
+    cost_calculator: CostCalculator = Depends(get_cost_calculator),
+):
+    """GET variant of POST /show_rate_details."""
+    request = _from_query(RateDetailsRequest, rate_code=rate_code, quantity=quantity)
+    return _cacheable(await show_rate_details(request, cost_calculator))
+
+
+@app.get("/compare_variants")
+async def compare_variants_get(
+    quantity: float,
+    rate_codes: List[str] = Query(...),
+    rate_comparator: RateComparator = Depends(get_rate_comparator),
+    db_slots: anyio.Semaphore = Depends(get_db_slots),
+):
+    """
+    GET variant of POST /compare_variants.
+
+    Rate codes are passed as repeated parameters:
+    ?rate_codes=10-05-001-01&rate_codes=10-06-037-02&quantity=100
+    """
+    request = _from_query(CompareRequest, rate_codes=rate_codes, quantity=quantity)
+    return _cacheable(await compare_variants(request, rate_comparator, db_slots))
+
+
 # Server entry point
 if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
+    workers = int(os.getenv("WORKERS", os.cpu_count() or 1))
 
-    logger.info(f"Starting HTTP API server on {host}:{port}")
+    logger.info(
+        "Starting HTTP API server on %s:%d with %d workers", host, port, workers
+    )
 
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    # Import string is required for multi-worker mode
+    uvicorn.run(
+        "api_server:app",
+        host=host,
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        timeout_keep_alive=KEEP_ALIVE_TIMEOUT,
+        log_level="info",
+    )
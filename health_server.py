@@ -13,9 +13,10 @@ Usage:
 
 import logging
 import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
 import threading
+import time
 import sys
 from pathlib import Path
 
@@ -34,6 +35,81 @@ logger = logging.getLogger(__name__)
 # Global database manager instance
 db_manager = None
 
+# Health result is reused for this many seconds so parallel probes
+# do not each run a query
+HEALTH_CACHE_SECONDS = 1.0
+
+# Last health check result: (monotonic timestamp, status code, response data)
+_health_cache = None
+_health_lock = threading.Lock()
+
+
+def check_health():
+    """
+    Check database health.
+
+    Returns:
+        Tuple of (HTTP status code, response data)
+    """
+    try:
+        # Check if database manager is initialized
+        if db_manager is None:
+            return 503, {
+                "status": "unhealthy",
+                "database": "not_initialized",
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+        # Try to execute a simple query to verify connection
+        result = db_manager.execute_query("SELECT 1", ())
+
+        if result and len(result) > 0:
+            # Database connection is alive
+            return 200, {
+                "status": "healthy",
+                "database": "connected",
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+        # Query failed
+        return 503, {
+            "status": "unhealthy",
+            "database": "query_failed",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    except Exception as e:
+        # Exception during health check
+        logger.error("Health check failed: %s", e)
+        return 503, {
+            "status": "unhealthy",
+            "database": "error",
+            "error": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+
+def get_health():
+    """
+    Return the health check result, memoized for HEALTH_CACHE_SECONDS.
+
+    Concurrent probes wait on the lock and reuse the fresh result instead
+    of running their own query.
+
+    Returns:
+        Tuple of (HTTP status code, response data)
+    """
+    global _health_cache
+
+    with _health_lock:
+        now = time.monotonic()
+        if _health_cache and now - _health_cache[0] < HEALTH_CACHE_SECONDS:
+            return _health_cache[1], _health_cache[2]
+
+        status_code, data = check_health()
+        _health_cache = (now, status_code, data)
+        return status_code, data
+
 
 class HealthCheckHandler(BaseHTTPRequestHandler):
     """HTTP request handler for health checks."""
@@ -47,43 +123,8 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
 
     def handle_health_check(self):
         """Check database health and return status."""
-        try:
-            # Check if database manager is initialized
-            if db_manager is None:
-                self.send_health_response(503, {
-                    "status": "unhealthy",
-                    "database": "not_initialized",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-                return
-
-            # Try to execute a simple query to verify connection
-            result = db_manager.execute_query("SELECT 1", ())
-
-            if result and len(result) > 0:
-                # Database connection is alive
-                self.send_health_response(200, {
-                    "status": "healthy",
-                    "database": "connected",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-            else:
-                # Query failed
-                self.send_health_response(503, {
-                    "status": "unhealthy",
-                    "database": "query_failed",
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-
-        except Exception as e:
-            # Exception during health check
-            logger.error(f"Health check failed: {e}")
-            self.send_health_response(503, {
-                "status": "unhealthy",
-                "database": "error",
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            })
+        status_code, data = get_health()
+        self.send_health_response(status_code, data)
 
     def send_health_response(self, status_code, data):
         """Send JSON health response."""
@@ -94,7 +135,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
 
     def log_message(self, format, *args):
         """Override to use logger instead of stderr."""
-        logger.info(f"{self.address_string()} - {format % args}")
+        logger.info("%s - " + format, self.address_string(), *args)
 
 
 def start_health_server(port=8001, db_path='data/processed/estimates.db'):
@@ -111,14 +152,14 @@ def start_health_server(port=8001, db_path='data/processed/estimates.db'):
     try:
         db_manager = DatabaseManager(db_path)
         db_manager.connect()  # Explicitly connect to the database
-        logger.info(f"Database manager initialized and connected: {db_path}")
+        logger.info("Database manager initialized and connected: %s", db_path)
     except Exception as e:
-        logger.error(f"Failed to initialize database manager: {e}")
+        logger.error("Failed to initialize database manager: %s", e)
         db_manager = None
 
-    # Start HTTP server
-    server = HTTPServer(('0.0.0.0', port), HealthCheckHandler)
-    logger.info(f"Health check server listening on port {port}")
+    # Start HTTP server (one thread per request, so probes never queue)
+    server = ThreadingHTTPServer(('0.0.0.0', port), HealthCheckHandler)
+    logger.info("Health check server listening on port %d", port)
 
     try:
         server.serve_forever()
@@ -147,7 +188,7 @@ def start_health_server_background(port=8001, db_path='data/processed/estimates.
         name="HealthServer"
     )
     thread.start()
-    logger.info(f"Health server started in background on port {port}")
+    logger.info("Health server started in background on port %d", port)
     return thread
 
 
@@ -16,19 +16,29 @@ Framework: FastMCP 2.x
 Database: SQLite (data/processed/estimates.db)
 """
 
-import json
+import asyncio
 import logging
+import os
 import re
-from typing import List, Dict, Any, Optional
+import threading
+from functools import lru_cache, wraps
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+import orjson
+import pandas as pd
 from fastmcp import FastMCP
 
-from src.database.db_manager import DatabaseManager
+from src.database.sqlite_pool import SqlitePool
 from src.search.search_engine import SearchEngine
-from src.search.cost_calculator import CostCalculator
+from src.search.cost_calculator import CostCalculator, to_kopecks
+from src.search.embedding_cache import EmbeddingCache
 from src.search.rate_comparator import RateComparator
-from src.search.vector_engine import VectorSearchEngine
+from src.search.semantic_cache import SemanticCache
+
+if TYPE_CHECKING:
+    from src.search.vector_engine import VectorSearchEngine
 
 
 # Configure logging
@@ -42,19 +52,56 @@ logger = logging.getLogger(__name__)
 mcp = FastMCP("Construction Estimator")
 
 
-# Database and service initialization
-import os
+def threaded_tool(func):
+    """
+    Register a blocking tool that runs in a worker thread.
+
+    FastMCP calls sync tools directly on the event loop, so a slow SQLite or
+    pandas call would stall every other connected client. The registered
+    tool is an async wrapper with the same name, signature and docstring
+    that runs func via asyncio.to_thread.
+
+    Tools return ready JSON text, so no output schema is registered: FastMCP
+    would otherwise send every response twice, once as text content and
+    again escaped inside structuredContent {"result": ...}.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return mcp.tool(output_schema=None)(wrapper)
 
+
+# Database and service initialization
 DB_PATH = "data/processed/estimates.db"
+
+# Read-only connections shared by all tools (concurrent SSE/HTTP calls),
+# one per CPU by default
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(os.cpu_count() or 4)))
+
+# Query embeddings kept across restarts (empty path disables it)
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH", "data/cache/embedding_cache.db"
+)
+
+# Vector search results reused for near-duplicate queries (empty path disables it)
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH", "data/cache/semantic_cache.db")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))
+
 TEST_MODE = os.getenv("TEST_MODE", "false").lower() == "true"
 
+# Pretty-print tool responses (compact JSON is ~30% smaller on the wire)
+MCP_DEBUG = os.getenv("MCP_DEBUG", "false").lower() == "true"
+
 if TEST_MODE:
     logger.info("TEST_MODE enabled - skipping database initialization")
-    db_manager = None
+    db_pool = None
+    embedding_cache = None
+    semantic_cache = None
     search_engine = None
     cost_calculator = None
     rate_comparator = None
-    vector_engine = None
 else:
     logger.info(f"Initializing MCP server with database: {DB_PATH}")
 
@@ -63,87 +110,186 @@ else:
         logger.error(f"Database file not found: {DB_PATH}")
         raise FileNotFoundError(f"Database file not found: {DB_PATH}")
 
-    # Initialize database manager and services at module level
-    db_manager = DatabaseManager(DB_PATH)
-    db_manager.connect()
-    logger.info("DatabaseManager connected successfully")
+    # Initialize connection pool and services at module level. Tools only
+    # read, so they share the mode=ro readers; the pool's single writer is
+    # used for index maintenance on startup.
+    db_pool = SqlitePool(DB_PATH, size=DB_POOL_SIZE)
+    db_pool.open()
+    logger.info("SqlitePool opened successfully")
 
-    search_engine = SearchEngine(db_manager)
+    # Load the FTS5 index before the first tool call (optimized at build time)
+    db_pool.prewarm(optimize=False)
+
+    search_engine = SearchEngine(db_pool)
     logger.info("SearchEngine initialized")
 
-    cost_calculator = CostCalculator(db_manager)
+    cost_calculator = CostCalculator(db_pool)
     logger.info("CostCalculator initialized")
 
-    rate_comparator = RateComparator(DB_PATH)
+    rate_comparator = RateComparator(DB_PATH, db_manager=db_pool)
     logger.info("RateComparator initialized")
 
-    # Initialize VectorSearchEngine with API key from environment
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
+    # VectorSearchEngine and its caches are created on first vector_search
+    embedding_cache = None
+    semantic_cache = None
+    if not os.getenv("OPENAI_API_KEY"):
         logger.warning("OPENAI_API_KEY not set - vector search will be unavailable")
-        vector_engine = None
-    else:
-        vector_engine = VectorSearchEngine(
-            db_manager=db_manager,
-            api_key=openai_api_key,
-            base_url=os.getenv("OPENAI_BASE_URL"),  # Optional custom endpoint
-        )
-        logger.info("VectorSearchEngine initialized")
 
     logger.info("All services initialized successfully")
 
 
+_vector_engine: Optional["VectorSearchEngine"] = None
+_vector_engine_lock = threading.Lock()
+
+
+def _get_vector_engine() -> Optional["VectorSearchEngine"]:
+    """
+    Return the VectorSearchEngine, creating it on first use.
+
+    The OpenAI client (and the openai package import, ~0.5s) and the
+    embedding/semantic caches are only set up when vector_search is first
+    called, so startup and the other tools do not pay for them. Creation is
+    guarded by double-checked locking because tools run in worker threads.
+
+    Returns:
+        VectorSearchEngine, or None if OPENAI_API_KEY is not set
+    """
+    global _vector_engine, embedding_cache, semantic_cache
+
+    if _vector_engine is not None:
+        return _vector_engine
+
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if TEST_MODE or not openai_api_key:
+        return None
+
+    with _vector_engine_lock:
+        if _vector_engine is None:
+            from src.search.vector_engine import VectorSearchEngine
+
+            if EMBEDDING_CACHE_PATH and embedding_cache is None:
+                embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH)
+                embedding_cache.open()
+
+            if SEMANTIC_CACHE_PATH and semantic_cache is None:
+                semantic_cache = SemanticCache(
+                    SEMANTIC_CACHE_PATH, similarity_threshold=SEMANTIC_CACHE_THRESHOLD
+                )
+                semantic_cache.open()
+
+            _vector_engine = VectorSearchEngine(
+                db_manager=db_pool,
+                api_key=openai_api_key,
+                base_url=os.getenv("OPENAI_BASE_URL"),  # Optional custom endpoint
+                semantic_cache=semantic_cache,
+                embedding_cache=embedding_cache,
+            )
+            logger.info("VectorSearchEngine initialized")
+
+    return _vector_engine
+
+
 # Utility functions
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# _error_json() output, laid out like safe_json_serialize() would write it
+if MCP_DEBUG:
+    _JSON_OPTIONS |= orjson.OPT_INDENT_2
+    _ERROR_TEMPLATE = '{\n  "error": %s,\n  "details": %s\n}'
+else:
+    _ERROR_TEMPLATE = '{"error":%s,"details":%s}'
+
+
+def _json_default(v: Any) -> Any:
+    """
+    Serialize values orjson does not handle natively (pd.NA, Timestamp, ...).
+
+    Only called for unsupported types, so plain responses pay nothing for it;
+    non-finite floats are already written as null by orjson itself.
+    """
+    if v is pd.NA or v is pd.NaT:
+        return None
+    if isinstance(v, np.floating):
+        # longdouble is not covered by OPT_SERIALIZE_NUMPY and .item() keeps it
+        return float(v)
+    if isinstance(v, np.generic):
+        # Other numpy scalars outside OPT_SERIALIZE_NUMPY (timedelta64, ...)
+        return v.item()
+    if hasattr(v, "isoformat"):
+        return v.isoformat()
+    return str(v)
+
+
+def frame_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a DataFrame to a list of row dicts in one pass.
+
+    Faster than DataFrame.to_dict(orient="records"), which boxes every value
+    separately. Values come out as Python scalars; NaN is left for
+    safe_json_serialize to write as null.
+
+    Note: for comparison-sized frames (up to a few hundred rows) this plus
+    orjson is also ~3x faster than DataFrame.to_json(orient="records"), so
+    frames are not serialized through pandas directly.
+    """
+    columns = list(df.columns)
+    return [dict(zip(columns, row)) for row in df.to_numpy(dtype=object).tolist()]
+
+
 def safe_json_serialize(obj: Any) -> str:
     """
     Safely serialize objects to JSON, handling NaN, Infinity, and DataFrames.
 
+    NaN and Infinity (including numpy scalars and arrays) are written as null
+    at any nesting depth. Output is compact unless MCP_DEBUG is set.
+
     Args:
         obj: Object to serialize (dict, list, DataFrame, etc.)
 
     Returns:
         JSON string representation
     """
-    import pandas as pd
-    import numpy as np
-
-    def clean_value(v):
-        """Clean a single value, handling NaN and Infinity."""
-        # Skip arrays/lists/dicts - they need recursive cleaning
-        if isinstance(v, (list, dict, np.ndarray)):
-            return v
-        # Check for scalar NaN or Infinity
-        try:
-            if pd.isna(v) or (isinstance(v, float) and not np.isfinite(v)):
-                return None
-        except (TypeError, ValueError):
-            # If pd.isna() fails (e.g., for some exotic types), just return the value
-            pass
-        return v
-
     # Convert DataFrame to list of dicts
     if isinstance(obj, pd.DataFrame):
-        obj = obj.replace([np.nan, np.inf, -np.inf], None).to_dict(orient="records")
+        obj = frame_to_records(obj)
+
+    return orjson.dumps(obj, default=_json_default, option=_JSON_OPTIONS).decode()
 
-    # Convert dict values if needed
-    if isinstance(obj, dict):
-        obj = {k: clean_value(v) for k, v in obj.items()}
 
-    # Convert list items if needed
-    if isinstance(obj, list):
-        obj = [
-            {k: clean_value(v) for k, v in item.items()}
-            if isinstance(item, dict)
-            else item
-            for item in obj
-        ]
+def _error_json(error: str, details: str) -> str:
+    """
+    Build an error response without going through safe_json_serialize.
 
-    return json.dumps(obj, ensure_ascii=False, indent=2)
+    Produces the same text as safe_json_serialize({"error": ..., "details": ...}).
+    """
+    return _ERROR_TEMPLATE % (
+        orjson.dumps(error).decode(),
+        orjson.dumps(details).decode(),
+    )
 
 
 def format_cost(value: float) -> float:
-    """Format cost value to 2 decimal places."""
-    return round(value, 2)
+    """
+    Format cost value to 2 decimal places.
+
+    Rounds through integer kopecks like CostCalculator, so raw costs (e.g.,
+    vector search results) round the same way as calculated ones.
+    Costs from CostCalculator and SearchEngine are already rounded and are
+    used as is.
+    """
+    return to_kopecks(value) / 100
+
+
+# Characters a rate code may consist of; translate() deletes them, so a code
+# translates to an empty string
+_CODE_CHARS = (
+    "".join(map(chr, range(ord("А"), ord("я") + 1)))
+    + "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-"
+)
+_NON_CODE_CHARS = str.maketrans("", "", _CODE_CHARS)
+
+# Rate code prefix followed by anything: "ГЭСНп81-01 ..." or "10-05 ..."
+_RATE_CODE_PREFIX_RE = re.compile(r"^(?:[А-Яа-я]+\d{2}-\d{2}|\d+-\d+)")
 
 
 def is_rate_code(identifier: str) -> bool:
@@ -154,6 +300,11 @@ def is_rate_code(identifier: str) -> bool:
     - Numbers and hyphens: "10-05-001-01"
     - Alphanumeric with hyphens: "ГЭСНп81-01-001"
 
+    Identifiers with internal spaces are always treated as search queries.
+
+    Not on the quick_calculate path (SearchEngine.resolve_identifier decides
+    there) and under 1 µs per call, so it is kept in pure Python.
+
     Args:
         identifier: String to check
 
@@ -166,32 +317,148 @@ def is_rate_code(identifier: str) -> bool:
     # Check for patterns indicating rate code:
     # - Contains hyphens and numbers
     # - Starts with numbers or specific prefixes (ГЭСН, ФЕР, etc.)
-    # - Does not contain multiple spaces (typical of search queries)
+    # - Does not contain spaces (typical of search queries)
 
-    # If contains multiple spaces, it's likely a search query
-    if len(identifier.split()) > 2:
+    # Codes never contain spaces, so any query with several words is
+    # rejected here without scanning it further
+    if " " in identifier:
         return False
 
-    # Check for typical rate code patterns
-    rate_code_patterns = [
-        r"^\d{2}-\d{2}-\d{3}-\d{2}$",  # Pattern like 10-05-001-01
-        r"^[А-Яа-я]+\d{2}-\d{2}",  # Pattern like ГЭСНп81-01
-        r"^\d+-\d+",  # Any pattern starting with numbers and hyphen
-    ]
+    # If contains only alphanumeric and hyphens (no spaces), likely a code;
+    # covers full codes like 10-05-001-01 in one C-level scan
+    if "-" in identifier and not identifier.translate(_NON_CODE_CHARS):
+        return True
+
+    # Otherwise it must start with a typical rate code pattern
+    return _RATE_CODE_PREFIX_RE.match(identifier) is not None
 
-    for pattern in rate_code_patterns:
-        if re.match(pattern, identifier):
-            return True
 
-    # If contains only alphanumeric and hyphens (no spaces), likely a code
-    if re.match(r"^[А-Яа-яA-Za-z0-9\-]+$", identifier) and "-" in identifier:
-        return True
+# Caches for repeated tool calls. estimates.db is read-only while the server
+# runs, so entries never need invalidation. Cached values are shared between
+# calls and must not be mutated.
+SEARCH_CACHE_SIZE = 512
+CALCULATE_CACHE_SIZE = 512
+
+# SearchEngine.search() result fields returned by natural_search
+_NATURAL_SEARCH_FIELDS = (
+    "rate_code",
+    "rate_full_name",
+    "unit_measure_full",
+    "cost_per_unit",
+    "total_cost",
+    "rank",
+)
+
+
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _cached_search(
+    query: str, unit_type: Optional[str], limit: int
+) -> Tuple[Dict[str, Any], ...]:
+    """
+    Run search_engine.search() once per distinct (query, unit_type, limit).
+
+    Results are projected to the natural_search response fields here, so a
+    cache hit is serialized as is without building new dicts.
+
+    Args:
+        query: Search query with whitespace collapsed
+        unit_type: Optional unit filter
+        limit: Maximum number of results
+
+    Returns:
+        Tuple of natural_search result dicts
+    """
+    filters = {"unit_type": unit_type} if unit_type else None
+    return tuple(
+        {field: result[field] for field in _NATURAL_SEARCH_FIELDS}
+        for result in search_engine.search(query, filters=filters, limit=limit)
+    )
 
-    return False
+
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _cached_resolve(identifier: str) -> Optional[Tuple[str, bool]]:
+    """Run search_engine.resolve_identifier() once per distinct identifier."""
+    return search_engine.resolve_identifier(identifier)
+
+
+@lru_cache(maxsize=CALCULATE_CACHE_SIZE)
+def _cached_calculate(rate_code: str, quantity: float) -> Dict[str, Any]:
+    """Run cost_calculator.calculate() once per distinct (rate_code, quantity)."""
+    return cost_calculator.calculate(rate_code, quantity)
+
+
+# Rendered JSON of the read-only detail tools, keyed by their arguments.
+# Errors are raised, so they are not cached.
+RESPONSE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _rate_details_json(rate_code: str, quantity: float) -> str:
+    """Build the show_rate_details response JSON."""
+    result = cost_calculator.get_detailed_breakdown(rate_code, quantity)
+
+    # Format response
+    response = {
+        "success": True,
+        "rate_info": result["rate_info"],
+        "total_cost": result["calculated_total"],
+        "cost_per_unit": result["cost_per_unit"],
+        "materials": result["materials"],
+        "resources": result["resources"],
+        "total_cost_kopecks": result["calculated_total_kopecks"],
+        "cost_per_unit_kopecks": result["cost_per_unit_kopecks"],
+        "materials_kopecks": result["materials_kopecks"],
+        "resources_kopecks": result["resources_kopecks"],
+        "quantity": quantity,
+        "breakdown": result["breakdown"],
+    }
+
+    logger.info(
+        f"show_rate_details completed: {rate_code} with {len(result['breakdown'])} resources"
+    )
+    return safe_json_serialize(response)
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _compare_json(rate_codes: Tuple[str, ...], quantity: float) -> str:
+    """Build the compare_variants response JSON."""
+    comparison_results = rate_comparator.compare_records(list(rate_codes), quantity)
+
+    response = {
+        "success": True,
+        "count": len(comparison_results),
+        "quantity": quantity,
+        "comparison": comparison_results,
+    }
+
+    logger.info(
+        f"compare_variants completed: {len(comparison_results)} rates compared"
+    )
+    return safe_json_serialize(response)
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _similar_rates_json(rate_code: str, max_results: int) -> str:
+    """Build the find_similar_rates response JSON."""
+    alternatives_results = rate_comparator.find_alternatives_records(
+        rate_code, max_results=max_results
+    )
+
+    response = {
+        "success": True,
+        "source_rate": rate_code,
+        "count": len(alternatives_results),
+        "alternatives": alternatives_results,
+    }
+
+    logger.info(
+        f"find_similar_rates completed: {len(alternatives_results)} alternatives found"
+    )
+    return safe_json_serialize(response)
 
 
 # MCP Tools
-@mcp.tool()
+@threaded_tool
 def natural_search(query: str, unit_type: str = None, limit: int = 10) -> str:
     """Search construction rates by description in Russian.
 
@@ -222,54 +489,35 @@ def natural_search(query: str, unit_type: str = None, limit: int = 10) -> str:
     try:
         # Validate inputs
         if not query or not query.strip():
-            error_response = {
-                "error": "Invalid input",
-                "details": "Query cannot be empty",
-            }
-            logger.error(f"natural_search error: {error_response['details']}")
-            return safe_json_serialize(error_response)
+            details = "Query cannot be empty"
+            logger.error(f"natural_search error: {details}")
+            return _error_json("Invalid input", details)
 
         # Cap limit at 100
         limit = min(max(1, limit), 100)
 
-        # Build filters
-        filters = {}
-        if unit_type:
-            filters["unit_type"] = unit_type.strip()
-
         # Execute search
-        results = search_engine.search(query, filters=filters, limit=limit)
-
-        # Format results for JSON output
-        formatted_results = []
-        for result in results:
-            formatted_results.append(
-                {
-                    "rate_code": result["rate_code"],
-                    "rate_full_name": result["rate_full_name"],
-                    "unit_measure_full": result["unit_measure_full"],
-                    "cost_per_unit": format_cost(result["cost_per_unit"]),
-                    "total_cost": format_cost(result["total_cost"]),
-                    "rank": result["rank"],
-                }
-            )
+        results = _cached_search(
+            " ".join(query.split()), unit_type.strip() if unit_type else None, limit
+        )
 
+        # Cached results are already in response form (orjson writes the
+        # tuple as a JSON array)
         response = {
             "success": True,
-            "count": len(formatted_results),
-            "results": formatted_results,
+            "count": len(results),
+            "results": results,
         }
 
-        logger.info(f"natural_search completed: {len(formatted_results)} results found")
+        logger.info(f"natural_search completed: {len(results)} results found")
         return safe_json_serialize(response)
 
     except Exception as e:
-        error_response = {"error": "Search failed", "details": str(e)}
         logger.error(f"natural_search error: {str(e)}", exc_info=True)
-        return safe_json_serialize(error_response)
+        return _error_json("Search failed", str(e))
 
 
-@mcp.tool()
+@threaded_tool
 def quick_calculate(rate_identifier: str, quantity: float) -> str:
     """Calculate cost for a rate code or search by description.
 
@@ -289,6 +537,8 @@ def quick_calculate(rate_identifier: str, quantity: float) -> str:
         - calculated_total: Total cost for specified quantity
         - materials: Materials cost
         - resources: Labor/machinery cost
+        - cost_per_unit_kopecks, calculated_total_kopecks, materials_kopecks,
+          resources_kopecks: The same amounts as exact integer kopecks
         - quantity: The quantity used in calculation
         - search_used: Boolean indicating if search was performed
 
@@ -303,61 +553,43 @@ def quick_calculate(rate_identifier: str, quantity: float) -> str:
     try:
         # Validate quantity
         if quantity <= 0:
-            error_response = {
-                "error": "Invalid input",
-                "details": f"Quantity must be greater than 0, got: {quantity}",
-            }
-            logger.error(f"quick_calculate error: {error_response['details']}")
-            return safe_json_serialize(error_response)
+            details = f"Quantity must be greater than 0, got: {quantity}"
+            logger.error(f"quick_calculate error: {details}")
+            return _error_json("Invalid input", details)
 
         # Validate identifier
         if not rate_identifier or not rate_identifier.strip():
-            error_response = {
-                "error": "Invalid input",
-                "details": "Rate identifier cannot be empty",
-            }
-            logger.error(f"quick_calculate error: {error_response['details']}")
-            return safe_json_serialize(error_response)
-
-        rate_identifier = rate_identifier.strip()
-        search_used = False
-        rate_code = None
-
-        # Auto-detect: is it a code or search query?
-        if is_rate_code(rate_identifier):
-            # Use directly as rate code
-            rate_code = rate_identifier
-            logger.info(f"Detected as rate code: {rate_code}")
-        else:
-            # Search for the rate first
-            logger.info(f"Detected as search query: {rate_identifier}")
-            search_results = search_engine.search(rate_identifier, limit=1)
-
-            if not search_results:
-                error_response = {
-                    "error": "Rate not found",
-                    "details": f"No rates found matching '{rate_identifier}'",
-                }
-                logger.error(f"quick_calculate error: {error_response['details']}")
-                return safe_json_serialize(error_response)
+            details = "Rate identifier cannot be empty"
+            logger.error(f"quick_calculate error: {details}")
+            return _error_json("Invalid input", details)
+
+        # Exact code match or best full-text match in a single query
+        resolved = _cached_resolve(" ".join(rate_identifier.split()))
+
+        if resolved is None:
+            details = f"No rates found matching '{rate_identifier}'"
+            logger.error(f"quick_calculate error: {details}")
+            return _error_json("Rate not found", details)
 
-            # Use the best match
-            rate_code = search_results[0]["rate_code"]
-            search_used = True
-            logger.info(f"Found best match: {rate_code}")
+        rate_code, search_used = resolved
+        logger.info(f"Resolved to rate code: {rate_code} (search_used={search_used})")
 
         # Calculate cost
-        result = cost_calculator.calculate(rate_code, quantity)
+        result = _cached_calculate(rate_code, quantity)
 
         # Format response
         response = {
             "success": True,
             "search_used": search_used,
             "rate_info": result["rate_info"],
-            "cost_per_unit": format_cost(result["cost_per_unit"]),
-            "calculated_total": format_cost(result["calculated_total"]),
-            "materials": format_cost(result["materials"]),
-            "resources": format_cost(result["resources"]),
+            "cost_per_unit": result["cost_per_unit"],
+            "calculated_total": result["calculated_total"],
+            "materials": result["materials"],
+            "resources": result["resources"],
+            "cost_per_unit_kopecks": result["cost_per_unit_kopecks"],
+            "calculated_total_kopecks": result["calculated_total_kopecks"],
+            "materials_kopecks": result["materials_kopecks"],
+            "resources_kopecks": result["resources_kopecks"],
             "quantity": quantity,
         }
 
@@ -367,17 +599,15 @@ def quick_calculate(rate_identifier: str, quantity: float) -> str:
         return safe_json_serialize(response)
 
     except ValueError as e:
-        error_response = {"error": "Calculation failed", "details": str(e)}
         logger.error(f"quick_calculate error: {str(e)}")
-        return safe_json_serialize(error_response)
+        return _error_json("Calculation failed", str(e))
 
     except Exception as e:
-        error_response = {"error": "Unexpected error", "details": str(e)}
         logger.error(f"quick_calculate error: {str(e)}", exc_info=True)
-        return safe_json_serialize(error_response)
+        return _error_json("Unexpected error", str(e))
 
 
-@mcp.tool()
+@threaded_tool
 def show_rate_details(rate_code: str, quantity: float = 1.0) -> str:
     """Get detailed resource breakdown for a rate.
 
@@ -395,6 +625,8 @@ def show_rate_details(rate_code: str, quantity: float = 1.0) -> str:
         - cost_per_unit: Cost per single unit
         - materials: Total materials cost
         - resources: Total labor/machinery cost
+        - total_cost_kopecks, cost_per_unit_kopecks, materials_kopecks,
+          resources_kopecks: The same amounts as exact integer kopecks
         - quantity: The quantity used
         - breakdown: List of resource items with:
             - resource_code: Resource identifier
@@ -415,53 +647,27 @@ def show_rate_details(rate_code: str, quantity: float = 1.0) -> str:
     try:
         # Validate inputs
         if not rate_code or not rate_code.strip():
-            error_response = {
-                "error": "Invalid input",
-                "details": "Rate code cannot be empty",
-            }
-            logger.error(f"show_rate_details error: {error_response['details']}")
-            return safe_json_serialize(error_response)
+            details = "Rate code cannot be empty"
+            logger.error(f"show_rate_details error: {details}")
+            return _error_json("Invalid input", details)
 
         if quantity <= 0:
-            error_response = {
-                "error": "Invalid input",
-                "details": f"Quantity must be greater than 0, got: {quantity}",
-            }
-            logger.error(f"show_rate_details error: {error_response['details']}")
-            return safe_json_serialize(error_response)
-
-        # Get detailed breakdown
-        result = cost_calculator.get_detailed_breakdown(rate_code.strip(), quantity)
-
-        # Format response
-        response = {
-            "success": True,
-            "rate_info": result["rate_info"],
-            "total_cost": format_cost(result["calculated_total"]),
-            "cost_per_unit": format_cost(result["cost_per_unit"]),
-            "materials": format_cost(result["materials"]),
-            "resources": format_cost(result["resources"]),
-            "quantity": quantity,
-            "breakdown": result["breakdown"],
-        }
+            details = f"Quantity must be greater than 0, got: {quantity}"
+            logger.error(f"show_rate_details error: {details}")
+            return _error_json("Invalid input", details)
 
-        logger.info(
-            f"show_rate_details completed: {rate_code} with {len(result['breakdown'])} resources"
-        )
-        return safe_json_serialize(response)
+        return _rate_details_json(rate_code.strip(), quantity)
 
     except ValueError as e:
-        error_response = {"error": "Rate not found or invalid", "details": str(e)}
         logger.error(f"show_rate_details error: {str(e)}")
-        return safe_json_serialize(error_response)
+        return _error_json("Rate not found or invalid", str(e))
 
     except Exception as e:
-        error_response = {"error": "Unexpected error", "details": str(e)}
         logger.error(f"show_rate_details error: {str(e)}", exc_info=True)
-        return safe_json_serialize(error_response)
+        return _error_json("Unexpected error", str(e))
 
 
-@mcp.tool()
+@threaded_tool
 def compare_variants(rate_codes: List[str], quantity: float) -> str:
     """Compare multiple rate variants for cost analysis.
 
@@ -494,65 +700,35 @@ def compare_variants(rate_codes: List[str], quantity: float) -> str:
     )
 
     try:
+        # Drop blanks and duplicates; sorted, since results are ordered by
+        # cost rather than input order, so equal sets share a cache entry
+        codes = tuple(
+            sorted({code.strip() for code in rate_codes or [] if code and code.strip()})
+        )
+
         # Validate inputs
-        if not rate_codes or len(rate_codes) == 0:
-            error_response = {
-                "error": "Invalid input",
-                "details": "rate_codes list cannot be empty",
-            }
-            logger.error(f"compare_variants error: {error_response['details']}")
-            return safe_json_serialize(error_response)
+        if not codes:
+            details = "rate_codes list cannot be empty"
+            logger.error(f"compare_variants error: {details}")
+            return _error_json("Invalid input", details)
 
         if quantity <= 0:
-            error_response = {
-                "error": "Invalid input",
-                "details": f"Quantity must be greater than 0, got: {quantity}",
-            }
-            logger.error(f"compare_variants error: {error_response['details']}")
-            return safe_json_serialize(error_response)
-
-        # Perform comparison
-        comparison_df = rate_comparator.compare(rate_codes, quantity)
-
-        # Convert DataFrame to list of dicts
-        comparison_results = comparison_df.to_dict(orient="records")
-
-        # Format numeric values
-        for item in comparison_results:
-            for key in [
-                "cost_per_unit",
-                "total_for_quantity",
-                "materials_for_quantity",
-                "difference_from_cheapest",
-                "difference_percent",
-            ]:
-                if key in item:
-                    item[key] = format_cost(item[key])
-
-        response = {
-            "success": True,
-            "count": len(comparison_results),
-            "quantity": quantity,
-            "comparison": comparison_results,
-        }
+            details = f"Quantity must be greater than 0, got: {quantity}"
+            logger.error(f"compare_variants error: {details}")
+            return _error_json("Invalid input", details)
 
-        logger.info(
-            f"compare_variants completed: {len(comparison_results)} rates compared"
-        )
-        return safe_json_serialize(response)
+        return _compare_json(codes, quantity)
 
     except ValueError as e:
-        error_response = {"error": "Comparison failed", "details": str(e)}
         logger.error(f"compare_variants error: {str(e)}")
-        return safe_json_serialize(error_response)
+        return _error_json("Comparison failed", str(e))
 
     except Exception as e:
-        error_response = {"error": "Unexpected error", "details": str(e)}
         logger.error(f"compare_variants error: {str(e)}", exc_info=True)
-        return safe_json_serialize(error_response)
+        return _error_json("Unexpected error", str(e))
 
 
-@mcp.tool()
+@threaded_tool
 def find_similar_rates(rate_code: str, max_results: int = 5) -> str:
     """Find alternative rates similar to the given rate.
 
@@ -588,60 +764,25 @@ def find_similar_rates(rate_code: str, max_results: int = 5) -> str:
     try:
         # Validate inputs
         if not rate_code or not rate_code.strip():
-            error_response = {
-                "error": "Invalid input",
-                "details": "Rate code cannot be empty",
-            }
-            logger.error(f"find_similar_rates error: {error_response['details']}")
-            return safe_json_serialize(error_response)
+            details = "Rate code cannot be empty"
+            logger.error(f"find_similar_rates error: {details}")
+            return _error_json("Invalid input", details)
 
         # Cap max_results at 20
         max_results = min(max(1, max_results), 20)
 
-        # Find alternatives
-        alternatives_df = rate_comparator.find_alternatives(
-            rate_code.strip(), max_results=max_results
-        )
-
-        # Convert DataFrame to list of dicts
-        alternatives_results = alternatives_df.to_dict(orient="records")
-
-        # Format numeric values
-        for item in alternatives_results:
-            for key in [
-                "cost_per_unit",
-                "total_for_quantity",
-                "materials_for_quantity",
-                "difference_from_cheapest",
-                "difference_percent",
-            ]:
-                if key in item:
-                    item[key] = format_cost(item[key])
-
-        response = {
-            "success": True,
-            "source_rate": rate_code.strip(),
-            "count": len(alternatives_results),
-            "alternatives": alternatives_results,
-        }
-
-        logger.info(
-            f"find_similar_rates completed: {len(alternatives_results)} alternatives found"
-        )
-        return safe_json_serialize(response)
+        return _similar_rates_json(rate_code.strip(), max_results)
 
     except ValueError as e:
-        error_response = {"error": "Rate not found or invalid", "details": str(e)}
         logger.error(f"find_similar_rates error: {str(e)}")
-        return safe_json_serialize(error_response)
+        return _error_json("Rate not found or invalid", str(e))
 
     except Exception as e:
-        error_response = {"error": "Unexpected error", "details": str(e)}
         logger.error(f"find_similar_rates error: {str(e)}", exc_info=True)
-        return safe_json_serialize(error_response)
+        return _error_json("Unexpected error", str(e))
 
 
-@mcp.tool()
+@threaded_tool
 def vector_search(
     query: str,
     limit: int = 10,
@@ -686,35 +827,27 @@ def vector_search(
     )
 
     try:
-        # Check if vector search is available
+        # Check if vector search is available (created on first call)
+        vector_engine = _get_vector_engine()
         if vector_engine is None:
-            error_response = {
-                "error": "Service unavailable",
-                "details": "Vector search is not available. OPENAI_API_KEY environment variable is not set.",
-            }
-            logger.error(f"vector_search error: {error_response['details']}")
-            return safe_json_serialize(error_response)
+            details = "Vector search is not available. OPENAI_API_KEY environment variable is not set."
+            logger.error(f"vector_search error: {details}")
+            return _error_json("Service unavailable", details)
 
         # Validate inputs
         if not query or not query.strip():
-            error_response = {
-                "error": "Invalid input",
-                "details": "Query cannot be empty",
-            }
-            logger.error(f"vector_search error: {error_response['details']}")
-            return safe_json_serialize(error_response)
+            details = "Query cannot be empty"
+            logger.error(f"vector_search error: {details}")
+            return _error_json("Invalid input", details)
 
         # Cap limit at 100
         limit = min(max(1, limit), 100)
 
         # Validate similarity threshold
         if similarity_threshold < 0 or similarity_threshold > 1:
-            error_response = {
-                "error": "Invalid input",
-                "details": f"similarity_threshold must be between 0 and 1, got: {similarity_threshold}",
-            }
-            logger.error(f"vector_search error: {error_response['details']}")
-            return safe_json_serialize(error_response)
+            details = f"similarity_threshold must be between 0 and 1, got: {similarity_threshold}"
+            logger.error(f"vector_search error: {details}")
+            return _error_json("Invalid input", details)
 
         # Build filters
         filters = {}
@@ -757,14 +890,12 @@ def vector_search(
         return safe_json_serialize(response)
 
     except ValueError as e:
-        error_response = {"error": "Search failed", "details": str(e)}
         logger.error(f"vector_search error: {str(e)}")
-        return safe_json_serialize(error_response)
+        return _error_json("Search failed", str(e))
 
     except Exception as e:
-        error_response = {"error": "Unexpected error", "details": str(e)}
         logger.error(f"vector_search error: {str(e)}", exc_info=True)
-        return safe_json_serialize(error_response)
+        return _error_json("Unexpected error", str(e))
 
 
 # Server entry point
@@ -801,8 +932,11 @@ if __name__ == "__main__":
         logger.error(f"Server error: {str(e)}", exc_info=True)
         raise
     finally:
-        # Cleanup database connection
-        if db_manager.connection:
-            db_manager.disconnect()
-            logger.info("Database connection closed")
+        # Cleanup database connections
+        if semantic_cache:
+            semantic_cache.close()
+        if embedding_cache:
+            embedding_cache.close()
+        if db_pool:
+            db_pool.close()
         logger.info("MCP server stopped")
@@ -12,7 +12,7 @@ Features:
 - Batch data population with transactions
 - Automatic database backup with --force flag
 - Comprehensive logging to file and console
-- Data integrity checks (PRAGMA integrity_check)
+- Data integrity checks (PRAGMA quick_check; full integrity_check with --full-check)
 - Statistics reporting (execution time, record counts, file size)
 - Graceful error handling with cleanup
 
@@ -21,52 +21,75 @@ Usage:
         --input data/raw/rates.xlsx \
         --output data/processed/estimates.db \
         --force \
-        --batch-size 1000
+        --batch-size 10000
 
 Author: ETL Pipeline Team
 Date: 2025-10-19
 """
 
+from __future__ import annotations
+
 import argparse
+import errno
+import hashlib
 import logging
+import logging.handlers
+import os
+import queue
 import sys
 import shutil
 import sqlite3
+import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple
+
+try:
+    import fcntl  # POSIX only; used for FICLONE reflink backups
+except ImportError:
+    fcntl = None
 
 # Add project root to path to import local modules
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.etl.excel_loader import ExcelLoader
-from src.etl.data_aggregator import DataAggregator
-from src.etl.db_populator import DatabasePopulator
 from src.database.db_manager import DatabaseManager
 
+# pandas/openpyxl-based ETL modules are imported in main() once the
+# arguments are valid, so --help and early errors return immediately
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 # ============================================================================
 # Logging Setup
 # ============================================================================
 
-def setup_logging(log_dir: Path) -> logging.Logger:
+def setup_logging(
+    log_dir: Path
+) -> Tuple[logging.Logger, logging.handlers.QueueListener]:
     """
     Configure logging to write to both file and console.
 
     Creates log directory if it doesn't exist and sets up dual handlers
-    with timestamps and appropriate formatting.
+    with timestamps and appropriate formatting. The root logger only puts
+    records on a queue; a QueueListener thread does the file and console
+    writes, so the load loops never wait on log I/O.
 
     Args:
         log_dir: Directory where log files will be stored
 
     Returns:
-        Configured logger instance
+        Tuple of (configured logger, started listener); call
+        listener.stop() before exiting to flush pending records
 
     Example:
-        >>> logger = setup_logging(Path("data/logs"))
+        >>> logger, listener = setup_logging(Path("data/logs"))
         >>> logger.info("ETL pipeline started")
+        >>> listener.stop()
     """
     # Create log directory
     log_dir.mkdir(parents=True, exist_ok=True)
@@ -100,23 +123,72 @@ def setup_logging(log_dir: Path) -> logging.Logger:
     )
     console_handler.setFormatter(console_formatter)
 
-    # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # Route records through a queue to a background listener thread
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
 
     logger.info(f"Logging initialized: {log_file}")
-    return logger
+    return logger, listener
 
 
 # ============================================================================
 # Database Backup
 # ============================================================================
 
+# Linux ioctl that makes dst share src's extents (btrfs, xfs): O(1) copy
+FICLONE = 0x40049409
+
+
+def _copy_in_kernel(src: Path, dst: Path) -> bool:
+    """
+    Copy src to dst without moving the data through Python buffers.
+
+    Tries a FICLONE reflink first (copy-on-write filesystems), then
+    os.copy_file_range(), which the kernel may also serve as a reflink or a
+    server-side copy. Metadata is not copied.
+
+    Args:
+        src: Source file
+        dst: Destination file (created or truncated)
+
+    Returns:
+        True if dst is a full copy, False if the caller should fall back
+    """
+    if fcntl is None or not hasattr(os, "copy_file_range"):
+        return False
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return True
+        except OSError:
+            pass  # Not a CoW filesystem (or different filesystems)
+
+        size = os.fstat(fsrc.fileno()).st_size
+        copied = 0
+        try:
+            while copied < size:
+                count = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                if count == 0:
+                    break
+                copied += count
+        except OSError:
+            return False
+
+        return copied == size
+
+
 def backup_database(db_path: Path, logger: logging.Logger) -> Optional[Path]:
     """
     Create timestamped backup of existing database file.
 
-    Uses shutil.copy2() to preserve file metadata while creating backup.
+    Copies in the kernel where possible (FICLONE reflink, then
+    copy_file_range), falling back to shutil.copy2(); file metadata is
+    preserved either way.
     Backup filename format: {original_name}_backup_{timestamp}.db
 
     Args:
@@ -133,7 +205,10 @@ def backup_database(db_path: Path, logger: logging.Logger) -> Optional[Path]:
         >>> backup_path = backup_database(Path("data/estimates.db"), logger)
         >>> print(f"Backup created: {backup_path}")
     """
-    if not db_path.exists():
+    # One stat() both checks existence and gives the size to verify against
+    try:
+        original_size = db_path.stat().st_size
+    except FileNotFoundError:
         logger.info(f"Database does not exist, no backup needed: {db_path}")
         return None
 
@@ -143,10 +218,12 @@ def backup_database(db_path: Path, logger: logging.Logger) -> Optional[Path]:
 
     try:
         logger.info(f"Creating backup: {db_path} -> {backup_path}")
-        shutil.copy2(db_path, backup_path)
+        if _copy_in_kernel(db_path, backup_path):
+            shutil.copystat(db_path, backup_path)
+        else:
+            shutil.copy2(db_path, backup_path)
 
         # Verify backup size matches original
-        original_size = db_path.stat().st_size
         backup_size = backup_path.stat().st_size
 
         if original_size == backup_size:
@@ -162,6 +239,170 @@ def backup_database(db_path: Path, logger: logging.Logger) -> Optional[Path]:
         raise IOError(f"Backup creation failed: {str(e)}") from e
 
 
+# ============================================================================
+# Aggregate Cache
+# ============================================================================
+
+# Aggregated DataFrames of earlier runs, keyed by input content hash
+AGGREGATE_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "aggregates"
+
+# Order of the DataFrames returned by Step 2
+AGGREGATE_NAMES = ("rates", "resources", "price_statistics", "resource_mass", "services")
+
+
+def aggregate_cache_key(input_path: Path) -> str:
+    """
+    Hash the input workbook together with the ETL code that aggregates it.
+
+    Including excel_loader.py and data_aggregator.py means a code change
+    invalidates cached aggregates just like a changed workbook does.
+
+    Args:
+        input_path: Input Excel file
+
+    Returns:
+        Hex digest identifying the aggregation result
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    etl_dir = PROJECT_ROOT / "src" / "etl"
+
+    for path in (input_path, etl_dir / "excel_loader.py", etl_dir / "data_aggregator.py"):
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def load_cached_aggregates(
+    cache_key: str,
+    logger: logging.Logger
+) -> Optional[Tuple[pd.DataFrame, ...]]:
+    """
+    Load the Step 2 DataFrames cached for cache_key.
+
+    Args:
+        cache_key: Result of aggregate_cache_key()
+        logger: Logger instance for logging
+
+    Returns:
+        DataFrames in AGGREGATE_NAMES order, or None if not cached
+    """
+    import pandas as pd
+
+    paths = [AGGREGATE_CACHE_DIR / f"{cache_key}_{name}.pkl" for name in AGGREGATE_NAMES]
+    if not all(path.exists() for path in paths):
+        return None
+
+    try:
+        frames = tuple(pd.read_pickle(path) for path in paths)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable aggregate cache {cache_key}: {e}")
+        return None
+
+    logger.info(f"Loaded cached aggregates: {AGGREGATE_CACHE_DIR / cache_key}_*.pkl")
+    return frames
+
+
+def save_cached_aggregates(
+    cache_key: str,
+    frames: Tuple[pd.DataFrame, ...],
+    logger: logging.Logger
+) -> None:
+    """
+    Cache the Step 2 DataFrames for later runs on the same input.
+
+    Failures only log a warning: the cache is an optimization.
+
+    Args:
+        cache_key: Result of aggregate_cache_key()
+        frames: DataFrames in AGGREGATE_NAMES order
+        logger: Logger instance for logging
+    """
+    try:
+        AGGREGATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for name, frame in zip(AGGREGATE_NAMES, frames):
+            frame.to_pickle(AGGREGATE_CACHE_DIR / f"{cache_key}_{name}.pkl")
+        logger.info(f"Cached aggregates for later runs: {cache_key}")
+    except Exception as e:
+        logger.warning(f"Could not cache aggregates: {e}")
+
+
+# ============================================================================
+# Scratch Build Location
+# ============================================================================
+
+# RAM-backed filesystem used for the build when it has room
+SCRATCH_DIR = Path("/dev/shm")
+
+# The workbook is zip-compressed; expect the database to be a few times larger
+SCRATCH_SIZE_FACTOR = 4
+
+
+def scratch_build_dir(input_path: Path, logger: logging.Logger) -> Path:
+    """
+    Create a temporary directory to build the database in.
+
+    Uses /dev/shm (tmpfs) when it is writable and has room for an estimated
+    SCRATCH_SIZE_FACTOR x the input size, so commits and checkpoints during
+    the load never wait on the target disk; otherwise the system temp dir.
+
+    Args:
+        input_path: Input Excel file (used to estimate the database size)
+        logger: Logger instance for logging
+
+    Returns:
+        Path to a new empty directory; the caller removes it
+    """
+    needed = SCRATCH_SIZE_FACTOR * input_path.stat().st_size
+    parent = None
+
+    if SCRATCH_DIR.is_dir() and os.access(SCRATCH_DIR, os.W_OK):
+        if shutil.disk_usage(SCRATCH_DIR).free >= needed:
+            parent = SCRATCH_DIR
+        else:
+            logger.info(f"Not enough space in {SCRATCH_DIR}, using the temp dir")
+
+    build_dir = Path(tempfile.mkdtemp(prefix="build_database_", dir=parent))
+    logger.info(f"Building database in {build_dir}")
+    return build_dir
+
+
+def move_database(src: Path, dst: Path, logger: logging.Logger) -> None:
+    """
+    Move the finished database from the scratch location onto dst.
+
+    os.replace() is atomic when both paths are on one filesystem. Otherwise
+    the file is copied (in the kernel where possible) next to dst and then
+    renamed over it, so readers never see a partially written database.
+
+    Args:
+        src: Built database (closed, no -wal/-shm files)
+        dst: Final database path
+        logger: Logger instance for logging
+    """
+    dst.parent.mkdir(parents=True, exist_ok=True)
+
+    # WAL/SHM files of the old database must not be applied to the new one
+    for suffix in ("-wal", "-shm"):
+        Path(f"{dst}{suffix}").unlink(missing_ok=True)
+
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+
+        # Different filesystem: copy beside dst, then rename atomically
+        tmp_path = dst.with_name(f".{dst.name}.tmp")
+        if not _copy_in_kernel(src, tmp_path):
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+        src.unlink()
+
+    logger.info(f"Database moved into place: {dst}")
+
+
 # ============================================================================
 # Database Schema Loading
 # ============================================================================
@@ -204,19 +445,192 @@ def load_schema(db_manager: DatabaseManager, logger: logging.Logger) -> None:
         raise
 
 
+# ============================================================================
+# Bulk Load Settings
+# ============================================================================
+
+# PRAGMAs for the one-off load into a freshly created database. A crash
+# mid-load only means re-running the ETL (the partial file is deleted), so
+# durability is traded for speed: no fsyncs and a large page cache.
+BULK_LOAD_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "OFF",
+    "temp_store": "MEMORY",
+    "cache_size": -262144,  # Negative value = KB (256MB)
+    "locking_mode": "EXCLUSIVE",
+    "mmap_size": 30000000000,
+}
+
+
+def configure_bulk_load(db_manager: DatabaseManager, logger: logging.Logger) -> None:
+    """
+    Apply bulk-load PRAGMAs before the schema is created and data loaded.
+
+    Only safe for a database the ETL creates from scratch: with
+    synchronous=OFF a crash can corrupt the file, which the pipeline then
+    deletes and rebuilds.
+
+    Args:
+        db_manager: DatabaseManager instance with active connection
+        logger: Logger instance for logging
+
+    Example:
+        >>> with DatabaseManager('data/estimates.db') as db:
+        ...     configure_bulk_load(db, logger)
+        ...     load_schema(db, logger)
+    """
+    for pragma, value in BULK_LOAD_PRAGMAS.items():
+        db_manager.execute_query(f"PRAGMA {pragma} = {value}")
+
+    logger.info(f"Bulk load PRAGMAs applied: {BULK_LOAD_PRAGMAS}")
+
+
+def finalize_after_load(db_manager: DatabaseManager, logger: logging.Logger) -> None:
+    """
+    Restore serving settings after the load and integrity checks.
+
+    A WAL database opened with locking_mode=EXCLUSIVE cannot release its
+    lock while in WAL mode, so the journal goes through DELETE (which also
+    checkpoints the WAL into the main file), the lock is released, and WAL
+    is re-enabled with synchronous=NORMAL for readers and later writers.
+
+    Args:
+        db_manager: DatabaseManager instance with active connection
+        logger: Logger instance for logging
+    """
+    db_manager.execute_query("PRAGMA journal_mode = DELETE")
+    db_manager.execute_query("PRAGMA locking_mode = NORMAL")
+
+    # The exclusive lock is dropped on the next access
+    db_manager.execute_query("SELECT COUNT(*) FROM sqlite_master")
+
+    db_manager.execute_query("PRAGMA journal_mode = WAL")
+    db_manager.execute_query("PRAGMA synchronous = NORMAL")
+
+    logger.info("Serving PRAGMAs restored: journal_mode=WAL, synchronous=NORMAL")
+
+
+# ============================================================================
+# Deferred Index Build
+# ============================================================================
+
+# Triggers that only copy inserted rates into the FTS index; the index is
+# rebuilt from the rates table in one pass after the load instead
+DEFERRED_TRIGGERS = ("rates_fts_insert",)
+
+
+def drop_deferred_indexes(
+    db_manager: DatabaseManager,
+    logger: logging.Logger
+) -> List[str]:
+    """
+    Drop secondary indexes and the FTS insert trigger before the bulk load.
+
+    Every explicit index (and the FTS trigger) would otherwise be updated
+    row by row during the load. Indexes backing PRIMARY KEY/UNIQUE
+    constraints are kept, so constraint and foreign key checks still work.
+    The CREATE statements are read back from sqlite_master, so schema.sql
+    stays the single definition of the schema.
+
+    Args:
+        db_manager: DatabaseManager instance with the schema loaded
+        logger: Logger instance for logging
+
+    Returns:
+        CREATE statements to pass to build_deferred_indexes()
+    """
+    placeholders = ",".join("?" * len(DEFERRED_TRIGGERS))
+    rows = db_manager.execute_query(
+        f"""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE (type = 'index' AND sql IS NOT NULL)
+           OR (type = 'trigger' AND name IN ({placeholders}))
+        """,
+        DEFERRED_TRIGGERS,
+    )
+
+    with db_manager.transaction():
+        for object_type, name, _ in rows:
+            db_manager.execute_update(f"DROP {object_type.upper()} {name}")
+
+    logger.info(f"Deferred {len(rows)} indexes/triggers until after the load")
+    return [sql for _, _, sql in rows]
+
+
+def build_deferred_indexes(
+    db_manager: DatabaseManager,
+    statements: List[str],
+    logger: logging.Logger
+) -> None:
+    """
+    Recreate deferred indexes, rebuild the FTS index and run ANALYZE.
+
+    Each index is built with one sort over the loaded table, and the
+    external-content rates_fts index is filled by FTS5 'rebuild' from the
+    rates table (the same rows the insert trigger would have written).
+    'optimize' then merges the segments written by the rebuild into one
+    b-tree, which is smaller and cheaper to query.
+
+    Args:
+        db_manager: DatabaseManager instance with data loaded
+        statements: CREATE statements returned by drop_deferred_indexes()
+        logger: Logger instance for logging
+    """
+    start_time = time.time()
+
+    for sql in statements:
+        db_manager.execute_update(sql)
+
+    db_manager.execute_update("INSERT INTO rates_fts(rates_fts) VALUES('rebuild')")
+    db_manager.execute_update("INSERT INTO rates_fts(rates_fts) VALUES('optimize')")
+    db_manager.execute_update("ANALYZE")
+
+    elapsed = time.time() - start_time
+    logger.info(f"Built {len(statements)} indexes/triggers and FTS in {elapsed:.2f}s")
+
+
 # ============================================================================
 # Data Integrity Checks
 # ============================================================================
 
+def get_row_counts(db_manager: DatabaseManager) -> Dict[str, int]:
+    """
+    Count rates, resources and price statistics in one query.
+
+    Args:
+        db_manager: DatabaseManager instance with active connection
+
+    Returns:
+        Dictionary with rates_count, resources_count, price_statistics_count
+    """
+    rows = db_manager.execute_query(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM rates),
+            (SELECT COUNT(*) FROM resources),
+            (SELECT COUNT(*) FROM resource_price_statistics)
+        """
+    )
+    rates_count, resources_count, price_statistics_count = rows[0] if rows else (0, 0, 0)
+
+    return {
+        'rates_count': rates_count,
+        'resources_count': resources_count,
+        'price_statistics_count': price_statistics_count,
+    }
+
+
 def run_integrity_checks(
     db_manager: DatabaseManager,
-    logger: logging.Logger
+    logger: logging.Logger,
+    full: bool = False
 ) -> Dict[str, Any]:
     """
     Run SQLite integrity checks and validate record counts.
 
     Performs:
-    1. PRAGMA integrity_check - SQLite internal consistency check
+    1. PRAGMA quick_check - SQLite internal consistency check (O(N), skips
+       the index-content cross-checks; PRAGMA integrity_check if full=True)
     2. Validates rates count > 0
     3. Validates resources count > 0
     4. Validates price_statistics count
@@ -224,6 +638,7 @@ def run_integrity_checks(
     Args:
         db_manager: DatabaseManager instance with active connection
         logger: Logger instance for logging
+        full: Run the full PRAGMA integrity_check instead of quick_check
 
     Returns:
         Dictionary with integrity check results:
@@ -248,23 +663,25 @@ def run_integrity_checks(
     }
 
     try:
-        # 1. SQLite PRAGMA integrity_check
-        logger.info("Running PRAGMA integrity_check")
-        integrity_result = db_manager.execute_query("PRAGMA integrity_check")
+        # 1. SQLite PRAGMA quick_check / integrity_check
+        pragma = "integrity_check" if full else "quick_check"
+        logger.info(f"Running PRAGMA {pragma}")
+        integrity_result = db_manager.execute_query(f"PRAGMA {pragma}")
 
         if integrity_result and integrity_result[0][0] == 'ok':
             results['integrity_check'] = 'ok'
-            logger.info("PRAGMA integrity_check: OK")
+            logger.info(f"PRAGMA {pragma}: OK")
         else:
             results['integrity_check'] = str(integrity_result)
-            logger.error(f"PRAGMA integrity_check FAILED: {integrity_result}")
+            logger.error(f"PRAGMA {pragma} FAILED: {integrity_result}")
             return results
 
-        # 2. Validate rates count
-        logger.info("Validating rates count")
-        rates_result = db_manager.execute_query("SELECT COUNT(*) FROM rates")
-        rates_count = rates_result[0][0] if rates_result else 0
-        results['rates_count'] = rates_count
+        # 2. Validate rates count (all counts come from one query)
+        logger.info("Validating record counts")
+        row_counts = get_row_counts(db_manager)
+        results.update(row_counts)
+
+        rates_count = row_counts['rates_count']
 
         if rates_count == 0:
             logger.error("Integrity check FAILED: No rates found in database")
@@ -273,10 +690,7 @@ def run_integrity_checks(
         logger.info(f"Rates count: {rates_count:,}")
 
         # 3. Validate resources count
-        logger.info("Validating resources count")
-        resources_result = db_manager.execute_query("SELECT COUNT(*) FROM resources")
-        resources_count = resources_result[0][0] if resources_result else 0
-        results['resources_count'] = resources_count
+        resources_count = row_counts['resources_count']
 
         if resources_count == 0:
             logger.warning("Warning: No resources found in database")
@@ -285,10 +699,7 @@ def run_integrity_checks(
             logger.info(f"Resources count: {resources_count:,}")
 
         # 4. Validate price statistics count
-        logger.info("Validating price statistics count")
-        price_stats_result = db_manager.execute_query("SELECT COUNT(*) FROM resource_price_statistics")
-        price_stats_count = price_stats_result[0][0] if price_stats_result else 0
-        results['price_statistics_count'] = price_stats_count
+        price_stats_count = row_counts['price_statistics_count']
 
         if price_stats_count == 0:
             logger.warning("Warning: No price statistics found in database")
@@ -311,6 +722,63 @@ def run_integrity_checks(
         return results
 
 
+def start_full_integrity_check(
+    db_path: Path,
+    logger: logging.Logger,
+    report_path: Optional[Path] = None,
+    on_done: Optional[Callable[[], None]] = None
+) -> threading.Thread:
+    """
+    Run the full PRAGMA integrity_check in a background thread.
+
+    The check reads every table and index, so it runs on its own read-only
+    connection after the pipeline has finished. The result is written to a
+    sidecar file (by default next to the database, <db>.integrity.txt).
+
+    Args:
+        db_path: Path to the populated database
+        logger: Logger instance for logging
+        report_path: Where to write the result (default: next to db_path)
+        on_done: Called from the thread once the result has been logged
+
+    Returns:
+        Started non-daemon thread; the interpreter waits for it on exit
+    """
+    if report_path is None:
+        report_path = db_path.with_name(db_path.name + ".integrity.txt")
+
+    def check() -> None:
+        start_time = time.time()
+        try:
+            try:
+                with DatabaseManager(str(db_path), read_only=True) as db:
+                    rows = db.execute_query("PRAGMA integrity_check")
+                result = "\n".join(str(row[0]) for row in rows)
+            except sqlite3.Error as e:
+                result = f"ERROR: {str(e)}"
+
+            elapsed = time.time() - start_time
+            report_path.parent.mkdir(parents=True, exist_ok=True)
+            report_path.write_text(
+                f"{datetime.now().isoformat()} PRAGMA integrity_check "
+                f"({elapsed:.2f}s):\n{result}\n",
+                encoding="utf-8",
+            )
+
+            if result == "ok":
+                logger.info(f"Full integrity check: OK ({elapsed:.2f}s)")
+            else:
+                logger.error(f"Full integrity check FAILED, see {report_path}")
+        finally:
+            if on_done is not None:
+                on_done()
+
+    thread = threading.Thread(target=check, name="full-integrity-check")
+    thread.start()
+    logger.info(f"Full integrity check started in background -> {report_path}")
+    return thread
+
+
 # ============================================================================
 # Statistics Collection
 # ============================================================================
@@ -319,7 +787,8 @@ def get_statistics(
     db_path: Path,
     execution_time: float,
     db_manager: DatabaseManager,
-    logger: logging.Logger
+    logger: logging.Logger,
+    row_counts: Optional[Dict[str, int]] = None
 ) -> Dict[str, Any]:
     """
     Collect and return pipeline execution statistics.
@@ -336,6 +805,8 @@ def get_statistics(
         execution_time: Total pipeline execution time in seconds
         db_manager: DatabaseManager instance for querying counts
         logger: Logger instance for logging
+        row_counts: Counts already collected by run_integrity_checks(), to
+            skip querying them again
 
     Returns:
         Dictionary with statistics:
@@ -362,20 +833,15 @@ def get_statistics(
 
     try:
         # Get record counts
-        rates_result = db_manager.execute_query("SELECT COUNT(*) FROM rates")
-        stats['rates_count'] = rates_result[0][0] if rates_result else 0
-
-        resources_result = db_manager.execute_query("SELECT COUNT(*) FROM resources")
-        stats['resources_count'] = resources_result[0][0] if resources_result else 0
-
-        price_stats_result = db_manager.execute_query("SELECT COUNT(*) FROM resource_price_statistics")
-        stats['price_statistics_count'] = price_stats_result[0][0] if price_stats_result else 0
+        if row_counts is None:
+            row_counts = get_row_counts(db_manager)
+        stats.update(row_counts)
 
         # Get database file size
-        if db_path.exists():
+        try:
             size_bytes = db_path.stat().st_size
             stats['db_size_mb'] = size_bytes / (1024 * 1024)  # Convert to MB
-        else:
+        except FileNotFoundError:
             logger.warning(f"Database file not found: {db_path}")
 
         logger.info(f"Statistics collected: {stats}")
@@ -399,11 +865,14 @@ def main() -> int:
     2. Setup logging
     3. Backup existing database (if --force)
     4. Load Excel data
-    5. Aggregate rates and resources
-    6. Initialize database schema
+    5. Aggregate rates (resources are aggregated in the background)
+    6. Apply bulk-load PRAGMAs and initialize database schema (in a scratch
+       directory, tmpfs when available)
     7. Populate database with transactions
-    8. Run integrity checks
-    9. Report statistics
+    8. Run integrity checks and restore serving PRAGMAs
+    9. Collect statistics and move the database onto the output path
+    10. Report statistics (a --full-check integrity_check then runs on the
+        moved database in a thread the process waits for on exit)
 
     Returns:
         Exit code: 0 for success, 1 for failure
@@ -456,11 +925,25 @@ Examples:
         help='Overwrite existing database (creates backup first)'
     )
 
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always re-read and re-aggregate the Excel file (do not read or '
+             'write data/cache/aggregates)'
+    )
+
+    parser.add_argument(
+        '--full-check',
+        action='store_true',
+        help='Also run the full PRAGMA integrity_check (in background, '
+             'result in <output>.integrity.txt)'
+    )
+
     parser.add_argument(
         '--batch-size',
         type=int,
-        default=1000,
-        help='Batch size for database inserts (default: 1000)'
+        default=None,
+        help='Batch size for database inserts (default: 10000)'
     )
 
     args = parser.parse_args()
@@ -476,7 +959,7 @@ Examples:
         return 1
 
     # Validate batch size
-    if batch_size <= 0:
+    if batch_size is not None and batch_size <= 0:
         print(f"ERROR: Batch size must be positive, got: {batch_size}", file=sys.stderr)
         return 1
 
@@ -489,12 +972,17 @@ Examples:
         )
         return 1
 
+    # Heavy ETL imports (pandas, openpyxl) only once there is work to do
+    from src.etl.excel_loader import ExcelLoader
+    from src.etl.data_aggregator import DataAggregator
+    from src.etl.db_populator import DatabasePopulator
+
+    if batch_size is None:
+        batch_size = DatabasePopulator.DEFAULT_BATCH_SIZE
+
     # Setup logging
     log_dir = PROJECT_ROOT / "data" / "logs"
-    logger = setup_logging(log_dir)
-
-    # Track if database was newly created (for cleanup on failure)
-    db_was_new = not output_path.exists()
+    logger, log_listener = setup_logging(log_dir)
 
     # Start pipeline
     logger.info("=" * 80)
@@ -506,6 +994,8 @@ Examples:
     logger.info(f"Force overwrite: {args.force}")
 
     start_time = time.time()
+    build_dir = None
+    full_check_thread = None
 
     try:
         # ====================================================================
@@ -517,53 +1007,69 @@ Examples:
             if backup_path:
                 logger.info(f"Backup created: {backup_path}")
 
-        # ====================================================================
-        # Step 1: Load Excel file
-        # ====================================================================
-        logger.info("Step 1: Loading Excel file")
-        excel_loader = ExcelLoader(str(input_path))
-        df = excel_loader.load()
-        excel_loader.validate()
-
-        excel_stats = excel_loader.get_statistics()
-        logger.info(f"Excel loaded: {excel_stats['total_rows']:,} rows, "
-                   f"{excel_stats['unique_rates']:,} unique rates")
-
-        # ====================================================================
-        # Step 2: Aggregate data
-        # ====================================================================
-        logger.info("Step 2: Aggregating rates and resources")
-        aggregator = DataAggregator(df)
+        # Steps 1-2 are skipped when this input was aggregated before
+        cache_key = None if args.no_cache else aggregate_cache_key(input_path)
+        cached = load_cached_aggregates(cache_key, logger) if cache_key else None
+        resources_future = None
 
-        # Aggregate rates (now returns tuple: rates_df, resources_df, price_statistics_df, resource_mass_df, services_df)
-        logger.info("Step 2a: Aggregating rates")
-        rates_df, _, price_statistics_df, mass_df, services_df = aggregator.aggregate_rates(df)
-        logger.info(f"Aggregated {len(rates_df):,} rates")
-        logger.info(f"Extracted {len(price_statistics_df):,} price statistics records")
-        logger.info(f"Extracted {len(mass_df):,} mass records")
-        logger.info(f"Extracted {len(services_df):,} service records")
+        if cached is not None:
+            logger.info("Steps 1-2: Input unchanged, using cached aggregates")
+            rates_df, resources_df, price_statistics_df, mass_df, services_df = cached
+            logger.info(f"Aggregated {len(rates_df):,} rates, {len(resources_df):,} resources")
+        else:
+            # ================================================================
+            # Step 1: Load Excel file
+            # ================================================================
+            logger.info("Step 1: Loading Excel file")
+            excel_loader = ExcelLoader(str(input_path))
+            df = excel_loader.load()
+            excel_loader.validate()
 
-        # Aggregate resources
-        logger.info("Step 2b: Aggregating resources")
-        resources_df = aggregator.aggregate_resources(df)
-        logger.info(f"Aggregated {len(resources_df):,} resources")
+            excel_stats = excel_loader.get_statistics()
+            logger.info(f"Excel loaded: {excel_stats['total_rows']:,} rows, "
+                       f"{excel_stats['unique_rates']:,} unique rates")
 
-        aggregator_stats = aggregator.get_statistics()
-        logger.info(f"Aggregation complete: {aggregator_stats}")
+            # ================================================================
+            # Step 2: Aggregate data
+            # ================================================================
+            logger.info("Step 2: Aggregating rates and resources")
+            aggregator = DataAggregator(df)
+
+            # Aggregate rates (now returns tuple: rates_df, resources_df, price_statistics_df, resource_mass_df, services_df)
+            logger.info("Step 2a: Aggregating rates")
+            rates_df, _, price_statistics_df, mass_df, services_df = aggregator.aggregate_rates(df)
+            logger.info(f"Aggregated {len(rates_df):,} rates")
+            logger.info(f"Extracted {len(price_statistics_df):,} price statistics records")
+            logger.info(f"Extracted {len(mass_df):,} mass records")
+            logger.info(f"Extracted {len(services_df):,} service records")
+
+            # Aggregate resources in a worker thread: rates do not depend on
+            # them, so Steps 3-4a (SQLite releases the GIL) overlap with it
+            logger.info("Step 2b: Aggregating resources (in background)")
+            resources_executor = ThreadPoolExecutor(max_workers=1)
+            resources_future = resources_executor.submit(
+                aggregator.aggregate_resources, df
+            )
+            resources_executor.shutdown(wait=False)
 
         # ====================================================================
         # Step 3: Initialize database and load schema
         # ====================================================================
         logger.info("Step 3: Initializing database")
 
-        # Delete existing database if --force
-        if args.force and output_path.exists():
-            logger.info(f"Removing existing database: {output_path}")
-            output_path.unlink()
+        # Build in a scratch location (tmpfs when it fits) and move the
+        # finished file onto output_path in Step 7; until then an existing
+        # database stays in place untouched
+        build_dir = scratch_build_dir(input_path, logger)
+        build_path = build_dir / output_path.name
 
         # Create database and load schema
-        with DatabaseManager(str(output_path)) as db:
+        with DatabaseManager(str(build_path)) as db:
+            # The scratch file is new, so a crash during the load only
+            # means re-running the pipeline
+            configure_bulk_load(db, logger)
             load_schema(db, logger)
+            deferred_indexes = drop_deferred_indexes(db, logger)
 
             # ================================================================
             # Step 4: Populate database with transactions
@@ -571,30 +1077,45 @@ Examples:
             logger.info("Step 4: Populating database")
             populator = DatabasePopulator(db, batch_size=batch_size)
 
-            # Populate rates
-            logger.info("Step 4a: Populating rates table")
-            rates_inserted = populator.populate_rates(rates_df)
-            logger.info(f"Inserted {rates_inserted:,} rates")
-
-            # Populate resources
-            logger.info("Step 4b: Populating resources table")
-            resources_inserted = populator.populate_resources(resources_df)
-            logger.info(f"Inserted {resources_inserted:,} resources")
-
-            # PHASE 1: Populate price statistics table
-            logger.info("Step 4c: Populating price statistics table")
-            price_stats_inserted = populator.populate_price_statistics(price_statistics_df)
-            logger.info(f"Inserted {price_stats_inserted:,} price statistics")
-
-            # P2: Populate mass table
-            logger.info("Step 4d: Populating resource_mass table")
-            mass_inserted = populator._populate_resource_mass(mass_df)
-            logger.info(f"Inserted {mass_inserted:,} mass records")
-
-            # P2: Populate services table
-            logger.info("Step 4e: Populating services table")
-            services_inserted = populator._populate_services(services_df)
-            logger.info(f"Inserted {services_inserted:,} service records")
+            # One transaction for all tables: a single COMMIT (and fsync)
+            # instead of one per batch; any failure rolls back everything
+            with db.transaction():
+                # Populate rates
+                logger.info("Step 4a: Populating rates table")
+                rates_inserted = populator.populate_rates(rates_df)
+                logger.info(f"Inserted {rates_inserted:,} rates")
+
+                # Resources are needed from here on
+                if resources_future is not None:
+                    resources_df = resources_future.result()
+                    logger.info(f"Aggregated {len(resources_df):,} resources")
+
+                    aggregator_stats = aggregator.get_statistics()
+                    logger.info(f"Aggregation complete: {aggregator_stats}")
+
+                # Populate resources
+                logger.info("Step 4b: Populating resources table")
+                resources_inserted = populator.populate_resources(resources_df)
+                logger.info(f"Inserted {resources_inserted:,} resources")
+
+                # PHASE 1: Populate price statistics table
+                logger.info("Step 4c: Populating price statistics table")
+                price_stats_inserted = populator.populate_price_statistics(price_statistics_df)
+                logger.info(f"Inserted {price_stats_inserted:,} price statistics")
+
+                # P2: Populate mass table
+                logger.info("Step 4d: Populating resource_mass table")
+                mass_inserted = populator._populate_resource_mass(mass_df)
+                logger.info(f"Inserted {mass_inserted:,} mass records")
+
+                # P2: Populate services table
+                logger.info("Step 4e: Populating services table")
+                services_inserted = populator._populate_services(services_df)
+                logger.info(f"Inserted {services_inserted:,} service records")
+
+                # Indexes and FTS are built once over the loaded tables
+                logger.info("Step 4f: Building indexes and FTS")
+                build_deferred_indexes(db, deferred_indexes, logger)
 
             # ================================================================
             # Step 5: Run integrity checks
@@ -609,12 +1130,40 @@ Examples:
 
             logger.info("Integrity checks PASSED")
 
+            # Make the database safe for readers again
+            finalize_after_load(db, logger)
+
             # ================================================================
             # Step 6: Collect and report statistics
             # ================================================================
             logger.info("Step 6: Collecting statistics")
             elapsed = time.time() - start_time
-            stats = get_statistics(output_path, elapsed, db, logger)
+            row_counts = {
+                key: integrity_results[key]
+                for key in ('rates_count', 'resources_count', 'price_statistics_count')
+            }
+            stats = get_statistics(build_path, elapsed, db, logger, row_counts)
+
+        # ====================================================================
+        # Step 7: Move the database into place
+        # ====================================================================
+        logger.info("Step 7: Moving database into place")
+        move_database(build_path, output_path, logger)
+
+        # Only aggregates that produced a valid database are cached
+        if cache_key and cached is None:
+            save_cached_aggregates(
+                cache_key,
+                (rates_df, resources_df, price_statistics_df, mass_df, services_df),
+                logger,
+            )
+
+        # The full check is off the critical path: it runs on the moved
+        # database after main() returns and owns the log listener from here
+        if args.full_check:
+            full_check_thread = start_full_integrity_check(
+                output_path, logger, on_done=log_listener.stop
+            )
 
         # ====================================================================
         # Pipeline Complete - Report Success
@@ -634,17 +1183,6 @@ Examples:
 
     except KeyboardInterrupt:
         logger.warning("\nPipeline interrupted by user (Ctrl+C)")
-        logger.info("Cleaning up...")
-
-        # Clean up partial database if it was newly created
-        if db_was_new and output_path.exists():
-            logger.info(f"Removing partial database: {output_path}")
-            try:
-                output_path.unlink()
-                logger.info("Cleanup complete")
-            except Exception as e:
-                logger.error(f"Failed to remove partial database: {str(e)}")
-
         return 1  # Failure
 
     except Exception as e:
@@ -652,18 +1190,15 @@ Examples:
         logger.error("ETL Pipeline FAILED")
         logger.error("=" * 80)
         logger.error(f"Error: {str(e)}", exc_info=True)
-
-        # Clean up partial database if it was newly created
-        if db_was_new and output_path.exists():
-            logger.info(f"Cleaning up partial database: {output_path}")
-            try:
-                output_path.unlink()
-                logger.info("Cleanup complete")
-            except Exception as cleanup_error:
-                logger.error(f"Failed to remove partial database: {str(cleanup_error)}")
-
         return 1  # Failure
 
+    finally:
+        # The partial (or already moved) build never touches output_path
+        if build_dir is not None:
+            shutil.rmtree(build_dir, ignore_errors=True)
+        if full_check_thread is None:
+            log_listener.stop()
+
 
 # ============================================================================
 # Entry Point
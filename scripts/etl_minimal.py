@@ -2,16 +2,27 @@
 """
 Minimal memory-efficient ETL for large Excel files.
 Reads XLSX row-by-row and writes directly to SQLite in small batches.
+Rows are streamed by the native calamine reader when python-calamine is
+installed, otherwise by openpyxl in read-only mode.
 """
 
 import sys
 import sqlite3
 import logging
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
+from typing import Iterator, Optional, Tuple
 from openpyxl import load_workbook
 from tqdm import tqdm
 from collections import defaultdict
 
+try:
+    from python_calamine import CalamineWorkbook
+    _HAS_CALAMINE = True
+except ImportError:
+    _HAS_CALAMINE = False
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
@@ -28,14 +39,65 @@ COLUMN_MAPPING = {
     "median_price": 27,  # Прайс | АбстРесурс | Сметная цена текущая_median
 }
 
+# Rows per executemany() call; inside the single load transaction this only
+# bounds memory, and larger batches amortize the per-call overhead
+DEFAULT_BATCH_SIZE = 10000
+
+# Row type keywords -> cost column, checked in order (first match wins)
+COST_BUCKETS = (
+    (("труд", "рабоч"), "labor_cost"),
+    (("машин", "механ"), "machine_cost"),
+    (("материал",), "material_cost"),
+)
+
+
+@lru_cache(maxsize=None)
+def cost_bucket(row_type) -> Optional[str]:
+    """
+    Map a row type to the rate cost column it adds to.
+
+    Row types take only a handful of distinct values, so each is lowercased
+    and searched once and the answer is cached.
+
+    Returns:
+        "labor_cost", "machine_cost", "material_cost", or None
+    """
+    row_type = str(row_type).lower()
+    for keywords, cost_key in COST_BUCKETS:
+        if any(keyword in row_type for keyword in keywords):
+            return cost_key
+    return None
+
+
+# PRAGMAs for the single-writer load. page_size must be set before the first
+# table is created and before switching to WAL; WAL with synchronous=NORMAL
+# does not fsync the database file on commit.
+ETL_PRAGMAS = {
+    "page_size": 8192,
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,  # 256MB
+    "cache_size": -65536,  # Negative value = KB (64MB)
+    "locking_mode": "EXCLUSIVE",
+}
+
 
 def create_database(db_path: Path):
-    """Create SQLite database with schema."""
+    """
+    Create SQLite database with the base tables only.
+
+    Indexes and the FTS5 table are added by create_indexes_and_fts() once
+    the data is loaded, so inserts do not maintain them row by row.
+    """
     logger.info(f"Creating database: {db_path}")
 
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
+    for pragma, value in ETL_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma} = {value}")
+
     # Create tables
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS rates (
@@ -63,15 +125,20 @@ def create_database(db_path: Path):
         )
     """)
 
-    # Create FTS5 table
-    cursor.execute("""
-        CREATE VIRTUAL TABLE IF NOT EXISTS rates_fts USING fts5(
-            rate_code,
-            rate_full_name,
-            content=rates,
-            content_rowid=id
-        )
-    """)
+    conn.commit()
+    return conn
+
+
+def create_indexes_and_fts(db_conn: sqlite3.Connection):
+    """
+    Create indexes and the FTS5 search index over the loaded tables.
+
+    Each index is built with one sort over its table, and the
+    external-content FTS5 index is filled by a single 'rebuild' from rates.
+    """
+    logger.info("Building indexes and FTS5 search index...")
+    cursor = db_conn.cursor()
+    cursor.execute("BEGIN")
 
     # Create indexes
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_rates_code ON rates(rate_code)")
@@ -82,91 +149,138 @@ def create_database(db_path: Path):
         "CREATE INDEX IF NOT EXISTS idx_resources_code ON resources(resource_code)"
     )
 
-    conn.commit()
-    return conn
+    # Create and populate FTS5 table
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS rates_fts USING fts5(
+            rate_code,
+            rate_full_name,
+            content=rates,
+            content_rowid=id
+        )
+    """)
+    cursor.execute("INSERT INTO rates_fts(rates_fts) VALUES('rebuild')")
+
+    db_conn.commit()
+
+
+def open_sheet_rows(excel_path: Path) -> Tuple[int, Iterator[tuple]]:
+    """
+    Open the first worksheet for row-by-row reading.
+
+    calamine parses the XML in Rust and hands back whole rows, so no Python
+    cell objects are created; openpyxl read-only mode is the fallback.
+    Empty cells are None with openpyxl and "" with calamine; both are falsy.
+
+    Returns:
+        Tuple of (total row count including header, iterator of row tuples)
+    """
+    if _HAS_CALAMINE:
+        logger.info("Using calamine reader")
+        sheet = CalamineWorkbook.from_path(str(excel_path)).get_sheet_by_index(0)
+        return sheet.height, sheet.iter_rows()
+
+    # Load workbook in read-only mode (streaming)
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    ws = wb.active
+
+    def rows() -> Iterator[tuple]:
+        try:
+            yield from ws.iter_rows(values_only=True)
+        finally:
+            wb.close()
+
+    return ws.max_row, rows()
 
 
 def process_excel_streaming(
-    excel_path: Path, db_conn: sqlite3.Connection, batch_size: int = 1000
+    excel_path: Path,
+    db_conn: sqlite3.Connection,
+    batch_size: int = DEFAULT_BATCH_SIZE,
 ):
     """
     Process Excel file row-by-row with minimal memory usage.
 
     Strategy:
-    1. Read Excel in read_only mode (no worksheet caching)
+    1. Stream worksheet rows (calamine or openpyxl read_only, no caching)
     2. Process rows in small batches
     3. Aggregate rate data on-the-fly
     4. Insert to SQLite in batches
     """
     logger.info(f"Opening Excel file: {excel_path}")
 
-    # Load workbook in read-only mode (streaming)
-    wb = load_workbook(excel_path, read_only=True, data_only=True)
-    ws = wb.active
-
     # Get total rows for progress bar
-    total_rows = ws.max_row
+    total_rows, sheet_rows = open_sheet_rows(excel_path)
     logger.info(f"Total rows: {total_rows:,}")
 
     # Data structures
-    rates_dict = {}  # rate_code -> {costs, name, unit}
+    # rate_code -> {costs, name, unit}; entries are created on first access
+    rates_dict = defaultdict(
+        lambda: {
+            "name": "",
+            "unit": "",
+            "total_cost": 0.0,
+            "labor_cost": 0.0,
+            "machine_cost": 0.0,
+            "material_cost": 0.0,
+        }
+    )
     resources_batch = []
 
     # Read header (first row) - skip it
-    header_iter = ws.iter_rows(min_row=1, max_row=1, values_only=True)
-    header = next(header_iter)
+    header = next(sheet_rows)
     logger.info(f"Columns: {len(header)}")
 
-    # Process data rows
+    # Process data rows. The whole load is one transaction: batches only
+    # bound memory, and the single commit() at the end makes it durable.
     cursor = db_conn.cursor()
+    cursor.execute("BEGIN")
     processed_rows = 0
 
     pbar = tqdm(
-        ws.iter_rows(min_row=2, values_only=True),
+        sheet_rows,
         desc="Processing rows",
         total=total_rows - 1,
         unit="rows",
     )
 
+    # Picks all mapped cells in one C call, in COLUMN_MAPPING order
+    extract_values = itemgetter(*COLUMN_MAPPING.values())
+
     for row in pbar:
         try:
             # Extract values
-            rate_code = row[COLUMN_MAPPING["rate_code"]]
-            rate_name = row[COLUMN_MAPPING["rate_full_name"]]
-            unit_type = row[COLUMN_MAPPING["unit_type"]]
-            row_type = row[COLUMN_MAPPING["row_type"]]
-            resource_code = row[COLUMN_MAPPING["resource_code"]]
-            resource_cost = row[COLUMN_MAPPING["resource_cost"]]
-            median_price = row[COLUMN_MAPPING["median_price"]]
+            (
+                rate_code,
+                rate_name,
+                unit_type,
+                row_type,
+                resource_code,
+                resource_cost,
+                median_price,
+            ) = extract_values(row)
 
             # Skip rows without rate code
             if not rate_code:
                 continue
 
-            # Initialize rate if first time seeing it
-            if rate_code not in rates_dict:
-                rates_dict[rate_code] = {
-                    "name": rate_name or "",
-                    "unit": unit_type or "",
-                    "total_cost": 0.0,
-                    "labor_cost": 0.0,
-                    "machine_cost": 0.0,
-                    "material_cost": 0.0,
-                }
+            # One hash lookup per row; name and unit come from the first row
+            # that has them
+            rate = rates_dict[rate_code]
+            if not rate["name"]:
+                rate["name"] = rate_name or ""
+            if not rate["unit"]:
+                rate["unit"] = unit_type or ""
+
+            # Typed once, shared by the rate totals and the resource record
+            cost = float(resource_cost) if resource_cost else 0.0
 
             # Aggregate costs based on row type
             if row_type and resource_cost is not None:
-                cost = float(resource_cost) if resource_cost else 0.0
-                rates_dict[rate_code]["total_cost"] += cost
-
-                if "труд" in str(row_type).lower() or "рабоч" in str(row_type).lower():
-                    rates_dict[rate_code]["labor_cost"] += cost
-                elif (
-                    "машин" in str(row_type).lower() or "механ" in str(row_type).lower()
-                ):
-                    rates_dict[rate_code]["machine_cost"] += cost
-                elif "материал" in str(row_type).lower():
-                    rates_dict[rate_code]["material_cost"] += cost
+                rate["total_cost"] += cost
+
+                cost_key = cost_bucket(row_type)
+                if cost_key:
+                    rate[cost_key] += cost
 
             # Add resource record
             if resource_code:
@@ -174,7 +288,7 @@ def process_excel_streaming(
                     (
                         rate_code,
                         resource_code,
-                        float(resource_cost) if resource_cost else 0.0,
+                        cost,
                         float(median_price) if median_price else None,
                     )
                 )
@@ -187,7 +301,6 @@ def process_excel_streaming(
                     "INSERT INTO resources (rate_code, resource_code, resource_cost, median_price) VALUES (?, ?, ?, ?)",
                     resources_batch,
                 )
-                db_conn.commit()
                 resources_batch = []
                 pbar.set_postfix(
                     {"rates": len(rates_dict), "resources": processed_rows}
@@ -198,7 +311,6 @@ def process_excel_streaming(
             continue
 
     pbar.close()
-    wb.close()
 
     # Insert remaining resources
     if resources_batch:
@@ -206,7 +318,6 @@ def process_excel_streaming(
             "INSERT INTO resources (rate_code, resource_code, resource_cost, median_price) VALUES (?, ?, ?, ?)",
             resources_batch,
         )
-        db_conn.commit()
 
     # Insert aggregated rates
     logger.info(f"Inserting {len(rates_dict):,} aggregated rates...")
@@ -232,7 +343,6 @@ def process_excel_streaming(
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
                 rates_batch,
             )
-            db_conn.commit()
             rates_batch = []
 
     if rates_batch:
@@ -242,14 +352,7 @@ def process_excel_streaming(
                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
             rates_batch,
         )
-        db_conn.commit()
 
-    # Populate FTS5 index
-    logger.info("Building FTS5 search index...")
-    cursor.execute("""
-        INSERT INTO rates_fts (rowid, rate_code, rate_full_name)
-        SELECT id, rate_code, rate_full_name FROM rates
-    """)
     db_conn.commit()
 
     logger.info(f"✅ Processed {processed_rows:,} rows")
@@ -291,10 +394,12 @@ def main():
     # Ensure output directory exists
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Remove old database if exists
+    # Remove old database if exists (with any WAL left by an interrupted run)
     if db_path.exists():
         logger.info(f"Removing old database: {db_path}")
         db_path.unlink()
+    for suffix in ("-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
 
     logger.info("=" * 60)
     logger.info("Starting Minimal Memory-Efficient ETL")
@@ -304,7 +409,10 @@ def main():
     conn = create_database(db_path)
 
     # Process Excel
-    process_excel_streaming(excel_path, conn, batch_size=1000)
+    process_excel_streaming(excel_path, conn, batch_size=DEFAULT_BATCH_SIZE)
+
+    # Index the loaded data
+    create_indexes_and_fts(conn)
 
     # Verify
     conn.close()
@@ -6,10 +6,11 @@ This script:
 1. Loads all rates from the database
 2. Generates embeddings using OpenAI text-embedding-3-small model
 3. Updates the rates table with embeddings in batches
-4. Updates metadata tracking
+4. Writes the same embeddings to the rates_vec (sqlite-vec vec0) KNN index
+5. Updates metadata tracking
 
 Usage:
-    python scripts/generate_embeddings_openai.py --api-key YOUR_KEY [--batch-size 100]
+    python scripts/generate_embeddings_openai.py --api-key YOUR_KEY [--batch-size 256]
 
 Requirements:
     - Database with migrated schema (embedding column exists)
@@ -77,7 +78,8 @@ def batch_generate_embeddings(
     db_manager: DatabaseManager,
     vector_engine: VectorSearchEngine,
     rates: list,
-    batch_size: int = 100,
+    batch_size: int = 256,
+    int8_index: bool = False,
 ):
     """
     Generate embeddings in batches using OpenAI API and update database.
@@ -87,6 +89,7 @@ def batch_generate_embeddings(
         vector_engine: Vector search engine with OpenAI client
         rates: List of (rate_code, rate_full_name) tuples
         batch_size: Number of rates to process per API call
+        int8_index: Create the rates_vec index with int8 (quantized) vectors
 
     Returns:
         Tuple of (successful_count, failed_count)
@@ -135,21 +138,23 @@ def batch_generate_embeddings(
                 pbar.update(len(valid_items))
                 continue
 
-            # Update database
+            # Update database in one executemany transaction
             update_sql = "UPDATE rates SET embedding = ? WHERE rate_code = ?"
 
-            for rate_code, embedding in zip(rate_codes, embeddings):
-                try:
-                    db_manager.execute_query(update_sql, (embedding, rate_code))
-                    successful += 1
-                except Exception as e:
-                    logger.error(f"Failed to update rate {rate_code}: {e}")
-                    failed += 1
+            try:
+                db_manager.execute_many(update_sql, list(zip(embeddings, rate_codes)))
+                successful += len(rate_codes)
+            except Exception as e:
+                logger.error(f"Failed to update batch {i}: {e}")
+                failed += len(rate_codes)
 
-                pbar.update(1)
+            pbar.update(len(rate_codes))
 
-            # Commit batch
-            db_manager.connection.commit()
+            # Dual-write the rates_vec KNN index used by vector search
+            try:
+                vector_engine.sync_vec_index(rate_codes, int8=int8_index)
+            except Exception as e:
+                logger.error(f"Failed to update vector index for batch {i}: {e}")
 
             batch_time = time.time() - batch_start
             rates_per_sec = len(batch) / batch_time if batch_time > 0 else 0
@@ -225,8 +230,8 @@ def main():
     parser.add_argument(
         "--batch-size",
         type=int,
-        default=100,
-        help="Number of rates to process per API call (default: 100, max: 2048)",
+        default=256,
+        help="Number of rates to process per API call (default: 256, max: 2048)",
     )
     parser.add_argument(
         "--resume",
@@ -247,6 +252,12 @@ def main():
         help="OpenAI embedding model (default: text-embedding-3-small)",
     )
 
+    parser.add_argument(
+        "--int8-index",
+        action="store_true",
+        help="Store int8-quantized vectors in a new rates_vec index (4x smaller)",
+    )
+
     args = parser.parse_args()
 
     # Validate batch size (OpenAI allows up to 2048 inputs per request)
@@ -294,7 +305,11 @@ def main():
     # Generate embeddings
     start_time = time.time()
     embedded_count, failed_count = batch_generate_embeddings(
-        db_manager, vector_engine, rates, batch_size=args.batch_size
+        db_manager,
+        vector_engine,
+        rates,
+        batch_size=args.batch_size,
+        int8_index=args.int8_index,
     )
     total_time = time.time() - start_time
 
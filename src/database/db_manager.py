@@ -8,8 +8,10 @@ with optimized settings for full-text search and construction rate data.
 import sqlite3
 import logging
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple, Any, Optional
+from typing import Iterator, List, Tuple, Any, Optional
 
 
 # Configure logging
@@ -31,6 +33,7 @@ class DatabaseManager:
         db_path (str): Path to the SQLite database file
         connection (sqlite3.Connection): Active database connection
         cursor (sqlite3.Cursor): Database cursor for query execution
+        cached_statements (int): Prepared statement cache size per connection
 
     Example:
         >>> with DatabaseManager('data/processed/estimates.db') as db:
@@ -38,18 +41,31 @@ class DatabaseManager:
         ...     results = db.execute_query("SELECT * FROM rates WHERE unit_type = ?", ("м2",))
     """
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self, db_path: str, cached_statements: int = 512, read_only: bool = False
+    ):
         """
         Initialize DatabaseManager with database path.
 
         Args:
             db_path: Path to the SQLite database file
+            cached_statements: Size of the connection's prepared statement
+                cache (sqlite3 default is 128)
+            read_only: Open the file with mode=ro (the database must exist)
         """
         self.db_path = db_path
+        self.cached_statements = cached_statements
+        self.read_only = read_only
         self.connection: Optional[sqlite3.Connection] = None
         self.cursor: Optional[sqlite3.Cursor] = None
         self._is_new_database = not os.path.exists(db_path)
 
+        # Serializes cursor access when the connection is shared between threads
+        self._lock = threading.RLock()
+
+        # True inside transaction(): writes are committed once at its end
+        self._in_transaction = False
+
         logger.info(f"DatabaseManager initialized for: {db_path}")
         if self._is_new_database:
             logger.info(
@@ -96,12 +112,23 @@ class DatabaseManager:
         try:
             # Create parent directories if they don't exist
             db_dir = os.path.dirname(self.db_path)
-            if db_dir and not os.path.exists(db_dir):
+            if db_dir and not self.read_only and not os.path.exists(db_dir):
                 os.makedirs(db_dir, exist_ok=True)
                 logger.info(f"Created directory: {db_dir}")
 
-            # Establish connection
-            self.connection = sqlite3.connect(self.db_path)
+            # Establish connection (may be used from worker threads, access is
+            # serialized through self._lock). Prepared statements are cached per
+            # connection by SQL text, so repeated queries skip parse and plan.
+            if self.read_only:
+                target = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            else:
+                target = self.db_path
+            self.connection = sqlite3.connect(
+                target,
+                uri=self.read_only,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
 
             # Enable extension loading
             self.connection.enable_load_extension(True)
@@ -138,14 +165,25 @@ class DatabaseManager:
         - journal_mode=WAL: Write-Ahead Logging for better concurrency
         - synchronous=NORMAL: Balance between safety and speed
         - cache_size=-64000: ~64MB cache for better performance
+        - temp_store=MEMORY: Sorts and temp b-trees (e.g., FTS5 ORDER BY rank) in RAM
+        - mmap_size=268435456: 256MB memory-mapped reads
+        - busy_timeout=5000: Wait up to 5s for a lock held by another process
         - foreign_keys=ON: Enable foreign key constraints
+
+        Read-only connections keep the file's journal mode (changing it is a
+        write).
         """
         pragma_settings = {
             "journal_mode": "WAL",
             "synchronous": "NORMAL",
             "cache_size": -64000,  # Negative value = KB (64MB)
+            "temp_store": "MEMORY",
+            "mmap_size": 268435456,
+            "busy_timeout": 5000,
             "foreign_keys": "ON",
         }
+        if self.read_only:
+            del pragma_settings["journal_mode"]
 
         for pragma, value in pragma_settings.items():
             try:
@@ -161,13 +199,20 @@ class DatabaseManager:
         """
         Close database connection and clean up resources.
 
-        Commits any pending transactions before closing.
+        Commits any pending transactions and runs PRAGMA optimize (refreshes
+        query planner statistics the connection found stale) before closing.
         """
         if self.connection:
             try:
                 # Commit any pending transactions
                 self.connection.commit()
 
+                # Best effort: fails on read-only (query_only) connections
+                try:
+                    self.connection.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    logger.debug(f"PRAGMA optimize skipped: {str(e)}")
+
                 # Close cursor
                 if self.cursor:
                     self.cursor.close()
@@ -238,6 +283,56 @@ class DatabaseManager:
             self.connection.rollback()
             raise
 
+    @contextmanager
+    def transaction(self) -> Iterator["DatabaseManager"]:
+        """
+        Run a group of writes as one transaction.
+
+        Issues BEGIN IMMEDIATE on entry and a single COMMIT on exit, so
+        execute_many()/execute_update() calls inside the block do not commit
+        (and fsync) one by one. Any exception rolls back the whole block; a
+        failed statement inside it only undoes that statement, so callers
+        that handle the error keep their earlier writes. Nested calls join
+        the outer transaction.
+
+        Yields:
+            Self, for use as ``with db.transaction() as db:``
+
+        Raises:
+            sqlite3.Error: If not connected or the transaction cannot start
+
+        Example:
+            >>> with db.transaction():
+            ...     db.execute_many("INSERT INTO rates VALUES (?, ?, ?, ?, ?)", rows)
+            ...     db.execute_many("INSERT INTO resources VALUES (...)", resources)
+        """
+        if not self.connection or not self.cursor:
+            error_msg = "Database not connected. Use connect() or context manager."
+            logger.error(error_msg)
+            raise sqlite3.Error(error_msg)
+
+        # The lock is held for the whole block, so other threads wait for
+        # the commit; only the owning thread (RLock) can see the flag set
+        with self._lock:
+            if self._in_transaction:
+                yield self
+                return
+
+            self.connection.commit()  # Close any implicit transaction first
+            self.cursor.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            try:
+                yield self
+            except BaseException:
+                self.connection.rollback()
+                logger.warning("Transaction rolled back")
+                raise
+            else:
+                self.connection.commit()
+                logger.debug("Transaction committed")
+            finally:
+                self._in_transaction = False
+
     def execute_query(
         self, sql: str, params: Optional[Tuple[Any, ...]] = None
     ) -> List[Tuple[Any, ...]]:
@@ -265,23 +360,24 @@ class DatabaseManager:
             logger.error(error_msg)
             raise sqlite3.Error(error_msg)
 
-        try:
-            if params:
-                self.cursor.execute(sql, params)
-                logger.debug(f"Executed query with params: {sql[:100]}...")
-            else:
-                self.cursor.execute(sql)
-                logger.debug(f"Executed query: {sql[:100]}...")
+        with self._lock:
+            try:
+                if params:
+                    self.cursor.execute(sql, params)
+                    logger.debug(f"Executed query with params: {sql[:100]}...")
+                else:
+                    self.cursor.execute(sql)
+                    logger.debug(f"Executed query: {sql[:100]}...")
 
-            results = self.cursor.fetchall()
-            logger.debug(f"Query returned {len(results)} rows")
+                results = self.cursor.fetchall()
+                logger.debug(f"Query returned {len(results)} rows")
 
-            return results
+                return results
 
-        except sqlite3.Error as e:
-            error_msg = f"Query execution failed: {str(e)}\nSQL: {sql[:200]}"
-            logger.error(error_msg)
-            raise sqlite3.Error(error_msg) from e
+            except sqlite3.Error as e:
+                error_msg = f"Query execution failed: {str(e)}\nSQL: {sql[:200]}"
+                logger.error(error_msg)
+                raise sqlite3.Error(error_msg) from e
 
     def execute_many(self, sql: str, data_list: List[Tuple[Any, ...]]) -> int:
         """
@@ -309,23 +405,27 @@ class DatabaseManager:
             logger.error(error_msg)
             raise sqlite3.Error(error_msg)
 
-        try:
-            logger.info(f"Executing batch operation: {len(data_list)} records")
+        with self._lock:
+            try:
+                logger.debug(f"Executing batch operation: {len(data_list)} records")
 
-            # Use transaction for batch operations
-            self.cursor.executemany(sql, data_list)
-            self.connection.commit()
+                # Use transaction for batch operations (the enclosing
+                # transaction() commits instead, if there is one)
+                self.cursor.executemany(sql, data_list)
+                if not self._in_transaction:
+                    self.connection.commit()
 
-            rows_affected = self.cursor.rowcount
-            logger.info(f"Batch operation completed: {rows_affected} rows affected")
+                rows_affected = self.cursor.rowcount
+                logger.debug(f"Batch operation completed: {rows_affected} rows affected")
 
-            return rows_affected
+                return rows_affected
 
-        except sqlite3.Error as e:
-            error_msg = f"Batch execution failed: {str(e)}\nSQL: {sql[:200]}"
-            logger.error(error_msg)
-            self.connection.rollback()
-            raise sqlite3.Error(error_msg) from e
+            except sqlite3.Error as e:
+                error_msg = f"Batch execution failed: {str(e)}\nSQL: {sql[:200]}"
+                logger.error(error_msg)
+                if not self._in_transaction:
+                    self.connection.rollback()
+                raise sqlite3.Error(error_msg) from e
 
     def execute_update(self, sql: str, params: Optional[Tuple[Any, ...]] = None) -> int:
         """
@@ -346,20 +446,23 @@ class DatabaseManager:
             logger.error(error_msg)
             raise sqlite3.Error(error_msg)
 
-        try:
-            if params:
-                self.cursor.execute(sql, params)
-            else:
-                self.cursor.execute(sql)
+        with self._lock:
+            try:
+                if params:
+                    self.cursor.execute(sql, params)
+                else:
+                    self.cursor.execute(sql)
 
-            self.connection.commit()
-            rows_affected = self.cursor.rowcount
+                if not self._in_transaction:
+                    self.connection.commit()
+                rows_affected = self.cursor.rowcount
 
-            logger.debug(f"Update executed: {rows_affected} rows affected")
-            return rows_affected
+                logger.debug(f"Update executed: {rows_affected} rows affected")
+                return rows_affected
 
-        except sqlite3.Error as e:
-            error_msg = f"Update execution failed: {str(e)}\nSQL: {sql[:200]}"
-            logger.error(error_msg)
-            self.connection.rollback()
-            raise sqlite3.Error(error_msg) from e
+            except sqlite3.Error as e:
+                error_msg = f"Update execution failed: {str(e)}\nSQL: {sql[:200]}"
+                logger.error(error_msg)
+                if not self._in_transaction:
+                    self.connection.rollback()
+                raise sqlite3.Error(error_msg) from e
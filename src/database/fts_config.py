@@ -48,6 +48,11 @@ SYNONYMS: Dict[str, List[str]] = {
 # Normalization Functions
 # ============================================================================
 
+# Compiled once; normalize_text() runs for every search query
+_SPECIAL_CHARS_RE = re.compile(r'[^а-яёa-z0-9\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
 def normalize_text(text: str) -> str:
     """
     Normalize text by removing special characters and standardizing format.
@@ -80,10 +85,10 @@ def normalize_text(text: str) -> str:
 
     # Keep only Cyrillic, Latin, digits, and spaces
     # Pattern: keep а-я (Cyrillic), a-z (Latin), 0-9 (digits), and spaces
-    text = re.sub(r'[^а-яёa-z0-9\s]', ' ', text)
+    text = _SPECIAL_CHARS_RE.sub(' ', text)
 
     # Collapse multiple spaces into single space
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
 
     # Strip leading/trailing whitespace
     text = text.strip()
@@ -0,0 +1,308 @@
+"""
+SQLite Connection Pool for Construction Rates Management System
+
+This module provides the SqlitePool class that keeps a fixed number of
+read-only DatabaseManager connections open so concurrent readers (API worker
+threads) do not serialize on a single shared connection, plus one writer
+connection for the rare writes (index maintenance).
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.database.db_manager import DatabaseManager
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+# Read-path PRAGMAs applied to every pooled connection on top of the
+# DatabaseManager defaults (WAL, synchronous=NORMAL, foreign_keys=ON)
+READ_PRAGMAS: Dict[str, Any] = {
+    "mmap_size": 268435456,  # 256MB memory-mapped I/O
+    "cache_size": -65536,  # Negative value = KB (64MB)
+    "temp_store": "MEMORY",  # Sorts/temp b-trees in RAM
+    "query_only": 1,  # Pooled connections never write
+}
+
+# FTS5 table and term used to warm pooled connections on startup
+FTS_TABLE = "rates_fts"
+WARMUP_TERM = "бетон"
+
+
+class SqlitePool:
+    """
+    Fixed-size pool of read-only SQLite connections with a single writer.
+
+    Each pooled connection is a DatabaseManager opened with mode=ro. Callers
+    check a connection out with read() (or acquire()) for the duration of
+    their work and it is returned to the pool on exit. The pool also exposes
+    execute_query() so it can be passed to services that expect a
+    DatabaseManager; each query then runs on whichever connection is free.
+    Writes go through write(), which serializes callers on one read-write
+    connection opened on first use (WAL lets it run alongside the readers).
+
+    Attributes:
+        db_path (str): Path to the SQLite database file
+        size (int): Number of connections kept open
+        timeout (Optional[float]): Default seconds acquire() and
+            execute_query() wait for a free connection (None waits forever)
+
+    Example:
+        >>> pool = SqlitePool('data/processed/estimates.db', size=8)
+        >>> pool.open()
+        >>> with pool.read() as db:
+        ...     rows = db.execute_query("SELECT COUNT(*) FROM rates")
+        >>> pool.close()
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = 4,
+        pragmas: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize SqlitePool.
+
+        Args:
+            db_path: Path to the SQLite database file
+            size: Number of connections to open (must be > 0)
+            pragmas: PRAGMA settings applied to each connection
+                     (default: READ_PRAGMAS)
+            timeout: Default seconds acquire()/execute_query() wait for a
+                     free connection before raising TimeoutError
+                     (default: wait forever)
+
+        Raises:
+            ValueError: If size <= 0
+        """
+        if size <= 0:
+            raise ValueError(f"Pool size must be greater than 0, got: {size}")
+
+        self.db_path = db_path
+        self.size = size
+        self.pragmas = READ_PRAGMAS if pragmas is None else pragmas
+        self.timeout = timeout
+        self._managers: List[DatabaseManager] = []
+        self._available: "queue.Queue[DatabaseManager]" = queue.Queue(maxsize=size)
+        self._writer: Optional[DatabaseManager] = None
+        self._write_lock = threading.Lock()
+
+    def __enter__(self):
+        """Open the pool on context entry."""
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close all pooled connections on context exit."""
+        self.close()
+        return False
+
+    @property
+    def is_open(self) -> bool:
+        """True if the pool has open connections."""
+        return bool(self._managers)
+
+    def open(self) -> None:
+        """
+        Open all pooled connections and apply PRAGMA settings.
+
+        Raises:
+            sqlite3.Error: If any connection fails
+        """
+        if self._managers:
+            return
+
+        for _ in range(self.size):
+            db = DatabaseManager(self.db_path, read_only=True)
+            db.connect()
+            self._apply_pragmas(db)
+            self._managers.append(db)
+            self._available.put(db)
+
+        logger.info(f"SqlitePool opened {self.size} connections to {self.db_path}")
+
+    def prewarm(self, fts_table: str = FTS_TABLE, optimize: bool = True) -> None:
+        """
+        Optimize the FTS5 index and load it into every connection's page cache.
+
+        The FTS5 'optimize' command merges index segments, which makes
+        ORDER BY rank queries faster; PRAGMA optimize refreshes planner
+        statistics. Both write to the database, so they run on the writer
+        connection and are skipped with a warning if the database is not
+        writable. Then a ranked MATCH query runs on each pooled connection
+        so the first user query does not pay for cold pages.
+
+        Servers pass optimize=False: build_database.py already optimizes the
+        index, and a write from every starting worker only contends for the
+        write lock.
+
+        Args:
+            fts_table: FTS5 table name (default: rates_fts)
+            optimize: Run the optimize commands before warming (default: True)
+
+        Raises:
+            RuntimeError: If the pool is not open
+        """
+        if not self._managers:
+            raise RuntimeError("SqlitePool is not open. Call open() first.")
+
+        if optimize:
+            try:
+                with self.write() as db:
+                    db.execute_update(
+                        f"INSERT INTO {fts_table}({fts_table}) VALUES('optimize')"
+                    )
+                    db.execute_query("PRAGMA optimize")
+                logger.info(f"Optimized FTS5 index {fts_table}")
+            except sqlite3.Error as e:
+                logger.warning(f"Skipping FTS5 optimize for {fts_table}: {str(e)}")
+
+        warmup_sql = (
+            f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ? "
+            f"ORDER BY rank LIMIT 1"
+        )
+        for db in self._managers:
+            try:
+                db.execute_query(warmup_sql, (WARMUP_TERM,))
+            except sqlite3.Error as e:
+                logger.warning(f"FTS5 warmup query failed: {str(e)}")
+                return
+
+        logger.info(f"Warmed {fts_table} on {len(self._managers)} pooled connections")
+
+    def _apply_pragmas(self, db: DatabaseManager) -> None:
+        """
+        Apply pool PRAGMA settings to a single connection.
+
+        PRAGMAs are per-connection in SQLite, so this runs for every
+        connection the pool opens.
+
+        Args:
+            db: Connected DatabaseManager
+        """
+        for pragma, value in self.pragmas.items():
+            try:
+                db.execute_query(f"PRAGMA {pragma} = {value}")
+            except Exception as e:
+                logger.warning(f"Failed to set PRAGMA {pragma}: {str(e)}")
+
+    def close(self) -> None:
+        """Close all pooled connections and the writer."""
+        managers = self._managers + ([self._writer] if self._writer else [])
+        for db in managers:
+            try:
+                db.disconnect()
+            except Exception as e:
+                logger.error(f"Error closing pooled connection: {str(e)}")
+
+        self._managers = []
+        self._writer = None
+        self._available = queue.Queue(maxsize=self.size)
+        logger.info("SqlitePool closed")
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[DatabaseManager]:
+        """
+        Check a connection out of the pool.
+
+        Blocks until a connection is free.
+
+        Args:
+            timeout: Maximum seconds to wait (default: the pool's timeout)
+
+        Yields:
+            Connected DatabaseManager, returned to the pool on exit
+
+        Raises:
+            RuntimeError: If the pool is not open
+            TimeoutError: If no connection became free within timeout
+        """
+        if not self._managers:
+            raise RuntimeError("SqlitePool is not open. Call open() first.")
+
+        if timeout is None:
+            timeout = self.timeout
+
+        try:
+            db = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No database connection available within {timeout}s"
+            ) from None
+
+        try:
+            yield db
+        finally:
+            self._available.put(db)
+
+    def read(self, timeout: Optional[float] = None):
+        """
+        Check a read-only connection out of the pool (alias of acquire()).
+
+        Args:
+            timeout: Maximum seconds to wait (default: the pool's timeout)
+
+        Returns:
+            Context manager yielding a connected DatabaseManager
+        """
+        return self.acquire(timeout)
+
+    @contextmanager
+    def write(self, timeout: Optional[float] = None) -> Iterator[DatabaseManager]:
+        """
+        Check out the single read-write connection.
+
+        The writer is opened on first use. Callers are serialized, so at most
+        one write transaction is in flight; readers keep running under WAL.
+
+        Args:
+            timeout: Maximum seconds to wait (default: wait forever)
+
+        Yields:
+            Connected read-write DatabaseManager
+
+        Raises:
+            RuntimeError: If the pool is not open
+            TimeoutError: If the writer did not become free within timeout
+        """
+        if not self._managers:
+            raise RuntimeError("SqlitePool is not open. Call open() first.")
+
+        if not self._write_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(f"Writer connection not available within {timeout}s")
+
+        try:
+            if self._writer is None:
+                writer = DatabaseManager(self.db_path)
+                writer.connect()
+                self._writer = writer
+            yield self._writer
+        finally:
+            self._write_lock.release()
+
+    def execute_query(
+        self, sql: str, params: Optional[Tuple[Any, ...]] = None
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Execute a SELECT query on any free pooled connection.
+
+        Args:
+            sql: SQL query string (use ? for parameters)
+            params: Optional tuple of parameters for the query
+
+        Returns:
+            List of tuples containing query results
+
+        Raises:
+            TimeoutError: If no connection became free within self.timeout
+        """
+        with self.acquire() as db:
+            return db.execute_query(sql, params)
@@ -7,7 +7,7 @@ import pandas as pd
 import logging
 import re
 import json
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from tqdm import tqdm
 
 logger = logging.getLogger(__name__)
@@ -87,17 +87,24 @@ class DataAggregator:
         if missing:
             raise ValueError(f"Missing required columns: {missing}")
 
-        # Group by rate code
-        grouped = df.groupby('Расценка | Код')
+        # Group by rate code: factorize the keys once (sorted, NaN dropped,
+        # same order as df.groupby) and bucket the rows as dict records, so
+        # no per-group DataFrame or Series is built
+        group_ids, rate_codes = pd.factorize(df['Расценка | Код'], sort=True)
+        groups = [[] for _ in range(len(rate_codes))]
+        for group_id, row in zip(group_ids.tolist(), df.to_dict('records')):
+            if group_id >= 0:
+                groups[group_id].append(row)
+
         rates_list = []
         mass_list = []
         services_list = []
         price_statistics_list = []
 
-        logger.info(f"Processing {len(grouped)} unique rates...")
+        logger.info(f"Processing {len(rate_codes)} unique rates...")
 
-        with tqdm(total=len(grouped), desc="Aggregating rates") as pbar:
-            for rate_code, group in grouped:
+        with tqdm(total=len(rate_codes), desc="Aggregating rates") as pbar:
+            for rate_code, group in zip(rate_codes, groups):
                 try:
                     rate_record = self._aggregate_single_rate(rate_code, group)
                     if rate_record:
@@ -110,7 +117,7 @@ class DataAggregator:
                         service_data = self._extract_service_data(rate_code, group)
                         services_list.extend(service_data)
                         # Extract price statistics for each resource in this rate
-                        for _, row in group.iterrows():
+                        for row in group:
                             if pd.notna(row.get('Ресурс | Код')):
                                 price_stats = self._extract_price_statistics(row)
                                 if price_stats:
@@ -186,7 +193,7 @@ class DataAggregator:
         logger.info(f"Processing {len(resources_df)} resource rows...")
 
         with tqdm(total=len(resources_df), desc="Aggregating resources") as pbar:
-            for _, row in resources_df.iterrows():
+            for row in resources_df.to_dict('records'):
                 try:
                     resource_record = self._extract_resource_record(row)
                     if resource_record:
@@ -203,19 +210,19 @@ class DataAggregator:
 
         return self.resources_df
 
-    def _aggregate_single_rate(self, rate_code: str, group: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    def _aggregate_single_rate(self, rate_code: str, group: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
         Aggregate a single rate from its group of rows.
 
         Args:
             rate_code: Rate code identifier
-            group: DataFrame with all rows for this rate
+            group: All rows for this rate, as DataFrame records in sheet order
 
         Returns:
             Dict with aggregated rate data or None if aggregation fails
         """
         # Get first row for base fields
-        first_row = group.iloc[0]
+        first_row = group[0]
 
         # ========================================================================
         # TASK 9.2 FIX #4: Extract correct rate_short_name from Excel column 16
@@ -355,7 +362,7 @@ class DataAggregator:
         }
 
         for field_name, col_name in optional_fields.items():
-            if col_name in first_row.index:
+            if col_name in first_row:
                 value = first_row.get(col_name)
                 if pd.notna(value):
                     rate_record[field_name] = value
@@ -372,12 +379,12 @@ class DataAggregator:
 
         return rate_record
 
-    def _extract_composition(self, group: pd.DataFrame) -> List[Dict[str, str]]:
+    def _extract_composition(self, group: List[Dict[str, Any]]) -> List[Dict[str, str]]:
         """
         Extract composition rows from rate group.
 
         Args:
-            group: DataFrame with all rows for a rate
+            group: All rows for a rate, as DataFrame records
 
         Returns:
             List of composition dictionaries
@@ -385,9 +392,9 @@ class DataAggregator:
         composition = []
 
         # Filter composition rows
-        comp_rows = group[group['Тип строки'].isin(self.COMPOSITION_ROW_TYPES)]
+        comp_rows = [row for row in group if row.get('Тип строки') in self.COMPOSITION_ROW_TYPES]
 
-        for _, row in comp_rows.iterrows():
+        for row in comp_rows:
             comp_item = {}
 
             # Extract composition text
@@ -451,12 +458,12 @@ class DataAggregator:
         valid_texts = [str(t).strip() for t in texts if t and pd.notna(t) and str(t).strip()]
         return ' '.join(valid_texts)
 
-    def _extract_resource_record(self, row: pd.Series) -> Optional[Dict[str, Any]]:
+    def _extract_resource_record(self, row: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Extract resource record from a single row.
 
         Args:
-            row: Source row from DataFrame
+            row: Source row (column name -> value), e.g. a DataFrame record
 
         Returns:
             Dict with resource data or None if extraction fails
@@ -498,7 +505,7 @@ class DataAggregator:
         }
 
         for field_name, col_name in numeric_fields.items():
-            if col_name in row.index:
+            if col_name in row:
                 value = row.get(col_name)
                 if pd.notna(value):
                     try:
@@ -515,7 +522,7 @@ class DataAggregator:
         }
 
         for field_name, col_name in text_fields.items():
-            if col_name in row.index:
+            if col_name in row:
                 value = self._safe_str(row.get(col_name))
                 if value:
                     resource_record[field_name] = value
@@ -527,7 +534,7 @@ class DataAggregator:
         }
 
         for field_name, col_name in electricity_fields.items():
-            if col_name in row.index:
+            if col_name in row:
                 value = row.get(col_name)
                 if pd.notna(value):
                     try:
@@ -583,7 +590,7 @@ class DataAggregator:
 
         return resource_record
 
-    def _extract_price_statistics(self, row: pd.Series) -> Optional[Dict[str, Any]]:
+    def _extract_price_statistics(self, row: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Extract price statistics from a resource row.
 
@@ -593,7 +600,7 @@ class DataAggregator:
         - Material and position costs
 
         Args:
-            row: Source row from DataFrame
+            row: Source row (column name -> value), e.g. a DataFrame record
 
         Returns:
             Dict with price statistics or None if extraction fails
@@ -672,19 +679,19 @@ class DataAggregator:
 
         return price_stats
 
-    def _extract_resource_mass_data(self, group: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _extract_resource_mass_data(self, group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Extract mass data from resource rows (Excel columns 64-66).
 
         Args:
-            group: DataFrame with all rows for a rate
+            group: All rows for a rate, as DataFrame records
 
         Returns:
             List of mass records with resource_code, mass_name, mass_value, mass_unit
         """
         mass_records = []
 
-        for _, row in group.iterrows():
+        for row in group:
             resource_code = self._safe_str(row.get('Ресурс | Код'))
 
             # Skip rows without resource code
@@ -707,20 +714,20 @@ class DataAggregator:
 
         return mass_records
 
-    def _extract_service_data(self, rate_code: str, group: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _extract_service_data(self, rate_code: str, group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Extract service data from rate rows (Excel columns 67-72).
 
         Args:
             rate_code: Rate code identifier
-            group: DataFrame with all rows for this rate
+            group: All rows for this rate, as DataFrame records
 
         Returns:
             List of service records with rate_code and service fields
         """
         service_records = []
 
-        for _, row in group.iterrows():
+        for row in group:
             # Extract service fields (columns 67-72)
             service_category = self._safe_str(row.get('Услуга.Категория'))
             service_type = self._safe_str(row.get('Услуга.Вид'))
@@ -6,7 +6,7 @@ data into SQLite database with transactional integrity, batch processing, and co
 error handling.
 
 Key Features:
-- Batch insertion with configurable batch size (default: 1000 records)
+- Batch insertion with configurable batch size (default: 10000 records)
 - Full transactionality with automatic rollback on errors
 - Progress tracking with tqdm
 - Post-load validation with record counts
@@ -19,7 +19,9 @@ import logging
 import sqlite3
 import time
 import json
-from typing import List, Tuple, Any, Optional, Dict
+import re
+from itertools import islice
+from typing import List, Tuple, Any, Optional, Dict, Iterable, Iterator
 import pandas as pd
 from tqdm import tqdm
 
@@ -29,6 +31,9 @@ from src.database.db_manager import DatabaseManager
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Placeholder group of a single-row INSERT, e.g. "(?, ?, ?)" in "VALUES (?, ?, ?)"
+_VALUES_GROUP = re.compile(r"VALUES\s*(\([?,\s]*\))")
+
 
 class DatabasePopulatorError(Exception):
     """Base exception for DatabasePopulator errors."""
@@ -58,7 +63,7 @@ class DatabasePopulator:
     into the database with proper schema mapping, constraint handling, and validation.
 
     Features:
-    - Batch processing for optimal performance (1000 records/batch)
+    - Batch processing for optimal performance (10000 records/batch)
     - Transactional integrity (all-or-nothing)
     - Progress tracking with percentage completion
     - Automatic NaN to NULL conversion
@@ -106,7 +111,7 @@ class DatabasePopulator:
 
     Attributes:
         db_manager (DatabaseManager): Database connection manager
-        batch_size (int): Number of records per batch insert (default: 1000)
+        batch_size (int): Number of records per batch insert (default: 10000)
 
     Example:
         >>> with DatabaseManager('data/estimates.db') as db:
@@ -118,7 +123,12 @@ class DatabasePopulator:
         ...     stats = populator.get_statistics()
     """
 
-    DEFAULT_BATCH_SIZE = 1000
+    # Large executemany() batches amortise per-call overhead in sqlite3
+    DEFAULT_BATCH_SIZE = 10000
+
+    # Rows per multi-row INSERT ... VALUES (...), (...) statement; capped by
+    # the connection's host parameter limit in _compound_insert()
+    COMPOUND_ROWS_PER_STMT = 500
 
     # SQL statements
     INSERT_RATE_SQL = """
@@ -227,7 +237,7 @@ class DatabasePopulator:
 
         Args:
             db_manager: DatabaseManager instance with active connection
-            batch_size: Number of records to insert per batch (default: 1000)
+            batch_size: Number of records to insert per batch (default: 10000)
 
         Raises:
             ValueError: If db_manager is not connected or batch_size is invalid
@@ -305,13 +315,14 @@ class DatabasePopulator:
             )
 
         # Map DataFrame to database schema
-        data_list = self._map_rates_to_schema(rates_df)
+        rows = self._map_rates_to_schema(rates_df)
 
         # Insert in batches with transaction
         inserted_count = self._batch_insert(
             sql=self.INSERT_RATE_SQL,
-            data_list=data_list,
-            entity_name="rates"
+            rows=rows,
+            entity_name="rates",
+            total_records=len(rates_df)
         )
 
         # Post-load validation
@@ -392,13 +403,14 @@ class DatabasePopulator:
         self._validate_rate_code_references(resources_df)
 
         # Map DataFrame to database schema
-        data_list = self._map_resources_to_schema(resources_df)
+        rows = self._map_resources_to_schema(resources_df)
 
         # Insert in batches with transaction
         inserted_count = self._batch_insert(
             sql=self.INSERT_RESOURCE_SQL,
-            data_list=data_list,
-            entity_name="resources"
+            rows=rows,
+            entity_name="resources",
+            total_records=len(resources_df)
         )
 
         # Post-load validation
@@ -469,13 +481,14 @@ class DatabasePopulator:
         logger.info(f"Starting price statistics population: {len(price_statistics_df)} records")
 
         # Map DataFrame to database schema
-        data_list = self._map_price_statistics_to_schema(price_statistics_df)
+        rows = self._map_price_statistics_to_schema(price_statistics_df)
 
         # Insert in batches with transaction
         inserted_count = self._batch_insert(
             sql=self.INSERT_PRICE_STATISTICS_SQL,
-            data_list=data_list,
-            entity_name="price_statistics"
+            rows=rows,
+            entity_name="price_statistics",
+            total_records=len(price_statistics_df)
         )
 
         # Post-load validation
@@ -659,7 +672,7 @@ class DatabasePopulator:
     # Private Helper Methods
     # ========================================================================
 
-    def _map_rates_to_schema(self, rates_df: pd.DataFrame) -> List[Tuple[Any, ...]]:
+    def _map_rates_to_schema(self, rates_df: pd.DataFrame) -> Iterator[Tuple[Any, ...]]:
         """
         Map rates DataFrame to database schema tuple format.
 
@@ -675,12 +688,11 @@ class DatabasePopulator:
         Args:
             rates_df: Source DataFrame from DataAggregator
 
-        Returns:
-            List of tuples ready for executemany()
+        Yields:
+            Tuples ready for executemany(), one per DataFrame row
         """
-        data_list = []
-
-        for _, row in rates_df.iterrows():
+        # Plain dicts are much cheaper to build and index than iterrows() Series
+        for row in self._iter_records(rates_df):
             # Extract base fields
             rate_code = self._safe_value(row.get('rate_code'))
             rate_full_name = self._safe_value(row.get('rate_full_name'))
@@ -764,11 +776,9 @@ class DatabasePopulator:
                 overhead_rate,                                              # 25. overhead_rate (PHASE 1)
                 profit_margin                                               # 26. profit_margin (PHASE 1)
             )
-            data_list.append(rate_tuple)
-
-        return data_list
+            yield rate_tuple
 
-    def _map_resources_to_schema(self, resources_df: pd.DataFrame) -> List[Tuple[Any, ...]]:
+    def _map_resources_to_schema(self, resources_df: pd.DataFrame) -> Iterator[Tuple[Any, ...]]:
         """
         Map resources DataFrame to database schema tuple format.
 
@@ -783,12 +793,10 @@ class DatabasePopulator:
         Args:
             resources_df: Source DataFrame from DataAggregator
 
-        Returns:
-            List of tuples ready for executemany()
+        Yields:
+            Tuples ready for executemany(), one per DataFrame row
         """
-        data_list = []
-
-        for _, row in resources_df.iterrows():
+        for row in self._iter_records(resources_df):
             # Calculate total_cost if not provided (quantity * unit_cost)
             quantity = self._safe_numeric(row.get('resource_quantity'), default=0.0)
             unit_cost = self._safe_numeric(row.get('resource_cost'), default=0.0)
@@ -848,11 +856,12 @@ class DatabasePopulator:
                 electricity_consumption,                              # electricity_consumption (TASK 9.3 P2)
                 electricity_cost                                      # electricity_cost (TASK 9.3 P2)
             )
-            data_list.append(resource_tuple)
-
-        return data_list
+            yield resource_tuple
 
-    def _map_price_statistics_to_schema(self, price_statistics_df: pd.DataFrame) -> List[Tuple[Any, ...]]:
+    def _map_price_statistics_to_schema(
+        self,
+        price_statistics_df: pd.DataFrame
+    ) -> Iterator[Tuple[Any, ...]]:
         """
         Map price statistics DataFrame to database schema tuple format.
 
@@ -864,12 +873,10 @@ class DatabasePopulator:
         Args:
             price_statistics_df: Source DataFrame from DataAggregator
 
-        Returns:
-            List of tuples ready for executemany()
+        Yields:
+            Tuples ready for executemany(), one per DataFrame row
         """
-        data_list = []
-
-        for _, row in price_statistics_df.iterrows():
+        for row in self._iter_records(price_statistics_df):
             # Extract required fields
             resource_code = self._safe_value(row.get('resource_code'))
             rate_code = self._safe_value(row.get('rate_code'))
@@ -901,23 +908,120 @@ class DatabasePopulator:
                 total_material_cost,            # total_material_cost
                 total_position_cost             # total_position_cost
             )
-            data_list.append(price_stats_tuple)
+            yield price_stats_tuple
+
+    def _iter_records(self, df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+        """
+        Yield DataFrame rows as plain dicts, converting batch_size rows at a time.
+
+        Only one slice of records is alive at once, instead of a dict for
+        every row of the table.
+
+        Args:
+            df: Source DataFrame from DataAggregator
+
+        Yields:
+            One dict per row, keyed by column name
+        """
+        for start in range(0, len(df), self.batch_size):
+            yield from df.iloc[start:start + self.batch_size].to_dict('records')
+
+    def _prepare_batches(
+        self,
+        df: pd.DataFrame,
+        columns: List[str]
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Split DataFrame columns into executemany() batches of batch_size rows.
 
-        return data_list
+        Missing columns are filled with None; NaN and blank strings become NULL.
+
+        Args:
+            df: Source DataFrame from DataAggregator
+            columns: Column names in INSERT placeholder order
+
+        Yields:
+            Lists of up to batch_size tuples
+        """
+        # Column-wise tolist() unboxes numpy values in C; zip() then builds
+        # the row tuples, which is cheaper than itertuples()
+        frame = df.reindex(columns=columns)
+        rows = (
+            tuple(self._safe_value(value) for value in row)
+            for row in zip(*(frame[column].tolist() for column in columns))
+        )
+
+        while batch := list(islice(rows, self.batch_size)):
+            yield batch
+
+    def _compound_insert(self, sql: str, batch: List[Tuple[Any, ...]]) -> int:
+        """
+        Insert a batch using multi-row VALUES statements.
+
+        Rewrites the single-row ``VALUES (?, ...)`` of sql to repeat the
+        placeholder group, so SQLite runs one statement per
+        COMPOUND_ROWS_PER_STMT rows instead of one per row. Rows left over
+        are inserted with the original statement. Both parts run in one
+        transaction (joining the caller's, if any), so the batch stays atomic.
+
+        Args:
+            sql: Single-row INSERT SQL statement with placeholders
+            batch: List of tuples with data
+
+        Returns:
+            Number of rows affected
+        """
+        match = _VALUES_GROUP.search(sql)
+        width = match.group(1).count("?")
+
+        connection = self.db_manager.connection
+        max_variables = (
+            connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+            if hasattr(connection, "getlimit") else 999
+        )
+        rows_per_stmt = max(1, min(self.COMPOUND_ROWS_PER_STMT, max_variables // width))
+
+        compound_rows = len(batch) - len(batch) % rows_per_stmt
+        rows_affected = 0
+
+        with self.db_manager.transaction():
+            if compound_rows and rows_per_stmt > 1:
+                compound_sql = (
+                    sql[:match.start(1)]
+                    + ", ".join([match.group(1)] * rows_per_stmt)
+                    + sql[match.end(1):]
+                )
+                params = [
+                    tuple(value for row in batch[i:i + rows_per_stmt] for value in row)
+                    for i in range(0, compound_rows, rows_per_stmt)
+                ]
+                rows_affected += self.db_manager.execute_many(compound_sql, params)
+            else:
+                compound_rows = 0
+
+            if compound_rows < len(batch):
+                rows_affected += self.db_manager.execute_many(sql, batch[compound_rows:])
+
+        return rows_affected
 
     def _batch_insert(
         self,
         sql: str,
-        data_list: List[Tuple[Any, ...]],
-        entity_name: str
+        rows: Iterable[Tuple[Any, ...]],
+        entity_name: str,
+        total_records: int
     ) -> int:
         """
         Perform batch insert with progress tracking and error handling.
 
+        rows is consumed lazily, so at most batch_size tuples are held at
+        once when it is a generator such as _map_rates_to_schema().
+
         Args:
             sql: INSERT SQL statement with placeholders
-            data_list: List of tuples with data
+            rows: Tuples with data, e.g. a mapper generator
             entity_name: Name for logging (e.g., "rates", "resources")
+            total_records: Number of tuples in rows (for progress reporting)
 
         Returns:
             Total number of records inserted
@@ -927,7 +1031,7 @@ class DatabasePopulator:
             sqlite3.IntegrityError: If constraint violated
             DuplicateRateCodeError: If UNIQUE constraint violated on rate_code
         """
-        total_records = len(data_list)
+        rows = iter(rows)
         inserted_count = 0
 
         # Process in batches
@@ -940,13 +1044,12 @@ class DatabasePopulator:
 
         try:
             with tqdm(total=total_records, desc=f"Loading {entity_name}", unit="records") as pbar:
-                for i in range(0, total_records, self.batch_size):
-                    batch = data_list[i:i + self.batch_size]
-                    batch_num = i // self.batch_size + 1
+                batch_num = 0
+                while batch := list(islice(rows, self.batch_size)):
+                    batch_num += 1
 
                     try:
-                        # Use DatabaseManager's execute_many for transactional insert
-                        rows_affected = self.db_manager.execute_many(sql, batch)
+                        rows_affected = self._compound_insert(sql, batch)
                         inserted_count += rows_affected
 
                         pbar.update(len(batch))
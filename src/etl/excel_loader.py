@@ -1,7 +1,8 @@
 """
 Excel Loader for Construction Rates Data
 Reads and validates Excel files with construction rate schedules.
-Optimized for large files (100MB+) using chunked reading.
+Optimized for large files (100MB+): uses the native calamine reader when
+python-calamine is installed, otherwise falls back to openpyxl.
 """
 
 import pandas as pd
@@ -13,6 +14,12 @@ from typing import Dict, Any, Optional
 from tqdm import tqdm
 from openpyxl import load_workbook
 
+try:
+    import python_calamine  # noqa: F401  (pandas engine="calamine")
+    _HAS_CALAMINE = True
+except ImportError:
+    _HAS_CALAMINE = False
+
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +47,12 @@ class ExcelLoader:
     # Columns that cannot have NaN values
     CRITICAL_COLUMNS = ["Расценка | Код", "Тип строки"]
 
+    # Repeated strings stored as category to save memory
+    CATEGORY_DTYPES = {
+        "Тип строки": "category",
+        "Расценка | Ед. изм.": "category",
+    }
+
     def __init__(self, file_path: str, chunk_size: int = 10000):
         """
         Initialize with file path and optional chunk size.
@@ -109,7 +122,10 @@ class ExcelLoader:
         """
         Load Excel file with chunked reading and real progress tracking.
 
-        Strategy for large files (>50MB):
+        With python-calamine installed, files of any size are read directly
+        by the native calamine engine (no intermediate CSV).
+
+        Otherwise, strategy for large files (>50MB):
         1. Convert XLSX → CSV (faster I/O, real progress)
         2. Load CSV in chunks with tqdm
         3. Concatenate chunks into final DataFrame
@@ -128,8 +144,16 @@ class ExcelLoader:
         logger.info(f"Loading Excel file: {self.file_path} ({file_size_mb:.1f} MB)")
 
         try:
+            if _HAS_CALAMINE:
+                # Native reader is faster than the CSV round-trip at any size
+                logger.info("Using calamine engine")
+                with tqdm(total=1, desc="Loading Excel") as pbar:
+                    self.df = pd.read_excel(
+                        self.file_path, engine="calamine", dtype=self.CATEGORY_DTYPES
+                    )
+                    pbar.update(1)
             # For large files (>50MB), use optimized chunked reading
-            if file_size_mb > 50:
+            elif file_size_mb > 50:
                 logger.info("Large file detected - using optimized chunked loading")
                 self.df = self._load_large_file()
             else:
@@ -172,13 +196,11 @@ class ExcelLoader:
         logger.info(f"Loading CSV with optimized dtypes...")
 
         # Use category dtype for repeated strings to save memory
-        dtype_dict = {
-            "Тип строки": "category",
-            "Расценка | Ед. изм.": "category",
-        }
-
         df = pd.read_csv(
-            self._temp_csv_path, encoding="utf-8", dtype=dtype_dict, low_memory=False
+            self._temp_csv_path,
+            encoding="utf-8",
+            dtype=self.CATEGORY_DTYPES,
+            low_memory=False,
         )
 
         logger.info(f"Successfully loaded {len(df):,} rows")
@@ -7,6 +7,7 @@ rates with detailed resource breakdown and proportional quantity adjustments.
 
 import sqlite3
 import logging
+from decimal import ROUND_HALF_UP, Decimal
 from typing import Dict, List, Any, Optional
 
 from src.database.db_manager import DatabaseManager
@@ -16,6 +17,69 @@ from src.database.db_manager import DatabaseManager
 logger = logging.getLogger(__name__)
 
 
+KOPECK = Decimal("0.01")
+
+
+def to_kopecks(value: float) -> int:
+    """
+    Convert a ruble amount to integer kopecks, rounding half away from zero.
+
+    Rounds the shortest decimal repr of the float, so amounts stored just
+    below a half kopeck (1.005 is 1.00499999...) still round up.
+
+    Args:
+        value: Amount in rubles
+
+    Returns:
+        Amount in kopecks (e.g., 1234.565 -> 123457)
+    """
+    kopecks = Decimal(repr(float(value))).quantize(KOPECK, rounding=ROUND_HALF_UP)
+    return int(kopecks * 100)
+
+
+def format_rub(kopecks: int) -> str:
+    """
+    Format integer kopecks as a ruble string with two decimals.
+
+    Args:
+        kopecks: Amount in kopecks
+
+    Returns:
+        Ruble string (e.g., 123457 -> "1234.57")
+    """
+    sign = "-" if kopecks < 0 else ""
+    kopecks = abs(kopecks)
+    return f"{sign}{kopecks // 100}.{kopecks % 100:02d}"
+
+
+def cost_summary(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the cost fields of a calculation response.
+
+    Shared by the HTTP (quick_calculate, show_rate_details) and UCall
+    servers so their responses keep the same shape.
+
+    Args:
+        result: Result of CostCalculator.calculate() or get_detailed_breakdown()
+
+    Returns:
+        Response dict with ruble amounts, kopeck amounts and a formatted total
+    """
+    return {
+        "success": True,
+        "rate_info": result["rate_info"],
+        "total_cost": result["calculated_total"],
+        "cost_per_unit": result["cost_per_unit"],
+        "materials": result["materials"],
+        "resources": result["resources"],
+        "total_cost_kopecks": result["calculated_total_kopecks"],
+        "total_cost_rub": format_rub(result["calculated_total_kopecks"]),
+        "cost_per_unit_kopecks": result["cost_per_unit_kopecks"],
+        "materials_kopecks": result["materials_kopecks"],
+        "resources_kopecks": result["resources_kopecks"],
+    }
+
+
 class CostCalculator:
     """
     Calculator for construction rate costs with detailed resource breakdowns.
@@ -43,7 +107,7 @@ class CostCalculator:
             db_manager: DatabaseManager instance for database operations
         """
         self.db_manager = db_manager
-        logger.info("CostCalculator initialized")
+        logger.debug("CostCalculator initialized")
 
     def calculate(self, rate_code: str, quantity: float) -> Dict[str, Any]:
         """
@@ -66,6 +130,9 @@ class CostCalculator:
                 - materials: Materials cost for the specified quantity
                 - resources: Resources (labor/machinery) cost for the specified quantity
                 - quantity: The quantity used in calculation
+                - base_cost_kopecks, cost_per_unit_kopecks,
+                  calculated_total_kopecks, materials_kopecks,
+                  resources_kopecks: The same amounts as integer kopecks
 
         Raises:
             ValueError: If rate_code is empty, quantity <= 0, or rate not found
@@ -139,6 +206,13 @@ class CostCalculator:
             adjusted_materials = material_cost * multiplier
             adjusted_resources = resources_cost * multiplier
 
+            # Round once to integer kopecks; ruble floats are derived from them
+            base_cost_kopecks = to_kopecks(total_cost)
+            cost_per_unit_kopecks = to_kopecks(cost_per_unit)
+            calculated_total_kopecks = to_kopecks(calculated_total)
+            materials_kopecks = to_kopecks(adjusted_materials)
+            resources_kopecks = to_kopecks(adjusted_resources)
+
             # Build result dictionary
             result = {
                 "rate_info": {
@@ -146,12 +220,17 @@ class CostCalculator:
                     "rate_full_name": full_name,
                     "unit_type": unit_type,
                 },
-                "base_cost": round(total_cost, 2),
-                "cost_per_unit": round(cost_per_unit, 2),
-                "calculated_total": round(calculated_total, 2),
-                "materials": round(adjusted_materials, 2),
-                "resources": round(adjusted_resources, 2),
+                "base_cost": base_cost_kopecks / 100,
+                "cost_per_unit": cost_per_unit_kopecks / 100,
+                "calculated_total": calculated_total_kopecks / 100,
+                "materials": materials_kopecks / 100,
+                "resources": resources_kopecks / 100,
                 "quantity": quantity,
+                "base_cost_kopecks": base_cost_kopecks,
+                "cost_per_unit_kopecks": cost_per_unit_kopecks,
+                "calculated_total_kopecks": calculated_total_kopecks,
+                "materials_kopecks": materials_kopecks,
+                "resources_kopecks": resources_kopecks,
             }
 
             logger.info(
@@ -0,0 +1,149 @@
+"""
+Persistent Query Embedding Cache
+
+Stores query embeddings in a local SQLite database so they survive server
+restarts and are shared by every worker process. A lookup is one indexed
+SELECT instead of an embeddings API call.
+
+Storage: separate SQLite file in WAL mode, keyed by SHA-256(model + query).
+"""
+
+import hashlib
+import logging
+import sqlite3
+import time
+from typing import Optional
+
+from src.database.db_manager import DatabaseManager
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+EMBEDDING_CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS query_embed_cache (
+        hash BLOB PRIMARY KEY,
+        model TEXT NOT NULL,
+        dim INTEGER NOT NULL,
+        vec BLOB NOT NULL,
+        created_at INTEGER NOT NULL
+    )
+"""
+
+
+class EmbeddingCache:
+    """
+    Durable cache of query embeddings.
+
+    Embeddings are stored as raw float32 bytes, keyed by the SHA-256 of the
+    model name and the query text, so switching models never returns a
+    stale vector. Entries older than ttl seconds are ignored and pruned on
+    open. Cache errors are logged and treated as misses so they never fail
+    a search.
+
+    Attributes:
+        db_path (str): Path to the cache database file
+        ttl (float): Entry lifetime in seconds
+
+    Example:
+        >>> cache = EmbeddingCache('data/cache/embedding_cache.db')
+        >>> cache.open()
+        >>> blob = cache.get("text-embedding-3-small", "монтаж перегородок")
+    """
+
+    def __init__(self, db_path: str, ttl: float = 30 * 86400.0):
+        """
+        Initialize EmbeddingCache.
+
+        Args:
+            db_path: Path to the cache database file (created if missing)
+            ttl: Entry lifetime in seconds (default: 30 days)
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.db_manager: Optional[DatabaseManager] = None
+
+    def open(self) -> None:
+        """Connect to the cache database, create the table and prune old entries."""
+        if self.db_manager:
+            return
+
+        self.db_manager = DatabaseManager(self.db_path)
+        self.db_manager.connect()
+        self.db_manager.execute_update(EMBEDDING_CACHE_SCHEMA)
+
+        pruned = self.db_manager.execute_update(
+            "DELETE FROM query_embed_cache WHERE created_at < ?", (self._min_ts(),)
+        )
+        logger.info(
+            f"EmbeddingCache opened: {self.db_path} ({pruned} expired entries pruned)"
+        )
+
+    def close(self) -> None:
+        """Close the cache database connection."""
+        if self.db_manager:
+            self.db_manager.disconnect()
+            self.db_manager = None
+
+    @staticmethod
+    def _key(model: str, query: str) -> bytes:
+        """SHA-256 digest of model name and query text."""
+        return hashlib.sha256(f"{model}\0{query}".encode("utf-8")).digest()
+
+    def _min_ts(self) -> int:
+        """Oldest timestamp that is still valid."""
+        return int(time.time() - self.ttl)
+
+    def get(self, model: str, query: str) -> Optional[bytes]:
+        """
+        Look up the embedding stored for a query.
+
+        Args:
+            model: Embedding model name
+            query: Normalized query text
+
+        Returns:
+            float32 embedding bytes or None on miss
+        """
+        if not self.db_manager:
+            return None
+
+        try:
+            rows = self.db_manager.execute_query(
+                "SELECT vec FROM query_embed_cache WHERE hash = ? AND created_at >= ?",
+                (self._key(model, query), self._min_ts()),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"EmbeddingCache lookup failed: {e}")
+            return None
+
+        if not rows:
+            return None
+
+        logger.debug(f"EmbeddingCache hit: '{query}'")
+        return rows[0][0]
+
+    def put(self, model: str, query: str, vec: bytes) -> None:
+        """
+        Store the embedding for a query.
+
+        Args:
+            model: Embedding model name
+            query: Normalized query text
+            vec: float32 embedding bytes
+        """
+        if not self.db_manager:
+            return
+
+        try:
+            self.db_manager.execute_update(
+                """
+                INSERT OR REPLACE INTO query_embed_cache
+                    (hash, model, dim, vec, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (self._key(model, query), model, len(vec) // 4, vec, int(time.time())),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"EmbeddingCache store failed: {e}")
@@ -7,7 +7,8 @@ and finding alternatives using full-text search capabilities.
 
 import logging
 import pandas as pd
-from typing import List, Optional
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 from src.database.db_manager import DatabaseManager
@@ -18,6 +19,19 @@ from src.database.fts_config import prepare_fts_query
 logger = logging.getLogger(__name__)
 
 
+# Columns of compare()/find_alternatives() results, in order
+COMPARISON_COLUMNS = [
+    "rate_code",
+    "rate_full_name",
+    "unit_type",
+    "cost_per_unit",
+    "total_for_quantity",
+    "materials_for_quantity",
+    "difference_from_cheapest",
+    "difference_percent",
+]
+
+
 class RateComparator:
     """
     Compare construction rates and find alternatives using FTS5 search.
@@ -29,6 +43,8 @@ class RateComparator:
 
     Attributes:
         db_path (str): Path to the SQLite database file
+        db_manager: Shared connection (e.g., SqlitePool) or None to open a
+            new connection per call
 
     Example:
         >>> comparator = RateComparator('data/processed/estimates.db')
@@ -36,16 +52,33 @@ class RateComparator:
         >>> alternatives = comparator.find_alternatives('10-05-001-01', max_results=5)
     """
 
-    def __init__(self, db_path: str = "data/processed/estimates.db"):
+    def __init__(self, db_path: str = "data/processed/estimates.db", db_manager=None):
         """
         Initialize RateComparator with database path.
 
         Args:
             db_path: Path to the SQLite database file (default: data/processed/estimates.db)
+            db_manager: Optional shared DatabaseManager or SqlitePool used for
+                queries instead of opening a new connection per call
         """
         self.db_path = db_path
+        self.db_manager = db_manager
         logger.info(f"RateComparator initialized with database: {db_path}")
 
+    def _db(self):
+        """
+        Context manager yielding the connection for one method call.
+
+        A shared SqlitePool is checked out once, so the source lookup and the
+        FTS query of find_alternatives_records() run on the same connection
+        instead of going through the pool twice.
+        """
+        if self.db_manager is None:
+            return DatabaseManager(self.db_path)
+        if hasattr(self.db_manager, "acquire"):
+            return self.db_manager.acquire()
+        return nullcontext(self.db_manager)
+
     def compare(self, rate_codes: List[str], quantity: float) -> pd.DataFrame:
         """
         Compare multiple rates by calculating costs for a specific quantity.
@@ -76,6 +109,37 @@ class RateComparator:
             >>> df = comparator.compare(['10-05-001-01', '10-06-037-02'], quantity=50)
             >>> print(df[['rate_code', 'total_for_quantity', 'difference_percent']])
         """
+        return pd.DataFrame(
+            self.compare_records(rate_codes, quantity), columns=COMPARISON_COLUMNS
+        )
+
+    def compare_records(
+        self, rate_codes: List[str], quantity: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare multiple rates and return the rows as dicts.
+
+        Same rows as compare() without building a DataFrame, for callers that
+        serialize the result straight to JSON.
+
+        Args:
+            rate_codes: List of rate codes to compare
+            quantity: Quantity to calculate costs for (must be > 0)
+
+        Returns:
+            List of dicts with the compare() columns, sorted by
+            total_for_quantity (ascending)
+
+        Raises:
+            ValueError: If quantity <= 0 or rate_codes is empty
+            ValueError: If any rate_code does not exist in database
+            sqlite3.Error: If database query fails
+
+        Example:
+            >>> rows = comparator.compare_records(['10-05-001-01', '10-06-037-02'], 50)
+            >>> rows[0]['difference_percent']
+            0.0
+        """
         # Validate inputs
         if not rate_codes:
             raise ValueError("rate_codes list cannot be empty")
@@ -101,7 +165,7 @@ class RateComparator:
         """
 
         # Execute query
-        with DatabaseManager(self.db_path) as db:
+        with self._db() as db:
             results = db.execute_query(sql, tuple(rate_codes))
 
         # Validate that all rate_codes exist
@@ -114,7 +178,7 @@ class RateComparator:
 
         logger.debug(f"Retrieved {len(results)} rates from database")
 
-        # Build DataFrame with calculations
+        # Build rows with calculations
         data = []
         for row in results:
             (
@@ -147,31 +211,37 @@ class RateComparator:
                 }
             )
 
-        # Create DataFrame
-        df = pd.DataFrame(data)
+        data = self._with_differences(data)
+
+        logger.info(f"Comparison completed: {len(data)} rates analyzed")
 
-        # Sort by total cost
-        df = df.sort_values("total_for_quantity", ascending=True).reset_index(drop=True)
+        return data
+
+    def compare_rates(self, rate_codes: List[str], quantity: float) -> Dict[str, Any]:
+        """
+        Compare rates and return JSON-ready records.
 
-        # Calculate difference from cheapest
-        if len(df) > 0:
-            min_cost = df["total_for_quantity"].min()
+        All rates are fetched in a single IN (...) query, so an N-way
+        comparison costs one database round trip rather than N.
 
-            df["difference_from_cheapest"] = (
-                df["total_for_quantity"] - min_cost
-            ).round(2)
+        Args:
+            rate_codes: List of rate codes to compare
+            quantity: Quantity to calculate costs for (must be > 0)
 
-            # Calculate percentage difference (avoid division by zero)
-            if min_cost > 0:
-                df["difference_percent"] = (
-                    (df["total_for_quantity"] - min_cost) / min_cost * 100
-                ).round(2)
-            else:
-                df["difference_percent"] = 0.0
+        Returns:
+            Dict with key 'comparison': list of compare() rows as dicts,
+            cheapest first
 
-        logger.info(f"Comparison completed: {len(df)} rates analyzed")
+        Raises:
+            ValueError: If inputs are invalid or any rate_code does not exist
+            sqlite3.Error: If database query fails
 
-        return df
+        Example:
+            >>> result = comparator.compare_rates(['10-05-001-01', '10-06-037-02'], 50)
+            >>> result['comparison'][0]['rate_code']
+            '10-06-037-02'
+        """
+        return {"comparison": self.compare_records(rate_codes, quantity)}
 
     def find_alternatives(self, rate_code: str, max_results: int = 5) -> pd.DataFrame:
         """
@@ -198,6 +268,38 @@ class RateComparator:
             >>> df = comparator.find_alternatives('10-05-001-01', max_results=5)
             >>> print(df[['rate_code', 'rate_full_name', 'difference_percent']])
         """
+        return pd.DataFrame(
+            self.find_alternatives_records(rate_code, max_results),
+            columns=COMPARISON_COLUMNS,
+        )
+
+    def find_alternatives_records(
+        self, rate_code: str, max_results: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Find similar rates and return the rows as dicts.
+
+        Same rows as find_alternatives() without building a DataFrame, for
+        callers that serialize the result straight to JSON.
+
+        Args:
+            rate_code: Source rate code to find alternatives for
+            max_results: Maximum number of alternative rates to return (default: 5)
+
+        Returns:
+            List of dicts with the compare() columns, source rate included,
+            sorted by total_for_quantity (ascending); empty if no
+            alternatives were found
+
+        Raises:
+            ValueError: If rate_code does not exist in database
+            ValueError: If max_results <= 0
+            sqlite3.Error: If database query fails
+
+        Example:
+            >>> rows = comparator.find_alternatives_records('10-05-001-01', 5)
+            >>> [row['rate_code'] for row in rows]
+        """
         # Validate inputs
         if max_results <= 0:
             raise ValueError(f"max_results must be greater than 0, got: {max_results}")
@@ -206,7 +308,7 @@ class RateComparator:
             f"Finding alternatives for rate: {rate_code}, max_results: {max_results}"
         )
 
-        with DatabaseManager(self.db_path) as db:
+        with self._db() as db:
             # Get source rate and use rate_full_name for similarity search
             source_sql = """
                 SELECT
@@ -274,21 +376,9 @@ class RateComparator:
         # Handle empty results
         if not alternatives_results:
             logger.warning(f"No alternatives found for rate: {rate_code}")
-            # Return empty DataFrame with correct schema
-            return pd.DataFrame(
-                columns=[
-                    "rate_code",
-                    "rate_full_name",
-                    "unit_type",
-                    "cost_per_unit",
-                    "total_for_quantity",
-                    "materials_for_quantity",
-                    "difference_from_cheapest",
-                    "difference_percent",
-                ]
-            )
+            return []
 
-        # Build DataFrame with source rate unit_quantity for comparison
+        # Build rows with source rate unit_quantity for comparison
         # We'll use source rate's unit_quantity as the comparison quantity
         comparison_quantity = source_unit_quantity
 
@@ -324,7 +414,6 @@ class RateComparator:
                     "cost_per_unit": round(cost_per_unit, 2),
                     "total_for_quantity": round(total_for_quantity, 2),
                     "materials_for_quantity": round(materials_for_quantity, 2),
-                    "fts_rank": rank,
                 }
             )
 
@@ -348,35 +437,41 @@ class RateComparator:
                 "cost_per_unit": round(source_cost_per_unit, 2),
                 "total_for_quantity": round(source_total_for_quantity, 2),
                 "materials_for_quantity": round(source_materials_for_quantity, 2),
-                "fts_rank": 0,  # Source rate gets best rank for sorting
             },
         )
 
-        # Create DataFrame
-        df = pd.DataFrame(data)
-
-        # Sort by total cost
-        df = df.sort_values("total_for_quantity", ascending=True).reset_index(drop=True)
+        data = self._with_differences(data)
 
-        # Calculate difference from cheapest (which might be source or an alternative)
-        min_cost = df["total_for_quantity"].min()
+        logger.info(f"Found {len(data)} alternatives (including source rate)")
 
-        df["difference_from_cheapest"] = (df["total_for_quantity"] - min_cost).round(2)
+        return data
 
-        # Calculate percentage difference
-        if min_cost > 0:
-            df["difference_percent"] = (
-                (df["total_for_quantity"] - min_cost) / min_cost * 100
-            ).round(2)
-        else:
-            df["difference_percent"] = 0.0
+    @staticmethod
+    def _with_differences(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sort rows by total cost and add differences from the cheapest one.
 
-        # Drop fts_rank column (internal use only)
-        df = df.drop(columns=["fts_rank"])
+        Args:
+            data: Rows with a total_for_quantity key
 
-        logger.info(f"Found {len(df)} alternatives (including source rate)")
+        Returns:
+            New list sorted by total_for_quantity (ascending), each row with
+            difference_from_cheapest (rubles) and difference_percent added
+        """
+        data = sorted(data, key=lambda row: row["total_for_quantity"])
+        if not data:
+            return data
+
+        min_cost = data[0]["total_for_quantity"]
+        for row in data:
+            difference = row["total_for_quantity"] - min_cost
+            row["difference_from_cheapest"] = round(difference, 2)
+            # Avoid division by zero
+            row["difference_percent"] = (
+                round(difference / min_cost * 100, 2) if min_cost > 0 else 0.0
+            )
 
-        return df
+        return data
 
     def _extract_keywords(self, search_text: Optional[str]) -> str:
         """
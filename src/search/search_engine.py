@@ -7,7 +7,7 @@ functionality for construction rates using SQLite FTS5 and vector embeddings.
 
 import sqlite3
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 from src.database.db_manager import DatabaseManager
 from src.database.fts_config import prepare_fts_query
@@ -66,7 +66,7 @@ class SearchEngine:
                     f"Failed to initialize vector search: {e}. Using FTS5 only."
                 )
         else:
-            logger.info("SearchEngine initialized with FTS5 only")
+            logger.debug("SearchEngine initialized with FTS5 only")
 
     def search(
         self, query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 100
@@ -477,3 +477,80 @@ class SearchEngine:
             error_msg = f"Database error during code search: {str(e)}"
             logger.error(error_msg)
             raise sqlite3.Error(error_msg) from e
+
+    def resolve_identifier(self, identifier: str) -> Optional[Tuple[str, bool]]:
+        """
+        Resolve a rate code or a description to a single rate code.
+
+        Tries an exact rate_code match and the best FTS5 match in one query,
+        preferring the exact match, so callers do not need to guess up front
+        whether the identifier is a code or a description.
+
+        Args:
+            identifier: Rate code (e.g., "10-05-001-01") or Russian description
+                (e.g., "перегородки гипсокартон")
+
+        Returns:
+            Tuple (rate_code, search_used) where search_used is True if the code
+            came from full-text search, or None if nothing matched
+
+        Raises:
+            ValueError: If identifier is empty
+            sqlite3.Error: If database query fails
+
+        Examples:
+            >>> search_engine.resolve_identifier("10-05-001-01")
+            ('10-05-001-01', False)
+
+            >>> search_engine.resolve_identifier("перегородки гипсокартон")
+            ('10-05-001-01', True)
+        """
+        if not identifier or not identifier.strip():
+            logger.error("Empty identifier provided")
+            raise ValueError("Identifier cannot be empty")
+
+        identifier = identifier.strip()
+
+        sql = """
+            SELECT rate_code, 0 AS priority, 0.0 AS rank
+            FROM rates
+            WHERE rate_code = ?
+        """
+        params = [identifier]
+
+        # Identifiers with nothing left after normalization (e.g., "!!!") can
+        # only match exactly
+        try:
+            fts_query = prepare_fts_query(identifier)
+        except ValueError:
+            fts_query = None
+
+        if fts_query:
+            sql += """
+            UNION ALL
+            SELECT rate_code, 1 AS priority, rank
+            FROM rates_fts
+            WHERE rates_fts MATCH ?
+            """
+            params.append(fts_query)
+
+        sql += " ORDER BY priority, rank LIMIT 1"
+
+        try:
+            rows = self.db_manager.execute_query(sql, tuple(params))
+        except sqlite3.Error as e:
+            error_msg = f"Database error during identifier lookup: {str(e)}"
+            logger.error(error_msg)
+            raise sqlite3.Error(error_msg) from e
+
+        if not rows:
+            logger.info(f"No rates found for identifier: '{identifier}'")
+            return None
+
+        rate_code, priority, _ = rows[0]
+        search_used = priority == 1
+        logger.info(
+            f"Resolved '{identifier}' -> {rate_code} "
+            f"({'full-text search' if search_used else 'exact code'})"
+        )
+        return rate_code, search_used
@@ -0,0 +1,367 @@
+"""
+Semantic Cache for Vector Search Results
+
+Stores vector search results together with the query embedding in a local
+SQLite database. A new query is answered from the cache when it was seen
+before (exact match, no embedding call needed) or when its embedding is close
+enough to a cached one (near-duplicate, no vector scan over rates needed).
+
+Storage: separate SQLite file; near-duplicate lookups run against an
+in-memory matrix of the cached embeddings (one NumPy matrix-vector product).
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import orjson
+
+from src.database.db_manager import DatabaseManager
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+# id is AUTOINCREMENT so it is never reused after deletes (TTL prune); the
+# in-memory matrices use it as their refresh cursor
+CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache_embeddings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        query_hash TEXT NOT NULL,
+        namespace TEXT NOT NULL,
+        query TEXT NOT NULL,
+        embedding BLOB NOT NULL,
+        results TEXT NOT NULL,
+        ts REAL NOT NULL,
+        UNIQUE (query_hash, namespace)
+    )
+"""
+
+# Serves the (namespace, id > ?) scan in SemanticCache._refresh
+CACHE_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_cache_embeddings_ns
+    ON cache_embeddings(namespace)
+"""
+
+
+class SemanticCache:
+    """
+    Embedding-keyed cache of vector search results.
+
+    Entries are namespaced by everything other than the query text that
+    affects results (unit_type filter, limit, similarity threshold), so a
+    near-duplicate query only matches entries produced with the same
+    parameters. Entries older than ttl seconds are ignored and pruned on open.
+    Cache errors are logged and treated as misses so they never fail a search.
+
+    Embeddings of each namespace are mirrored in an in-memory matrix, so a
+    near-duplicate lookup is one matrix-vector product instead of a cosine
+    distance scan in SQL. The matrix picks up new rows (including ones
+    written by other worker processes) with an indexed query on
+    (namespace, id), replaces re-stored queries in place and keeps the
+    newest max_entries rows.
+
+    Attributes:
+        db_path (str): Path to the cache database file
+        similarity_threshold (float): Minimum cosine similarity for a hit
+        ttl (float): Entry lifetime in seconds
+        max_entries (int): Embeddings kept in memory per namespace
+
+    Example:
+        >>> cache = SemanticCache('data/cache/semantic_cache.db')
+        >>> cache.open()
+        >>> results = cache.get_exact("монтаж перегородок", "м2|10|0.0")
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        similarity_threshold: float = 0.97,
+        ttl: float = 86400.0,
+        max_entries: int = 1024,
+    ):
+        """
+        Initialize SemanticCache.
+
+        Args:
+            db_path: Path to the cache database file (created if missing)
+            similarity_threshold: Minimum cosine similarity for a hit (0-1)
+            ttl: Entry lifetime in seconds
+            max_entries: Embeddings kept in memory per namespace
+
+        Raises:
+            ValueError: If similarity_threshold is not in (0, 1]
+        """
+        if not 0.0 < similarity_threshold <= 1.0:
+            raise ValueError(
+                f"similarity_threshold must be in (0, 1], got: {similarity_threshold}"
+            )
+
+        self.db_path = db_path
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.db_manager: Optional[DatabaseManager] = None
+
+        # namespace -> in-memory mirror of its rows (see _refresh)
+        self._matrices: Dict[str, Dict[str, Any]] = {}
+        self._matrices_lock = threading.Lock()
+
+    def open(self) -> None:
+        """Connect to the cache database, create the table and prune old entries."""
+        if self.db_manager:
+            return
+
+        self.db_manager = DatabaseManager(self.db_path)
+        self.db_manager.connect()
+        columns = self.db_manager.execute_query("PRAGMA table_info(cache_embeddings)")
+        if columns and "id" not in {row[1] for row in columns}:
+            # Cache files from before the id column: entries are disposable
+            self.db_manager.execute_update("DROP TABLE cache_embeddings")
+        self.db_manager.execute_update(CACHE_SCHEMA)
+        self.db_manager.execute_update(CACHE_INDEX)
+
+        pruned = self.db_manager.execute_update(
+            "DELETE FROM cache_embeddings WHERE ts < ?", (self._min_ts(),)
+        )
+        logger.info(
+            f"SemanticCache opened: {self.db_path} ({pruned} expired entries pruned)"
+        )
+
+    def close(self) -> None:
+        """Close the cache database connection."""
+        if self.db_manager:
+            self.db_manager.disconnect()
+            self.db_manager = None
+        self._matrices = {}
+
+    @staticmethod
+    def make_namespace(
+        filters: Optional[Dict[str, Any]], limit: int, similarity_threshold: float
+    ) -> str:
+        """
+        Build the namespace for a search from the parameters affecting results.
+
+        Args:
+            filters: Search filters (e.g., {'unit_type': 'м2'})
+            limit: Maximum number of results
+            similarity_threshold: Minimum similarity passed to the search
+
+        Returns:
+            Namespace string
+        """
+        filters_key = json.dumps(filters or {}, sort_keys=True, ensure_ascii=False)
+        return f"{filters_key}|{limit}|{similarity_threshold}"
+
+    @staticmethod
+    def _hash_query(query: str) -> str:
+        """Hash normalized query text."""
+        normalized = " ".join(query.lower().split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _min_ts(self) -> float:
+        """Oldest timestamp that is still valid."""
+        return time.time() - self.ttl
+
+    def get_exact(self, query: str, namespace: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up results cached for the same query text.
+
+        Args:
+            query: Search query
+            namespace: Namespace from make_namespace()
+
+        Returns:
+            Cached results or None on miss
+        """
+        if not self.db_manager:
+            return None
+
+        try:
+            rows = self.db_manager.execute_query(
+                """
+                SELECT results FROM cache_embeddings
+                WHERE query_hash = ? AND namespace = ? AND ts >= ?
+                """,
+                (self._hash_query(query), namespace, self._min_ts()),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"SemanticCache lookup failed: {e}")
+            return None
+
+        if not rows:
+            return None
+
+        logger.debug(f"SemanticCache exact hit: '{query}'")
+        return orjson.loads(rows[0][0])
+
+    def _refresh(self, namespace: str) -> Dict[str, Any]:
+        """
+        Merge rows stored since the last refresh into a namespace's matrix.
+
+        Rows are read in id order, which follows commit order across
+        processes and is never reused after deletes, so a row is picked up
+        even if its ts is older than rows already loaded. A row for a query_hash that is already in the matrix
+        (INSERT OR REPLACE in put()) overwrites that slot instead of adding a
+        duplicate.
+
+        Must be called with _matrices_lock held.
+
+        Args:
+            namespace: Namespace from make_namespace()
+
+        Returns:
+            Dict with 'vectors' (normalized float32 matrix), 'ts', 'hashes',
+            'queries', 'results' (JSON text), 'positions' (query_hash -> row)
+            and 'last_id'
+        """
+        entry = self._matrices.get(namespace)
+        if entry is None:
+            entry = {
+                "vectors": None,
+                "ts": np.empty(0),
+                "hashes": [],
+                "queries": [],
+                "results": [],
+                "positions": {},
+                "last_id": 0,
+            }
+            self._matrices[namespace] = entry
+
+        rows = self.db_manager.execute_query(
+            """
+            SELECT id, query_hash, query, embedding, results, ts
+            FROM cache_embeddings
+            WHERE namespace = ? AND id > ? AND ts >= ?
+            ORDER BY id
+            """,
+            (namespace, entry["last_id"], self._min_ts()),
+        )
+        if not rows:
+            return entry
+
+        vectors = np.array(
+            [np.frombuffer(row[3], dtype=np.float32) for row in rows]
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1.0)
+
+        positions = entry["positions"]
+        appended = []
+        for i, row in enumerate(rows):
+            pos = positions.get(row[1])
+            if pos is None:
+                appended.append(i)
+                continue
+            entry["vectors"][pos] = vectors[i]
+            entry["ts"][pos] = row[5]
+            entry["queries"][pos] = row[2]
+            entry["results"][pos] = row[4]
+        entry["last_id"] = rows[-1][0]
+
+        if not appended:
+            return entry
+
+        new_vectors = vectors[appended]
+        if entry["vectors"] is not None:
+            new_vectors = np.vstack([entry["vectors"], new_vectors])
+        keep = slice(-self.max_entries, None)
+
+        entry["vectors"] = new_vectors[keep]
+        entry["ts"] = np.concatenate(
+            [entry["ts"], [rows[i][5] for i in appended]]
+        )[keep]
+        entry["hashes"] = (entry["hashes"] + [rows[i][1] for i in appended])[keep]
+        entry["queries"] = (entry["queries"] + [rows[i][2] for i in appended])[keep]
+        entry["results"] = (entry["results"] + [rows[i][4] for i in appended])[keep]
+        entry["positions"] = {h: pos for pos, h in enumerate(entry["hashes"])}
+        return entry
+
+    def get_similar(
+        self, embedding: bytes, namespace: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up results cached for the nearest query embedding.
+
+        Args:
+            embedding: Serialized float32 query embedding (normalized)
+            namespace: Namespace from make_namespace()
+
+        Returns:
+            Cached results if the nearest entry is within the similarity
+            threshold, otherwise None
+        """
+        if not self.db_manager:
+            return None
+
+        query_vector = np.frombuffer(embedding, dtype=np.float32)
+
+        try:
+            with self._matrices_lock:
+                entry = self._refresh(namespace)
+                if entry["vectors"] is None:
+                    return None
+
+                # Cosine similarity to every cached embedding at once
+                similarities = entry["vectors"] @ query_vector
+                similarities[entry["ts"] < self._min_ts()] = -1.0
+                best = int(np.argmax(similarities))
+                similarity = float(similarities[best])
+                cached_query = entry["queries"][best]
+                results = entry["results"][best]
+        except (sqlite3.Error, ValueError) as e:
+            # ValueError: embedding size differs (e.g., model changed)
+            logger.warning(f"SemanticCache lookup failed: {e}")
+            return None
+
+        if similarity < self.similarity_threshold:
+            return None
+
+        logger.debug(
+            f"SemanticCache similar hit: '{cached_query}' (similarity {similarity:.4f})"
+        )
+        return orjson.loads(results)
+
+    def put(
+        self,
+        query: str,
+        namespace: str,
+        embedding: bytes,
+        results: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Store results for a query.
+
+        Args:
+            query: Search query
+            namespace: Namespace from make_namespace()
+            embedding: Serialized float32 query embedding
+            results: Search results to cache
+        """
+        if not self.db_manager:
+            return
+
+        try:
+            self.db_manager.execute_update(
+                """
+                INSERT OR REPLACE INTO cache_embeddings
+                    (query_hash, namespace, query, embedding, results, ts)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    self._hash_query(query),
+                    namespace,
+                    query,
+                    embedding,
+                    orjson.dumps(results).decode(),
+                    time.time(),
+                ),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"SemanticCache store failed: {e}")
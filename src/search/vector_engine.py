@@ -12,32 +12,52 @@ Storage: sqlite-vec extension for efficient vector similarity search
 import logging
 import os
 import struct
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 
 import numpy as np
 import httpx
+from cachetools import LRUCache
 from openai import OpenAI
 
 from src.database.db_manager import DatabaseManager
+from src.search.embedding_cache import EmbeddingCache
+from src.search.semantic_cache import SemanticCache
 
 
 logger = logging.getLogger(__name__)
 
 
+# sqlite-vec vec0 index over rates.embedding (rowid = rates.rowid)
+VEC_INDEX_TABLE = "rates_vec"
+
+# Largest k a vec0 KNN query accepts
+VEC0_MAX_K = 4096
+
+
 class VectorSearchEngine:
     """
     Semantic search engine using OpenAI embeddings.
 
     Uses text-embedding-3-small model for generating embeddings and sqlite-vec
-    for efficient cosine similarity search.
+    for efficient cosine similarity search. Unfiltered searches use KNN on the
+    rates_vec vec0 index when it exists; filtered searches (and databases
+    without the index) scan rates.embedding with vec_distance_cosine.
     """
 
+    # Candidates per result fetched from an int8 index before exact re-ranking
+    INT8_RERANK_FACTOR = 4
+
     def __init__(
         self,
         db_manager: DatabaseManager,
         api_key: str,
         model_name: str = "text-embedding-3-small",
         base_url: Optional[str] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        embedding_cache_size: int = 1024,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        use_vec_index: Optional[bool] = None,
     ):
         """
         Initialize vector search engine.
@@ -47,9 +67,33 @@ class VectorSearchEngine:
             api_key: OpenAI API key
             model_name: OpenAI embedding model (default: text-embedding-3-small)
             base_url: Custom OpenAI API base URL (default: from OPENAI_BASE_URL env or OpenAI default)
+            semantic_cache: Optional opened SemanticCache for search results
+            embedding_cache_size: Number of query embeddings kept in memory
+                (default: 1024, 0 disables the cache)
+            embedding_cache: Optional opened EmbeddingCache that keeps query
+                embeddings across restarts and worker processes
+            use_vec_index: Use the rates_vec KNN index when present
+                (default: from USE_VEC_INDEX env, enabled unless "0")
         """
         self.db_manager = db_manager
         self.model_name = model_name
+        self.semantic_cache = semantic_cache
+        self.embedding_cache = embedding_cache
+
+        if use_vec_index is None:
+            use_vec_index = os.getenv("USE_VEC_INDEX", "1") != "0"
+        self.use_vec_index = use_vec_index
+
+        # Whether rates_vec exists (and stores int8); checked on first search
+        self._has_vec_index: Optional[bool] = None
+        self._vec_index_int8 = False
+
+        # Per-instance LRU of query embeddings (float32 bytes), keyed by the
+        # normalized query; the model is fixed per engine
+        self._query_embeddings: Optional[LRUCache] = (
+            LRUCache(maxsize=embedding_cache_size) if embedding_cache_size > 0 else None
+        )
+        self._query_embeddings_lock = threading.Lock()
 
         # Use explicit base_url, or fallback to OPENAI_BASE_URL env var
         effective_base_url = base_url or os.getenv("OPENAI_BASE_URL")
@@ -103,6 +147,63 @@ class VectorSearchEngine:
 
         return embedding
 
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Lowercase a query and collapse whitespace."""
+        return " ".join(query.lower().split())
+
+    def _embedding_bytes(self, key: str, query: str) -> bytes:
+        """
+        Return the embedding of a query as float32 bytes.
+
+        Checks the persistent EmbeddingCache (if any) under the normalized
+        key before calling the API, and stores new embeddings in it.
+
+        Args:
+            key: Normalized query (cache key)
+            query: Query text as given, which is what gets embedded
+        """
+        if self.embedding_cache:
+            blob = self.embedding_cache.get(self.model_name, key)
+            if blob is not None:
+                return blob
+
+        blob = self._encode_query(query).astype(np.float32).tobytes()
+
+        if self.embedding_cache:
+            self.embedding_cache.put(self.model_name, key, blob)
+
+        return blob
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Embed a search query, reusing the embedding of a repeated query.
+
+        The query is embedded as given. Queries differing only in case or
+        whitespace share one cache entry (the first one seen is embedded), so
+        repeats skip the embeddings API round trip. Misses of the in-memory
+        cache fall back to the persistent EmbeddingCache, if configured.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Normalized read-only embedding of shape (embedding_dim,)
+        """
+        key = self._normalize_query(query)
+
+        if self._query_embeddings is None:
+            blob = self._embedding_bytes(key, query)
+        else:
+            with self._query_embeddings_lock:
+                blob = self._query_embeddings.get(key)
+            if blob is None:
+                blob = self._embedding_bytes(key, query)
+                with self._query_embeddings_lock:
+                    self._query_embeddings[key] = blob
+
+        return np.frombuffer(blob, dtype=np.float32)
+
     def _encode_batch(self, texts: List[str]) -> List[np.ndarray]:
         """
         Encode multiple texts in one API call (more efficient).
@@ -115,16 +216,38 @@ class VectorSearchEngine:
         """
         response = self.client.embeddings.create(input=texts, model=self.model_name)
 
-        embeddings = []
-        for item in response.data:
-            embedding = np.array(item.embedding, dtype=np.float32)
+        # One (n, dim) array, normalized row-wise
+        matrix = np.array([item.embedding for item in response.data], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+        return list(matrix)
+
+    def embed_batch(self, texts: List[str], batch_size: int = 256) -> List[np.ndarray]:
+        """
+        Embed many texts with one API request per batch_size texts.
+
+        Used to (re)build rate embeddings: 28k rates take ~110 requests
+        instead of one per rate.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Texts per request (1-2048, the OpenAI input limit)
+
+        Returns:
+            List of normalized embeddings, in the same order as texts
 
-            # Normalize
-            norm = np.linalg.norm(embedding)
-            if norm > 0:
-                embedding = embedding / norm
+        Raises:
+            ValueError: If batch_size is out of range
+        """
+        if batch_size <= 0 or batch_size > 2048:
+            raise ValueError(
+                f"batch_size must be between 1 and 2048, got: {batch_size}"
+            )
 
-            embeddings.append(embedding)
+        embeddings: List[np.ndarray] = []
+        for start in range(0, len(texts), batch_size):
+            embeddings.extend(self._encode_batch(texts[start : start + batch_size]))
 
         return embeddings
 
@@ -173,6 +296,47 @@ class VectorSearchEngine:
         Returns:
             List of rate dictionaries with similarity scores
 
+        Raises:
+            ValueError: If query is empty or limit is invalid
+        """
+        cached, query_vector = self.prepare_search(
+            query, limit, filters, similarity_threshold
+        )
+        if cached is not None:
+            return cached
+
+        results = self.search_with_embedding(
+            query_vector, limit, filters, similarity_threshold
+        )
+        self.store_results(
+            query, query_vector, limit, filters, similarity_threshold, results
+        )
+        return results
+
+    def prepare_search(
+        self,
+        query: str,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        similarity_threshold: float = 0.0,
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[np.ndarray]]:
+        """
+        Run the part of search() that does not touch the rates database.
+
+        Checks the semantic cache and computes the query embedding (an
+        OpenAI API call on an embedding cache miss), so callers can keep a
+        database connection only for search_with_embedding().
+
+        Args:
+            query: Natural language search query
+            limit: Maximum number of results (default: 10)
+            filters: Optional filters (e.g., {'unit_type': 'м2'})
+            similarity_threshold: Minimum cosine similarity (0-1, default: 0.0)
+
+        Returns:
+            Tuple of (cached results or None, query embedding); the embedding
+            is None on an exact semantic cache hit
+
         Raises:
             ValueError: If query is empty or limit is invalid
         """
@@ -184,10 +348,76 @@ class VectorSearchEngine:
 
         logger.info(f"Vector search query: '{query}', limit: {limit}")
 
-        # Generate query embedding
-        query_vector = self._encode_query(query)
+        cache = self.semantic_cache
+        if cache:
+            namespace = cache.make_namespace(filters, limit, similarity_threshold)
+
+            # Same query seen before - no embedding call needed
+            cached = cache.get_exact(query, namespace)
+            if cached is not None:
+                return cached, None
+
+        # Generate query embedding (in-memory cache hit for repeated queries)
+        query_vector = self.embed_query(query)
+
+        if cache:
+            # Near-duplicate query - reuse its results
+            query_blob = self._serialize_vector(query_vector)
+            cached = cache.get_similar(query_blob, namespace)
+            if cached is not None:
+                return cached, query_vector
+
+        return None, query_vector
+
+    def store_results(
+        self,
+        query: str,
+        query_vector: np.ndarray,
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+        similarity_threshold: float,
+        results: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Store search_with_embedding() results in the semantic cache (if any).
+
+        Args:
+            query: Natural language search query
+            query_vector: Embedding returned by prepare_search()
+            limit: Maximum number of results
+            filters: Optional filters (e.g., {'unit_type': 'м2'})
+            similarity_threshold: Minimum cosine similarity
+            results: Results to cache
+        """
+        cache = self.semantic_cache
+        if cache:
+            namespace = cache.make_namespace(filters, limit, similarity_threshold)
+            cache.put(query, namespace, self._serialize_vector(query_vector), results)
+
+    def search_with_embedding(
+        self,
+        query_vector: np.ndarray,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        similarity_threshold: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform vector similarity search for an already computed embedding.
+
+        Args:
+            query_vector: Normalized query embedding
+            limit: Maximum number of results (default: 10)
+            filters: Optional filters (e.g., {'unit_type': 'м2'})
+            similarity_threshold: Minimum cosine similarity (0-1, default: 0.0)
+
+        Returns:
+            List of rate dictionaries with similarity scores
+        """
         query_blob = self._serialize_vector(query_vector)
 
+        if not filters and self._vec_index_enabled():
+            return self._search_vec_index(query_blob, limit, similarity_threshold)
+
         # Build SQL query
         sql = """
             SELECT
@@ -238,48 +468,208 @@ class VectorSearchEngine:
 
         try:
             rows = self.db_manager.execute_query(sql, tuple(params))
+        except Exception as e:
+            logger.error(f"Vector search failed: {str(e)}", exc_info=True)
+            raise
+
+        results = [self._row_to_result(row) for row in rows]
+        logger.info(f"Vector search returned {len(results)} results")
+        return results
+
+    def _vec_index_enabled(self) -> bool:
+        """True if KNN search on rates_vec is enabled and the table exists."""
+        if not self.use_vec_index:
+            return False
 
-            results = []
-            for row in rows:
-                (
-                    rate_code,
-                    rate_full_name,
-                    unit_type,
-                    unit_quantity,
-                    cost_per_unit,
-                    total_cost,
-                    labor_cost,
-                    machine_cost,
-                    material_cost,
-                    distance,
-                ) = row
-
-                # Convert cosine distance to similarity score (0-1)
-                similarity = 1.0 - distance
-
-                results.append(
-                    {
-                        "rate_code": rate_code,
-                        "rate_full_name": rate_full_name,
-                        "unit_type": unit_type,
-                        "unit_quantity": unit_quantity,
-                        "cost_per_unit": cost_per_unit,
-                        "total_cost": total_cost,
-                        "labor_cost": labor_cost,
-                        "machine_cost": machine_cost,
-                        "material_cost": material_cost,
-                        "similarity": similarity,
-                        "distance": distance,
-                    }
+        if self._has_vec_index is None:
+            self._load_vec_index_info()
+            if not self._has_vec_index:
+                logger.info(
+                    f"{VEC_INDEX_TABLE} not found - using brute-force vector scan"
                 )
 
-            logger.info(f"Vector search returned {len(results)} results")
-            return results
+        return self._has_vec_index
+
+    def _load_vec_index_info(self) -> None:
+        """Check whether rates_vec exists and whether it stores int8 vectors."""
+        rows = self.db_manager.execute_query(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (VEC_INDEX_TABLE,),
+        )
+        self._has_vec_index = bool(rows)
+        self._vec_index_int8 = bool(rows) and "int8[" in rows[0][0].lower()
+
+    def _search_vec_index(
+        self, query_blob: bytes, limit: int, similarity_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """
+        KNN search on the rates_vec vec0 index.
+
+        The index returns the nearest rowids, which are joined back to rates
+        for the result columns. A float32 index returns exactly limit rows
+        and the threshold is applied to them, matching the brute-force scan.
+        An int8 index returns INT8_RERANK_FACTOR x limit candidates, which
+        are re-ranked by exact cosine distance on rates.embedding.
+
+        Args:
+            query_blob: Serialized query embedding
+            limit: Maximum number of results
+            similarity_threshold: Minimum cosine similarity (0-1)
 
+        Returns:
+            List of rate dictionaries with similarity scores
+        """
+        if self._vec_index_int8:
+            match = "vec_quantize_int8(?, 'unit')"
+            distance = "vec_distance_cosine(r.embedding, ?)"
+            k = min(limit * self.INT8_RERANK_FACTOR, VEC0_MAX_K)
+            params: List[Any] = [query_blob, k, query_blob]
+        else:
+            match = "?"
+            distance = "knn.distance"
+            params = [query_blob, limit]
+
+        sql = f"""
+            WITH knn AS (
+                SELECT rowid, distance
+                FROM {VEC_INDEX_TABLE}
+                WHERE embedding MATCH {match} AND k = ?
+            )
+            SELECT
+                r.rate_code,
+                r.rate_full_name,
+                r.unit_type,
+                r.unit_quantity,
+                r.total_cost / r.unit_quantity as cost_per_unit,
+                r.total_cost,
+                r.labor_cost,
+                r.machine_cost,
+                r.material_cost,
+                {distance} as distance
+            FROM knn
+            JOIN rates r ON r.rowid = knn.rowid
+        """
+
+        if similarity_threshold > 0:
+            sql += f" WHERE {distance} <= ?"
+            if self._vec_index_int8:
+                params.append(query_blob)
+            params.append(1.0 - similarity_threshold)
+
+        sql += " ORDER BY distance ASC LIMIT ?"
+        params.append(limit)
+
+        try:
+            rows = self.db_manager.execute_query(sql, tuple(params))
         except Exception as e:
-            logger.error(f"Vector search failed: {str(e)}", exc_info=True)
+            logger.error(f"Vector index search failed: {str(e)}", exc_info=True)
             raise
 
+        results = [self._row_to_result(row) for row in rows]
+        logger.info(f"Vector index search returned {len(results)} results")
+        return results
+
+    @staticmethod
+    def _row_to_result(row: tuple) -> Dict[str, Any]:
+        """Convert a search row (rate columns + cosine distance) to a result dict."""
+        (
+            rate_code,
+            rate_full_name,
+            unit_type,
+            unit_quantity,
+            cost_per_unit,
+            total_cost,
+            labor_cost,
+            machine_cost,
+            material_cost,
+            distance,
+        ) = row
+
+        # Convert cosine distance to similarity score (0-1)
+        similarity = 1.0 - distance
+
+        return {
+            "rate_code": rate_code,
+            "rate_full_name": rate_full_name,
+            "unit_type": unit_type,
+            "unit_quantity": unit_quantity,
+            "cost_per_unit": cost_per_unit,
+            "total_cost": total_cost,
+            "labor_cost": labor_cost,
+            "machine_cost": machine_cost,
+            "material_cost": material_cost,
+            "similarity": similarity,
+            "distance": distance,
+        }
+
+    def sync_vec_index(
+        self, rate_codes: Optional[List[str]] = None, int8: bool = False
+    ) -> int:
+        """
+        Create the rates_vec vec0 index and copy embeddings into it.
+
+        Called by the embedding generation script after each batch so the
+        index is written together with rates.embedding. Requires a writable
+        connection.
+
+        With int8=True a new index stores scalar-quantized vectors
+        (vec_quantize_int8, 1 byte per dimension instead of 4); search then
+        re-ranks its candidates with the float32 rates.embedding column. An
+        existing index keeps the element type it was created with.
+
+        Args:
+            rate_codes: Rates to (re)index (default: all rates with embeddings)
+            int8: Create a new index with int8 elements (default: float32)
+
+        Returns:
+            Number of rows written to the index
+
+        Raises:
+            sqlite3.Error: If the index cannot be created or updated
+        """
+        element = "int8" if int8 else "float"
+        self.db_manager.execute_update(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {VEC_INDEX_TABLE} USING vec0("
+            f"embedding {element}[{self.embedding_dim}] distance_metric=cosine)"
+        )
+        self._load_vec_index_info()
+        # int8 elements are quantized from the unit-normalized float32 vectors
+        if self._vec_index_int8:
+            column = "vec_quantize_int8(embedding, 'unit')"
+            value = "vec_quantize_int8(?, 'unit')"
+        else:
+            column, value = "embedding", "?"
+
+        if rate_codes is None:
+            self.db_manager.execute_update(f"DELETE FROM {VEC_INDEX_TABLE}")
+            return self.db_manager.execute_update(
+                f"""
+                INSERT INTO {VEC_INDEX_TABLE}(rowid, embedding)
+                SELECT rowid, {column} FROM rates WHERE embedding IS NOT NULL
+                """
+            )
+
+        written = 0
+        for rate_code in rate_codes:
+            rows = self.db_manager.execute_query(
+                "SELECT rowid, embedding FROM rates WHERE rate_code = ?", (rate_code,)
+            )
+            if not rows:
+                continue
+            rowid, embedding = rows[0]
+            # vec0 has no upsert, so replace by delete + insert
+            self.db_manager.execute_update(
+                f"DELETE FROM {VEC_INDEX_TABLE} WHERE rowid = ?", (rowid,)
+            )
+            if embedding is not None:
+                written += self.db_manager.execute_update(
+                    f"INSERT INTO {VEC_INDEX_TABLE}(rowid, embedding) "
+                    f"VALUES (?, {value})",
+                    (rowid, embedding),
+                )
+
+        return written
+
     def generate_embedding(self, text: str) -> bytes:
         """
         Generate embedding for text and return as serialized bytes.
@@ -305,9 +695,28 @@ class VectorSearchEngine:
         Returns:
             List of serialized embedding bytes
         """
-        vectors = self._encode_batch(texts)
+        vectors = self.embed_batch(texts)
         return [self._serialize_vector(v) for v in vectors]
 
+    def embed_many(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Embed several queries with a single API request.
+
+        Lists longer than the OpenAI input limit (2048 texts) are split into
+        one request per 2048 texts.
+
+        Args:
+            texts: List of query texts
+
+        Returns:
+            List of normalized embeddings, in the same order as texts,
+            suitable for search_with_embedding()
+        """
+        if not texts:
+            return []
+
+        return self.embed_batch(texts, batch_size=min(len(texts), 2048))
+
     def get_embedding_stats(self) -> Dict[str, Any]:
         """
         Get statistics about embeddings in database.
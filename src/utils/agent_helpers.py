@@ -104,6 +104,10 @@ def _set_cached(cache_key: str, data: Any) -> None:
     logger.debug(f"Cached result for key: {cache_key[:50]}...")
 
 
+# Letters/digits followed by hyphens and more digits (ГЭСН, ТСН, ФСС, ТСЦ, ...)
+_RATE_CODE_RE = re.compile(r'^[А-Яа-яA-Za-z0-9]+[-\d]+$')
+
+
 def _is_rate_code(text: str) -> bool:
     """
     Determine if text looks like a rate code.
@@ -115,10 +119,7 @@ def _is_rate_code(text: str) -> bool:
 
     Examples: "ГЭСНп81-01-001-01", "10-05-001-01"
     """
-    # Check for patterns like: letters/digits followed by hyphens and more digits
-    # Common prefixes: ГЭСН, ТСН, ФСС, ТСЦ, etc.
-    pattern = r'^[А-Яа-яA-Za-z0-9]+[-\d]+$'
-    return bool(re.match(pattern, text.strip()))
+    return _RATE_CODE_RE.match(text.strip()) is not None
 
 
 # ============================================================================
@@ -5,12 +5,18 @@ This module tests the CostCalculator class that calculates costs for constructio
 rates with detailed resource breakdown and proportional quantity adjustments.
 """
 
+import numpy as np
 import pytest
 import sqlite3
 from unittest.mock import Mock, patch
 from pathlib import Path
 
-from src.search.cost_calculator import CostCalculator
+from src.search.cost_calculator import (
+    CostCalculator,
+    cost_summary,
+    format_rub,
+    to_kopecks,
+)
 from src.database.db_manager import DatabaseManager
 
 
@@ -310,6 +316,54 @@ class TestRounding:
                 assert decimal_places <= 2, f"{key} has more than 2 decimal places: {result[key]}"
 
 
+class TestKopecks:
+    """Test integer kopeck amounts."""
+
+    def test_to_kopecks(self):
+        """Test ruble to kopeck conversion rounds half away from zero."""
+        assert to_kopecks(1234.56) == 123456
+        assert to_kopecks(0.125) == 13
+        assert to_kopecks(-0.125) == -13
+        assert to_kopecks(1.005) == 101
+        assert to_kopecks(0.285) == 29
+        assert to_kopecks(1234.565) == 123457
+        assert to_kopecks(np.float64(2.675)) == 268
+        assert to_kopecks(0) == 0
+
+    def test_format_rub(self):
+        """Test kopecks are formatted with two decimals."""
+        assert format_rub(123456) == "1234.56"
+        assert format_rub(5) == "0.05"
+        assert format_rub(-105) == "-1.05"
+
+    def test_calculate_returns_kopecks(self, mock_calculator, mock_db_manager, sample_rate_data):
+        """Test kopeck fields match the ruble amounts."""
+        # Arrange
+        mock_db_manager.execute_query.return_value = sample_rate_data
+
+        # Act
+        result = mock_calculator.calculate('10-05-001-01', 100)
+
+        # Assert
+        assert result['calculated_total_kopecks'] == 13832018
+        assert result['cost_per_unit_kopecks'] == 138320
+        for key in ['base_cost', 'cost_per_unit', 'calculated_total', 'materials', 'resources']:
+            assert isinstance(result[f'{key}_kopecks'], int)
+            assert result[f'{key}_kopecks'] / 100 == result[key]
+
+    def test_cost_summary(self, mock_calculator, mock_db_manager, sample_rate_data):
+        """Test the shared response fields built from a calculation."""
+        mock_db_manager.execute_query.return_value = sample_rate_data
+        result = mock_calculator.calculate('10-05-001-01', 100)
+
+        summary = cost_summary(result)
+
+        assert summary['success'] is True
+        assert summary['total_cost'] == result['calculated_total']
+        assert summary['total_cost_kopecks'] == 13832018
+        assert summary['total_cost_rub'] == "138320.18"
+
+
 # ============================================================================
 # Test Edge Cases
 # ============================================================================
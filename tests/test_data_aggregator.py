@@ -257,6 +257,27 @@ class TestDataAggregatorAggregateRatesBasic:
         assert len(rates_df) == 2
         assert rates_df['rate_code'].nunique() == 2
 
+    def test_aggregate_rates_groups_scattered_rows_in_sheet_order(self):
+        """Test rows of a rate are grouped wherever they appear, in sheet order."""
+        df = pd.DataFrame({
+            'Расценка | Код': ['R002', 'R001', np.nan, 'R002', 'R001', 'R002'],
+            'Расценка | Исходное наименование': ['Работа 2', 'Работа 1', 'Без кода',
+                                                 'Работа 2', 'Работа 1', 'Работа 2'],
+            'Расценка | Ед. изм.': ['100 м2', 'м3', 'шт', '100 м2', 'м3', '100 м2'],
+            'Тип строки': ['Расценка', 'Расценка', 'Состав работ',
+                           'Состав работ', 'Состав работ', 'Состав работ'],
+            'Ресурс | Наименование': ['', '', 'Лишнее', 'Шаг А', 'Шаг Б', 'Шаг В'],
+        })
+
+        aggregator = DataAggregator(df)
+        rates_df = aggregator.aggregate_rates(df)[0]
+
+        assert rates_df['rate_code'].tolist() == ['R001', 'R002']
+        compositions = [json.loads(c) for c in rates_df['composition']]
+        assert [item['text'] for item in compositions[0]] == ['Шаг Б']
+        assert [item['text'] for item in compositions[1]] == ['Шаг А', 'Шаг В']
+        assert rates_df.loc[1, 'unit_number'] == 100.0
+
 
 # ============================================================================
 # Test: DataAggregator.aggregate_rates() - With Composition
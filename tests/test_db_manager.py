@@ -0,0 +1,123 @@
+"""
+Unit Tests for DatabaseManager Module
+
+This module tests DatabaseManager transaction handling.
+"""
+
+import sqlite3
+import threading
+from contextlib import closing
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def db(tmp_path):
+    """Connected DatabaseManager with an empty rates table."""
+    db = DatabaseManager(str(tmp_path / "manager_test.db"))
+    db.connect()
+    db.execute_update(
+        "CREATE TABLE rates (rate_code TEXT PRIMARY KEY, total_cost REAL)"
+    )
+    yield db
+    db.disconnect()
+
+
+def _count(path):
+    """Count rates as seen by a separate connection."""
+    with closing(sqlite3.connect(path)) as conn:
+        return conn.execute("SELECT COUNT(*) FROM rates").fetchone()[0]
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestTransaction:
+    """Test grouping writes into one transaction."""
+
+    def test_commits_once_at_end(self, db):
+        """Test that writes inside the block are invisible until it exits."""
+        with db.transaction():
+            db.execute_many(
+                "INSERT INTO rates VALUES (?, ?)",
+                [("10-05-001-01", 100.0), ("10-06-037-02", 200.0)],
+            )
+            db.execute_update(
+                "INSERT INTO rates VALUES (?, ?)", ("11-01-011-01", 300.0)
+            )
+            assert db.connection.in_transaction
+            assert _count(db.db_path) == 0
+
+        assert not db.connection.in_transaction
+        assert _count(db.db_path) == 3
+
+    def test_rollback_on_error(self, db):
+        """Test that an exception discards every write of the block."""
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.execute_many(
+                    "INSERT INTO rates VALUES (?, ?)", [("10-05-001-01", 100.0)]
+                )
+                raise RuntimeError("ETL step failed")
+
+        assert _count(db.db_path) == 0
+
+    def test_failed_statement_keeps_earlier_writes(self, db):
+        """Test that a handled statement error does not undo the block."""
+        with db.transaction():
+            db.execute_update(
+                "INSERT INTO rates VALUES (?, ?)", ("10-05-001-01", 100.0)
+            )
+            with pytest.raises(sqlite3.Error):
+                db.execute_update(
+                    "INSERT INTO rates VALUES (?, ?)", ("10-05-001-01", 100.0)
+                )
+
+        assert _count(db.db_path) == 1
+
+    def test_nested_joins_outer(self, db):
+        """Test that an inner transaction() commits with the outer one."""
+        with db.transaction():
+            with db.transaction():
+                db.execute_update(
+                    "INSERT INTO rates VALUES (?, ?)", ("10-05-001-01", 100.0)
+                )
+            assert _count(db.db_path) == 0
+
+        assert _count(db.db_path) == 1
+
+    def test_other_thread_does_not_join(self, db):
+        """Test that another thread's block is its own transaction."""
+        def other_block():
+            with pytest.raises(RuntimeError):
+                with db.transaction():
+                    db.execute_update(
+                        "INSERT INTO rates VALUES (?, ?)", ("11-01-011-01", 300.0)
+                    )
+                    raise RuntimeError("other ETL step failed")
+
+        other = threading.Thread(target=other_block)
+        with db.transaction():
+            other.start()
+            other.join(timeout=0.5)
+            db.execute_update(
+                "INSERT INTO rates VALUES (?, ?)", ("10-05-001-01", 100.0)
+            )
+        other.join()
+
+        # Only the other block's own write was rolled back
+        assert _count(db.db_path) == 1
+
+    def test_requires_connection(self, tmp_path):
+        """Test that transaction() fails before connect()."""
+        db = DatabaseManager(str(tmp_path / "not_connected.db"))
+        with pytest.raises(sqlite3.Error, match="not connected"):
+            with db.transaction():
+                pass
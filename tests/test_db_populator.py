@@ -290,6 +290,53 @@ class TestPopulateRates:
         result = populator.db_manager.execute_query("SELECT COUNT(*) FROM rates")
         assert result[0][0] == len(large_rates_df)
 
+    def test_populate_rates_compound_insert_with_tail(self, populator, large_rates_df):
+        """Test multi-row statements plus a single-row tail insert every record."""
+        populator.batch_size = 1000
+        populator.COMPOUND_ROWS_PER_STMT = 300  # 3 compound statements + 100-row tail
+
+        inserted = populator.populate_rates(large_rates_df)
+
+        assert inserted == len(large_rates_df)
+        rows = populator.db_manager.execute_query(
+            "SELECT rate_code, rate_full_name FROM rates ORDER BY rate_code"
+        )
+        assert rows == list(zip(large_rates_df['rate_code'], large_rates_df['rate_full_name']))
+
+    def test_populate_inside_transaction_commits_once(
+        self, populator, large_rates_df, sample_resources_df
+    ):
+        """Test a whole multi-batch populate inside transaction() issues one COMMIT."""
+        populator.batch_size = 1000
+        statements = []
+        populator.db_manager.connection.set_trace_callback(statements.append)
+
+        resources_df = sample_resources_df.assign(
+            rate_code=large_rates_df['rate_code'][:5].tolist()
+        )
+
+        with populator.db_manager.transaction():
+            populator.populate_rates(large_rates_df)
+            populator.populate_resources(resources_df)
+
+        populator.db_manager.connection.set_trace_callback(None)
+        commits = [sql for sql in statements if sql.strip().upper() == 'COMMIT']
+        assert len(commits) == 1
+
+    def test_populate_rates_duplicate_in_compound_statement_rolls_back_batch(
+        self, populator, large_rates_df
+    ):
+        """Test a duplicate inside a compound batch keeps the batch atomic."""
+        df = large_rates_df.head(10).copy()
+        df.loc[7, 'rate_code'] = df.loc[2, 'rate_code']
+        populator.COMPOUND_ROWS_PER_STMT = 4
+
+        with pytest.raises(DuplicateRateCodeError):
+            populator.populate_rates(df)
+
+        result = populator.db_manager.execute_query("SELECT COUNT(*) FROM rates")
+        assert result[0][0] == 0
+
     def test_populate_rates_nan_to_null(self, populator):
         """Test NaN values converted to NULL in database."""
         df = pd.DataFrame({
@@ -658,6 +705,57 @@ class TestHelperMethods:
         assert populator._safe_numeric(None, default=99.9) == 99.9
         assert populator._safe_numeric(np.nan, default=-1.0) == -1.0
 
+    def test_prepare_batches_splits_by_batch_size(self, db_manager):
+        """Test _prepare_batches yields batch_size tuples in column order."""
+        populator = DatabasePopulator(db_manager, batch_size=2)
+        df = pd.DataFrame({
+            'mass_unit': ['кг', 'т', 'кг'],
+            'resource_code': ['M001', 'M002', 'M003'],
+            'mass_value': [1.5, np.nan, 3.0],
+        })
+
+        batches = list(populator._prepare_batches(
+            df, ['resource_code', 'mass_name', 'mass_value', 'mass_unit']
+        ))
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert batches[0][0] == ('M001', None, 1.5, 'кг')
+        assert batches[0][1] == ('M002', None, None, 'т')
+
+
+# ============================================================================
+# Resource Mass and Services Tests
+# ============================================================================
+
+class TestPopulateMassAndServices:
+    """Tests for _populate_resource_mass() and _populate_services()."""
+
+    def test_populate_services(self, populator, db_manager, sample_rates_df):
+        """Test services are inserted for existing rates."""
+        populator.populate_rates(sample_rates_df)
+        services_df = pd.DataFrame({
+            'rate_code': ['R001', 'R002'],
+            'service_category': ['Перевозка', 'Перевозка'],
+            'service_type': ['Грузовые', 'Грузовые'],
+            'service_code': ['S001', 'S002'],
+            'service_unit': ['т', 'т'],
+            'service_name': ['Перевозка грузов', 'Перевозка металла'],
+            'service_quantity': [1.2, np.nan],
+        })
+
+        inserted = populator._populate_services(services_df)
+
+        assert inserted == 2
+        rows = db_manager.execute_query(
+            "SELECT service_code, service_quantity FROM services ORDER BY service_code"
+        )
+        assert rows == [('S001', 1.2), ('S002', None)]
+
+    def test_populate_empty_frames(self, populator):
+        """Test empty DataFrames insert nothing."""
+        assert populator._populate_resource_mass(pd.DataFrame()) == 0
+        assert populator._populate_services(pd.DataFrame()) == 0
+
 
 # ============================================================================
 # Integration Tests
@@ -0,0 +1,105 @@
+"""
+Unit Tests for EmbeddingCache Module
+
+Tests for the persistent query embedding cache including:
+- Hits and misses by model and query
+- TTL expiry and pruning
+- VectorSearchEngine integration
+"""
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from src.search.embedding_cache import EmbeddingCache
+from src.search.vector_engine import VectorSearchEngine
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+MODEL = "text-embedding-3-small"
+VECTOR = np.array([0.6, 0.8], dtype=np.float32).tobytes()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Open an EmbeddingCache in a temporary directory."""
+    cache = EmbeddingCache(str(tmp_path / "embedding_cache.db"))
+    cache.open()
+    yield cache
+    cache.close()
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestEmbeddingCache:
+    """Test suite for EmbeddingCache lookups."""
+
+    def test_hit_after_put(self, cache):
+        """Test that a stored embedding is returned for the same query."""
+        cache.put(MODEL, "монтаж перегородок", VECTOR)
+
+        assert cache.get(MODEL, "монтаж перегородок") == VECTOR
+        assert cache.get(MODEL, "монтаж стен") is None
+
+    def test_model_is_part_of_key(self, cache):
+        """Test that another model does not get the cached vector."""
+        cache.put(MODEL, "бетон", VECTOR)
+
+        assert cache.get("text-embedding-3-large", "бетон") is None
+
+    def test_survives_reopen(self, tmp_path):
+        """Test that entries persist across connections."""
+        path = str(tmp_path / "embedding_cache.db")
+        first = EmbeddingCache(path)
+        first.open()
+        first.put(MODEL, "бетон", VECTOR)
+        first.close()
+
+        second = EmbeddingCache(path)
+        second.open()
+        try:
+            assert second.get(MODEL, "бетон") == VECTOR
+        finally:
+            second.close()
+
+    def test_expired_entries_ignored(self, cache):
+        """Test that entries older than ttl are misses."""
+        cache.put(MODEL, "бетон", VECTOR)
+        cache.ttl = -10
+
+        assert cache.get(MODEL, "бетон") is None
+
+    def test_closed_cache_is_a_miss(self, tmp_path):
+        """Test that an unopened cache never fails a lookup."""
+        cache = EmbeddingCache(str(tmp_path / "c.db"))
+        cache.put(MODEL, "бетон", VECTOR)
+
+        assert cache.get(MODEL, "бетон") is None
+
+
+class TestVectorSearchEngineEmbeddingCache:
+    """Test suite for VectorSearchEngine with an EmbeddingCache."""
+
+    def _engine(self, cache):
+        with patch("src.search.vector_engine.OpenAI"):
+            engine = VectorSearchEngine(
+                db_manager=Mock(), api_key="test", embedding_cache=cache
+            )
+        engine._encode_query = Mock(return_value=np.array([0.6, 0.8], dtype=np.float32))
+        return engine
+
+    def test_restart_skips_embedding(self, cache):
+        """Test that a new engine reuses embeddings stored by a previous one."""
+        self._engine(cache).embed_query("Перегородки")
+
+        engine = self._engine(cache)
+        vector = engine.embed_query("перегородки")
+
+        engine._encode_query.assert_not_called()
+        np.testing.assert_allclose(vector, [0.6, 0.8])
@@ -222,6 +222,30 @@ class TestExcelLoaderLoad:
         assert len(df) == 5
         assert len(df.columns) == 7
 
+    def test_load_uses_calamine_when_available(self, temp_excel_file, sample_valid_dataframe):
+        """Test that the calamine engine is used directly when installed."""
+        loader = ExcelLoader(str(temp_excel_file))
+
+        with patch('src.etl.excel_loader._HAS_CALAMINE', True), \
+                patch('src.etl.excel_loader.pd.read_excel',
+                      return_value=sample_valid_dataframe) as mock_read:
+            df = loader.load()
+
+        assert mock_read.call_args.kwargs["engine"] == "calamine"
+        assert mock_read.call_args.kwargs["dtype"] == ExcelLoader.CATEGORY_DTYPES
+        assert df is sample_valid_dataframe
+
+    def test_load_falls_back_to_openpyxl(self, temp_excel_file, sample_valid_dataframe):
+        """Test that openpyxl is used when calamine is not installed."""
+        loader = ExcelLoader(str(temp_excel_file))
+
+        with patch('src.etl.excel_loader._HAS_CALAMINE', False), \
+                patch('src.etl.excel_loader.pd.read_excel',
+                      return_value=sample_valid_dataframe) as mock_read:
+            loader.load()
+
+        assert mock_read.call_args.kwargs["engine"] == "openpyxl"
+
 
 # ============================================================================
 # Test: ExcelLoader.validate()
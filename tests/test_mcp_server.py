@@ -9,10 +9,13 @@ Tests all 5 MCP tools with various scenarios including:
 - Auto-detection logic
 """
 
+import asyncio
 import json
 import pytest
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import patch
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -22,12 +25,17 @@ sys.path.insert(0, str(project_root))
 import mcp_server
 
 
+def call_tool(tool, *args, **kwargs):
+    """Run an MCP tool's function to completion and return its JSON string."""
+    return asyncio.run(tool.fn(*args, **kwargs))
+
+
 class TestNaturalSearch:
     """Test suite for natural_search tool."""
 
     def test_natural_search_basic(self):
         """Test basic search functionality."""
-        result_json = mcp_server.natural_search.fn("перегородки", limit=5)
+        result_json = call_tool(mcp_server.natural_search, "перегородки", limit=5)
         result = json.loads(result_json)
 
         assert result["success"] is True
@@ -46,7 +54,7 @@ class TestNaturalSearch:
 
     def test_natural_search_with_unit_filter(self):
         """Test search with unit type filter."""
-        result_json = mcp_server.natural_search.fn("бетон", unit_type="м3", limit=10)
+        result_json = call_tool(mcp_server.natural_search, "бетон", unit_type="м3", limit=10)
         result = json.loads(result_json)
 
         assert result["success"] is True
@@ -58,7 +66,7 @@ class TestNaturalSearch:
 
     def test_natural_search_empty_query(self):
         """Test search with empty query."""
-        result_json = mcp_server.natural_search.fn("", limit=5)
+        result_json = call_tool(mcp_server.natural_search, "", limit=5)
         result = json.loads(result_json)
 
         assert "error" in result
@@ -66,7 +74,7 @@ class TestNaturalSearch:
 
     def test_natural_search_no_results(self):
         """Test search that returns no results."""
-        result_json = mcp_server.natural_search.fn("абракадабра123456", limit=5)
+        result_json = call_tool(mcp_server.natural_search, "абракадабра123456", limit=5)
         result = json.loads(result_json)
 
         # Should succeed but with zero results
@@ -76,7 +84,7 @@ class TestNaturalSearch:
 
     def test_natural_search_limit_enforcement(self):
         """Test that limit is properly enforced."""
-        result_json = mcp_server.natural_search.fn("бетон", limit=3)
+        result_json = call_tool(mcp_server.natural_search, "бетон", limit=3)
         result = json.loads(result_json)
 
         assert result["success"] is True
@@ -84,7 +92,7 @@ class TestNaturalSearch:
 
     def test_natural_search_cost_formatting(self):
         """Test that costs are properly formatted to 2 decimals."""
-        result_json = mcp_server.natural_search.fn("бетон", limit=1)
+        result_json = call_tool(mcp_server.natural_search, "бетон", limit=1)
         result = json.loads(result_json)
 
         if result["results"]:
@@ -95,6 +103,16 @@ class TestNaturalSearch:
                 decimals = len(cost_str.split(".")[1])
                 assert decimals <= 2
 
+    def test_natural_search_repeat_uses_cache(self):
+        """Test that a repeated query is answered from the search cache."""
+        first = call_tool(mcp_server.natural_search, "перегородки", limit=2)
+        hits = mcp_server._cached_search.cache_info().hits
+
+        second = call_tool(mcp_server.natural_search, "  перегородки ", limit=2)
+
+        assert second == first
+        assert mcp_server._cached_search.cache_info().hits == hits + 1
+
 
 class TestQuickCalculate:
     """Test suite for quick_calculate tool."""
@@ -102,10 +120,10 @@ class TestQuickCalculate:
     def test_quick_calculate_with_rate_code(self):
         """Test calculation with direct rate code."""
         # First get a valid rate code
-        search_result = json.loads(mcp_server.natural_search.fn("перегородки", limit=1))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "перегородки", limit=1))
         rate_code = search_result["results"][0]["rate_code"]
 
-        result_json = mcp_server.quick_calculate.fn(rate_code, 100)
+        result_json = call_tool(mcp_server.quick_calculate, rate_code, 100)
         result = json.loads(result_json)
 
         assert result["success"] is True
@@ -117,10 +135,11 @@ class TestQuickCalculate:
         assert "materials" in result
         assert "resources" in result
         assert result["quantity"] == 100
+        assert result["calculated_total_kopecks"] == round(result["calculated_total"] * 100)
 
     def test_quick_calculate_with_search_query(self):
         """Test calculation with search query (auto-detection)."""
-        result_json = mcp_server.quick_calculate.fn("перегородки гипсокартон", 50)
+        result_json = call_tool(mcp_server.quick_calculate, "перегородки гипсокартон", 50)
         result = json.loads(result_json)
 
         assert result["success"] is True
@@ -130,7 +149,7 @@ class TestQuickCalculate:
 
     def test_quick_calculate_invalid_quantity(self):
         """Test calculation with invalid quantity."""
-        result_json = mcp_server.quick_calculate.fn("10-05-001-01", -10)
+        result_json = call_tool(mcp_server.quick_calculate, "10-05-001-01", -10)
         result = json.loads(result_json)
 
         assert "error" in result
@@ -138,29 +157,29 @@ class TestQuickCalculate:
 
     def test_quick_calculate_zero_quantity(self):
         """Test calculation with zero quantity."""
-        result_json = mcp_server.quick_calculate.fn("10-05-001-01", 0)
+        result_json = call_tool(mcp_server.quick_calculate, "10-05-001-01", 0)
         result = json.loads(result_json)
 
         assert "error" in result
 
     def test_quick_calculate_nonexistent_rate(self):
         """Test calculation with non-existent rate code."""
-        result_json = mcp_server.quick_calculate.fn("INVALID-CODE-999", 10)
+        result_json = call_tool(mcp_server.quick_calculate, "INVALID-CODE-999", 10)
         result = json.loads(result_json)
 
         assert "error" in result
 
     def test_quick_calculate_cost_proportionality(self):
         """Test that costs scale proportionally with quantity."""
-        search_result = json.loads(mcp_server.natural_search.fn("бетон", limit=1))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "бетон", limit=1))
         rate_code = search_result["results"][0]["rate_code"]
 
         # Calculate for quantity 10
-        result1_json = mcp_server.quick_calculate.fn(rate_code, 10)
+        result1_json = call_tool(mcp_server.quick_calculate, rate_code, 10)
         result1 = json.loads(result1_json)
 
         # Calculate for quantity 20
-        result2_json = mcp_server.quick_calculate.fn(rate_code, 20)
+        result2_json = call_tool(mcp_server.quick_calculate, rate_code, 20)
         result2 = json.loads(result2_json)
 
         # Total should be approximately double (allowing for rounding)
@@ -173,10 +192,10 @@ class TestShowRateDetails:
 
     def test_show_rate_details_basic(self):
         """Test basic rate details retrieval."""
-        search_result = json.loads(mcp_server.natural_search.fn("бетон", limit=1))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "бетон", limit=1))
         rate_code = search_result["results"][0]["rate_code"]
 
-        result_json = mcp_server.show_rate_details.fn(rate_code, 100)
+        result_json = call_tool(mcp_server.show_rate_details, rate_code, 100)
         result = json.loads(result_json)
 
         assert result["success"] is True
@@ -187,10 +206,10 @@ class TestShowRateDetails:
 
     def test_show_rate_details_breakdown_structure(self):
         """Test that breakdown has correct structure."""
-        search_result = json.loads(mcp_server.natural_search.fn("перегородки", limit=1))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "перегородки", limit=1))
         rate_code = search_result["results"][0]["rate_code"]
 
-        result_json = mcp_server.show_rate_details.fn(rate_code, 50)
+        result_json = call_tool(mcp_server.show_rate_details, rate_code, 50)
         result = json.loads(result_json)
 
         if result["breakdown"]:
@@ -205,10 +224,10 @@ class TestShowRateDetails:
 
     def test_show_rate_details_default_quantity(self):
         """Test rate details with default quantity."""
-        search_result = json.loads(mcp_server.natural_search.fn("бетон", limit=1))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "бетон", limit=1))
         rate_code = search_result["results"][0]["rate_code"]
 
-        result_json = mcp_server.show_rate_details.fn(rate_code)
+        result_json = call_tool(mcp_server.show_rate_details, rate_code)
         result = json.loads(result_json)
 
         assert result["success"] is True
@@ -216,7 +235,7 @@ class TestShowRateDetails:
 
     def test_show_rate_details_invalid_rate(self):
         """Test details for non-existent rate."""
-        result_json = mcp_server.show_rate_details.fn("INVALID-999", 10)
+        result_json = call_tool(mcp_server.show_rate_details, "INVALID-999", 10)
         result = json.loads(result_json)
 
         assert "error" in result
@@ -228,10 +247,10 @@ class TestCompareVariants:
     def test_compare_variants_basic(self):
         """Test basic comparison of multiple rates."""
         # Get two different rate codes
-        search_result = json.loads(mcp_server.natural_search.fn("перегородки", limit=2))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "перегородки", limit=2))
         rate_codes = [r["rate_code"] for r in search_result["results"][:2]]
 
-        result_json = mcp_server.compare_variants.fn(rate_codes, 100)
+        result_json = call_tool(mcp_server.compare_variants, rate_codes, 100)
         result = json.loads(result_json)
 
         assert result["success"] is True
@@ -239,12 +258,36 @@ class TestCompareVariants:
         assert "comparison" in result
         assert len(result["comparison"]) == len(rate_codes)
 
+    def test_compare_variants_order_independent_cache(self):
+        """Test that the same codes in another order reuse the cached response."""
+        search_result = json.loads(call_tool(mcp_server.natural_search, "перегородки", limit=2))
+        rate_codes = [r["rate_code"] for r in search_result["results"][:2]]
+
+        first = call_tool(mcp_server.compare_variants, rate_codes, 75)
+        hits = mcp_server._compare_json.cache_info().hits
+        second = call_tool(mcp_server.compare_variants, list(reversed(rate_codes)), 75)
+
+        assert second == first
+        assert mcp_server._compare_json.cache_info().hits == hits + 1
+
+    def test_compare_variants_deduplicates_codes(self):
+        """Test that duplicate and padded codes are compared once."""
+        search_result = json.loads(call_tool(mcp_server.natural_search, "перегородки", limit=1))
+        rate_code = search_result["results"][0]["rate_code"]
+
+        result = json.loads(
+            call_tool(mcp_server.compare_variants, [rate_code, f" {rate_code} ", ""], 10)
+        )
+
+        assert result["success"] is True
+        assert result["count"] == 1
+
     def test_compare_variants_sorting(self):
         """Test that results are sorted by cost."""
-        search_result = json.loads(mcp_server.natural_search.fn("бетон", limit=3))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "бетон", limit=3))
         rate_codes = [r["rate_code"] for r in search_result["results"][:3]]
 
-        result_json = mcp_server.compare_variants.fn(rate_codes, 50)
+        result_json = call_tool(mcp_server.compare_variants, rate_codes, 50)
         result = json.loads(result_json)
 
         # Check that results are sorted by total_for_quantity
@@ -253,10 +296,10 @@ class TestCompareVariants:
 
     def test_compare_variants_difference_calculation(self):
         """Test that differences are calculated correctly."""
-        search_result = json.loads(mcp_server.natural_search.fn("перегородки", limit=3))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "перегородки", limit=3))
         rate_codes = [r["rate_code"] for r in search_result["results"][:3]]
 
-        result_json = mcp_server.compare_variants.fn(rate_codes, 100)
+        result_json = call_tool(mcp_server.compare_variants, rate_codes, 100)
         result = json.loads(result_json)
 
         # Cheapest should have zero difference
@@ -271,17 +314,17 @@ class TestCompareVariants:
 
     def test_compare_variants_empty_list(self):
         """Test comparison with empty rate codes list."""
-        result_json = mcp_server.compare_variants.fn([], 100)
+        result_json = call_tool(mcp_server.compare_variants, [], 100)
         result = json.loads(result_json)
 
         assert "error" in result
 
     def test_compare_variants_invalid_quantity(self):
         """Test comparison with invalid quantity."""
-        search_result = json.loads(mcp_server.natural_search.fn("бетон", limit=2))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "бетон", limit=2))
         rate_codes = [r["rate_code"] for r in search_result["results"][:2]]
 
-        result_json = mcp_server.compare_variants.fn(rate_codes, -10)
+        result_json = call_tool(mcp_server.compare_variants, rate_codes, -10)
         result = json.loads(result_json)
 
         assert "error" in result
@@ -292,10 +335,10 @@ class TestFindSimilarRates:
 
     def test_find_similar_rates_basic(self):
         """Test basic similarity search."""
-        search_result = json.loads(mcp_server.natural_search.fn("перегородки", limit=1))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "перегородки", limit=1))
         rate_code = search_result["results"][0]["rate_code"]
 
-        result_json = mcp_server.find_similar_rates.fn(rate_code, max_results=5)
+        result_json = call_tool(mcp_server.find_similar_rates, rate_code, max_results=5)
         result = json.loads(result_json)
 
         assert result["success"] is True
@@ -307,10 +350,10 @@ class TestFindSimilarRates:
 
     def test_find_similar_rates_includes_source(self):
         """Test that source rate is included in results."""
-        search_result = json.loads(mcp_server.natural_search.fn("бетон", limit=1))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "бетон", limit=1))
         rate_code = search_result["results"][0]["rate_code"]
 
-        result_json = mcp_server.find_similar_rates.fn(rate_code, max_results=3)
+        result_json = call_tool(mcp_server.find_similar_rates, rate_code, max_results=3)
         result = json.loads(result_json)
 
         # Source rate should be in alternatives
@@ -319,10 +362,10 @@ class TestFindSimilarRates:
 
     def test_find_similar_rates_max_results_limit(self):
         """Test that max_results is respected."""
-        search_result = json.loads(mcp_server.natural_search.fn("перегородки", limit=1))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "перегородки", limit=1))
         rate_code = search_result["results"][0]["rate_code"]
 
-        result_json = mcp_server.find_similar_rates.fn(rate_code, max_results=3)
+        result_json = call_tool(mcp_server.find_similar_rates, rate_code, max_results=3)
         result = json.loads(result_json)
 
         # Should have source + up to 3 alternatives (4 total max)
@@ -330,17 +373,17 @@ class TestFindSimilarRates:
 
     def test_find_similar_rates_invalid_rate(self):
         """Test similarity search with invalid rate."""
-        result_json = mcp_server.find_similar_rates.fn("INVALID-999", max_results=5)
+        result_json = call_tool(mcp_server.find_similar_rates, "INVALID-999", max_results=5)
         result = json.loads(result_json)
 
         assert "error" in result
 
     def test_find_similar_rates_structure(self):
         """Test that results have correct structure."""
-        search_result = json.loads(mcp_server.natural_search.fn("бетон", limit=1))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "бетон", limit=1))
         rate_code = search_result["results"][0]["rate_code"]
 
-        result_json = mcp_server.find_similar_rates.fn(rate_code, max_results=2)
+        result_json = call_tool(mcp_server.find_similar_rates, rate_code, max_results=2)
         result = json.loads(result_json)
 
         if result["alternatives"]:
@@ -367,12 +410,19 @@ class TestUtilityFunctions:
         assert mcp_server.is_rate_code("перегородки гипсокартон") is False
         assert mcp_server.is_rate_code("бетон монолитный класс В25") is False
         assert mcp_server.is_rate_code("устройство перегородок") is False
+        assert mcp_server.is_rate_code("10-05 перегородки") is False
 
     def test_format_cost(self):
         """Test cost formatting function."""
         assert mcp_server.format_cost(123.456789) == 123.46
         assert mcp_server.format_cost(100.0) == 100.0
         assert mcp_server.format_cost(99.999) == 100.0
+        assert mcp_server.format_cost(0.125) == 0.13
+
+    def test_tools_have_no_output_schema(self):
+        """Test that JSON text results are not duplicated as structured content."""
+        assert mcp_server.natural_search.output_schema is None
+        assert mcp_server.compare_variants.output_schema is None
 
     def test_safe_json_serialize(self):
         """Test JSON serialization with special values."""
@@ -398,6 +448,82 @@ class TestUtilityFunctions:
         parsed = json.loads(result)
         assert parsed["value"] is None
 
+    def test_error_json_matches_serializer(self):
+        """Test that the error template equals the generic serializer output."""
+        details = 'Rate code \'10-05-001-01\' not found: "нет"'
+        assert mcp_server._error_json("Rate not found", details) == (
+            mcp_server.safe_json_serialize({"error": "Rate not found", "details": details})
+        )
+
+    def test_compact_output_by_default(self):
+        """Test that responses are not pretty-printed unless MCP_DEBUG is set."""
+        result = mcp_server.safe_json_serialize({"success": True, "results": [1, 2]})
+
+        assert result == '{"success":true,"results":[1,2]}'
+
+    def test_frame_to_records(self):
+        """Test DataFrame rows convert to dicts of Python scalars."""
+        import pandas as pd
+        import numpy as np
+
+        df = pd.DataFrame({"rate_code": ["10-05-001-01"], "count": [2], "cost": [np.nan]})
+        records = mcp_server.frame_to_records(df)
+        assert records[0]["rate_code"] == "10-05-001-01"
+        assert type(records[0]["count"]) is int
+        assert json.loads(mcp_server.safe_json_serialize(df)) == [
+            {"rate_code": "10-05-001-01", "count": 2, "cost": None}
+        ]
+
+    def test_safe_json_serialize_nested(self):
+        """Test that nested NaN, numpy and pandas values serialize cleanly."""
+        import pandas as pd
+        import numpy as np
+
+        data = {
+            "results": [{"cost": np.float64("nan"), "count": np.int64(3)}],
+            "missing": pd.NA,
+            "precise": np.longdouble(1.5),
+            "name": "Перегородки",
+        }
+        parsed = json.loads(mcp_server.safe_json_serialize(data))
+        assert parsed["results"] == [{"cost": None, "count": 3}]
+        assert parsed["missing"] is None
+        assert parsed["precise"] == 1.5
+        assert parsed["name"] == "Перегородки"
+
+
+class TestVectorEngineInit:
+    """Test lazy creation of the VectorSearchEngine."""
+
+    @pytest.fixture(autouse=True)
+    def reset_engine(self):
+        """Start without an engine and restore module state afterwards."""
+        with patch.object(mcp_server, "_vector_engine", None), patch.multiple(
+            mcp_server, EMBEDDING_CACHE_PATH="", SEMANTIC_CACHE_PATH=""
+        ):
+            yield
+
+    def test_no_api_key(self):
+        """Test that no engine is created without OPENAI_API_KEY."""
+        with patch.dict("os.environ", {"OPENAI_API_KEY": ""}):
+            assert mcp_server._get_vector_engine() is None
+
+        result = json.loads(call_tool(mcp_server.vector_search, "перегородки"))
+        assert result["error"] == "Service unavailable"
+
+    def test_created_once_on_first_use(self):
+        """Test that concurrent first calls construct a single engine."""
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "test"}), patch(
+            "src.search.vector_engine.VectorSearchEngine"
+        ) as engine_cls:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                engines = list(
+                    pool.map(lambda _: mcp_server._get_vector_engine(), range(8))
+                )
+
+        engine_cls.assert_called_once()
+        assert all(engine is engine_cls.return_value for engine in engines)
+
 
 class TestIntegrationScenarios:
     """Integration tests for real-world scenarios."""
@@ -405,38 +531,38 @@ class TestIntegrationScenarios:
     def test_search_and_calculate_workflow(self):
         """Test complete workflow: search -> calculate."""
         # Step 1: Search for rates
-        search_result = json.loads(mcp_server.natural_search.fn("перегородки", limit=3))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "перегородки", limit=3))
         assert search_result["success"] is True
 
         # Step 2: Calculate cost for first result
         rate_code = search_result["results"][0]["rate_code"]
-        calc_result = json.loads(mcp_server.quick_calculate.fn(rate_code, 100))
+        calc_result = json.loads(call_tool(mcp_server.quick_calculate, rate_code, 100))
         assert calc_result["success"] is True
         assert calc_result["quantity"] == 100
 
         # Step 3: Get detailed breakdown
-        details_result = json.loads(mcp_server.show_rate_details.fn(rate_code, 100))
+        details_result = json.loads(call_tool(mcp_server.show_rate_details, rate_code, 100))
         assert details_result["success"] is True
         assert details_result["total_cost"] == calc_result["calculated_total"]
 
     def test_compare_and_alternatives_workflow(self):
         """Test comparison workflow: search -> compare -> find alternatives."""
         # Step 1: Search for rates
-        search_result = json.loads(mcp_server.natural_search.fn("бетон", limit=3))
+        search_result = json.loads(call_tool(mcp_server.natural_search, "бетон", limit=3))
         rate_codes = [r["rate_code"] for r in search_result["results"][:3]]
 
         # Step 2: Compare rates
-        compare_result = json.loads(mcp_server.compare_variants.fn(rate_codes, 50))
+        compare_result = json.loads(call_tool(mcp_server.compare_variants, rate_codes, 50))
         assert compare_result["success"] is True
 
         # Step 3: Find alternatives for cheapest
         cheapest_code = compare_result["comparison"][0]["rate_code"]
-        alternatives_result = json.loads(mcp_server.find_similar_rates.fn(cheapest_code, 5))
+        alternatives_result = json.loads(call_tool(mcp_server.find_similar_rates, cheapest_code, 5))
         assert alternatives_result["success"] is True
 
     def test_auto_calculate_with_description(self):
         """Test automatic calculation from description."""
-        result = json.loads(mcp_server.quick_calculate.fn("устройство перегородок", 75))
+        result = json.loads(call_tool(mcp_server.quick_calculate, "устройство перегородок", 75))
 
         assert result["success"] is True
         assert result["search_used"] is True
@@ -18,6 +18,7 @@ import os
 from pathlib import Path
 
 from src.database.db_manager import DatabaseManager
+from src.database.sqlite_pool import SqlitePool
 from src.search.rate_comparator import RateComparator
 
 
@@ -93,6 +94,29 @@ def temp_database_with_data(temp_database):
     return temp_database
 
 
+@pytest.fixture
+def cost_database(tmp_path):
+    """
+    Fixture providing a database with the rate cost columns used by compare().
+    """
+    path = str(tmp_path / "costs.db")
+    with DatabaseManager(path) as db:
+        db.execute_update(
+            """CREATE TABLE rates (
+                   rate_code TEXT PRIMARY KEY, rate_full_name TEXT, unit_type TEXT,
+                   unit_quantity REAL, total_cost REAL, material_cost REAL,
+                   labor_cost REAL, machine_cost REAL)"""
+        )
+        db.execute_many(
+            "INSERT INTO rates VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                ('10-05-001-01', 'Устройство перегородок ГКЛ', 'м2', 100, 8500, 6000, 2000, 500),
+                ('10-06-037-02', 'Перегородки из ГВЛ', 'м2', 100, 7000, 5000, 1500, 500),
+            ],
+        )
+    return path
+
+
 # ============================================================================
 # Initialization Tests
 # ============================================================================
@@ -488,6 +512,63 @@ class TestExtractKeywordsMethod:
         assert keywords == "бетон* AND работы* AND монтаж*"
 
 
+class TestCompareRatesMethod:
+    """Tests for compare_rates() method."""
+
+    def test_compare_rates_returns_records(self, cost_database):
+        """Test that comparison rows are returned as dicts, cheapest first."""
+        comparator = RateComparator(cost_database)
+        result = comparator.compare_rates(['10-05-001-01', '10-06-037-02'], quantity=50)
+
+        comparison = result['comparison']
+        assert [row['rate_code'] for row in comparison] == ['10-06-037-02', '10-05-001-01']
+        assert comparison[0]['total_for_quantity'] == 3500.0
+        assert comparison[1]['difference_from_cheapest'] == 750.0
+
+    def test_compare_rates_with_shared_pool(self, cost_database):
+        """Test that a shared SqlitePool is used instead of a new connection."""
+        pool = SqlitePool(cost_database, size=1)
+        pool.open()
+        try:
+            comparator = RateComparator('/nonexistent/estimates.db', db_manager=pool)
+            result = comparator.compare_rates(['10-05-001-01'], quantity=100)
+        finally:
+            pool.close()
+
+        assert result['comparison'][0]['total_for_quantity'] == 8500.0
+
+    def test_shared_pool_checked_out_once_per_call(self, cost_database):
+        """Test that one pooled connection serves every query of a call."""
+        pool = SqlitePool(cost_database, size=1)
+        pool.open()
+        try:
+            comparator = RateComparator('/nonexistent/estimates.db', db_manager=pool)
+            with comparator._db() as db:
+                assert isinstance(db, DatabaseManager)
+                with pytest.raises(TimeoutError):
+                    with pool.acquire(timeout=0.01):
+                        pass
+        finally:
+            pool.close()
+
+    def test_compare_rates_missing_code_raises_error(self, cost_database):
+        """Test that an unknown rate code raises ValueError."""
+        comparator = RateComparator(cost_database)
+        with pytest.raises(ValueError, match="not found"):
+            comparator.compare_rates(['10-05-001-01', '99-99-999-99'], quantity=10)
+
+    def test_compare_records_match_compare_frame(self, cost_database):
+        """Test that compare_records() returns the same rows as compare()."""
+        comparator = RateComparator(cost_database)
+        records = comparator.compare_records(['10-05-001-01', '10-06-037-02'], quantity=50)
+        df = comparator.compare(['10-05-001-01', '10-06-037-02'], quantity=50)
+
+        assert isinstance(records, list)
+        assert records == df.to_dict(orient='records')
+        assert list(records[0]) == list(df.columns)
+        assert records[1]['difference_percent'] == 21.43
+
+
 # ============================================================================
 # Edge Cases and Error Handling Tests
 # ============================================================================
@@ -11,7 +11,7 @@ Tests for full-text search and code-based search functionality including:
 
 import pytest
 import sqlite3
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from src.search.search_engine import SearchEngine
 from src.database.db_manager import DatabaseManager
 
@@ -453,3 +453,54 @@ class TestSearchByCode:
         call_args = mock_db_manager.execute_query.call_args
         params = call_args[0][1]
         assert params[0] == 'RATE-001%'
+
+
+# ============================================================================
+# Test: resolve_identifier() method
+# ============================================================================
+
+class TestResolveIdentifier:
+    """Test suite for single-query code/description resolution."""
+
+    def test_exact_code_match(self, search_engine, mock_db_manager):
+        """Test that an exact code hit is reported without search."""
+        mock_db_manager.execute_query.return_value = [('10-05-001-01', 0, 0.0)]
+
+        assert search_engine.resolve_identifier('10-05-001-01') == ('10-05-001-01', False)
+
+        sql, params = mock_db_manager.execute_query.call_args[0]
+        assert 'UNION ALL' in sql
+        assert 'LIMIT 1' in sql
+        assert params[0] == '10-05-001-01'
+
+    def test_fts_match(self, search_engine, mock_db_manager):
+        """Test that a full-text hit is reported as search_used."""
+        mock_db_manager.execute_query.return_value = [('10-05-001-01', 1, -2.5)]
+
+        with patch('src.search.search_engine.prepare_fts_query', return_value='перегородки*'):
+            result = search_engine.resolve_identifier('перегородки')
+
+        assert result == ('10-05-001-01', True)
+        params = mock_db_manager.execute_query.call_args[0][1]
+        assert params == ('перегородки', 'перегородки*')
+
+    def test_no_match_returns_none(self, search_engine, mock_db_manager):
+        """Test that no rows resolves to None."""
+        mock_db_manager.execute_query.return_value = []
+
+        assert search_engine.resolve_identifier('несуществующая работа') is None
+
+    def test_unsearchable_identifier_uses_exact_match_only(self, search_engine, mock_db_manager):
+        """Test that identifiers empty after normalization skip FTS."""
+        mock_db_manager.execute_query.return_value = []
+
+        assert search_engine.resolve_identifier('!!!') is None
+
+        sql, params = mock_db_manager.execute_query.call_args[0]
+        assert 'MATCH' not in sql
+        assert params == ('!!!',)
+
+    def test_empty_identifier_raises_valueerror(self, search_engine):
+        """Test that empty identifier raises ValueError."""
+        with pytest.raises(ValueError, match="cannot be empty"):
+            search_engine.resolve_identifier('   ')
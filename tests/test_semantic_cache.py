@@ -0,0 +1,219 @@
+"""
+Unit Tests for SemanticCache Module
+
+Tests for the embedding-keyed vector search result cache including:
+- Exact query hits without an embedding
+- Near-duplicate hits by cosine similarity
+- Namespace isolation and TTL expiry
+- VectorSearchEngine integration
+"""
+
+import sqlite3
+import struct
+import time
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from src.search.semantic_cache import SemanticCache
+from src.search.vector_engine import VectorSearchEngine
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+def _blob(*values):
+    """Serialize a normalized float32 vector."""
+    vector = np.array(values, dtype=np.float32)
+    vector = vector / np.linalg.norm(vector)
+    return struct.pack(f"{len(vector)}f", *vector)
+
+
+SAMPLE_RESULTS = [
+    {"rate_code": "10-05-001-01", "rate_full_name": "Перегородки", "similarity": 0.91}
+]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Open a SemanticCache in a temporary directory."""
+    cache = SemanticCache(str(tmp_path / "semantic_cache.db"))
+    cache.open()
+    yield cache
+    cache.close()
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestSemanticCache:
+    """Test suite for SemanticCache lookups."""
+
+    def test_invalid_threshold(self, tmp_path):
+        """Test that a threshold outside (0, 1] is rejected."""
+        with pytest.raises(ValueError, match="similarity_threshold"):
+            SemanticCache(str(tmp_path / "c.db"), similarity_threshold=0.0)
+
+    def test_exact_hit_normalizes_query(self, cache):
+        """Test that case and whitespace differences still hit."""
+        cache.put("Монтаж перегородок", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+
+        assert cache.get_exact("  монтаж   ПЕРЕГОРОДОК ", "ns") == SAMPLE_RESULTS
+        assert cache.get_exact("монтаж стен", "ns") is None
+
+    def test_similar_hit_above_threshold(self, cache):
+        """Test that a near-duplicate embedding returns cached results."""
+        cache.put("монтаж перегородок", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+
+        assert cache.get_similar(_blob(1, 0.1, 0), "ns") == SAMPLE_RESULTS
+
+    def test_similar_miss_below_threshold(self, cache):
+        """Test that a distant embedding is a miss."""
+        cache.put("монтаж перегородок", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+
+        assert cache.get_similar(_blob(0, 1, 0), "ns") is None
+
+    def test_namespace_isolation(self, cache):
+        """Test that entries from other search parameters are not returned."""
+        ns_m2 = SemanticCache.make_namespace({"unit_type": "м2"}, 10, 0.0)
+        ns_m3 = SemanticCache.make_namespace({"unit_type": "м3"}, 10, 0.0)
+        cache.put("бетон", ns_m2, _blob(1, 0, 0), SAMPLE_RESULTS)
+
+        assert cache.get_exact("бетон", ns_m3) is None
+        assert cache.get_similar(_blob(1, 0, 0), ns_m3) is None
+
+    def test_expired_entries_ignored(self, cache):
+        """Test that entries older than ttl are misses."""
+        cache.put("бетон", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+        cache.ttl = -1
+
+        assert cache.get_exact("бетон", "ns") is None
+        assert cache.get_similar(_blob(1, 0, 0), "ns") is None
+
+
+    def test_sees_entries_from_other_connections(self, cache, tmp_path):
+        """Test that rows written by another process are picked up."""
+        assert cache.get_similar(_blob(1, 0, 0), "ns") is None
+
+        other = SemanticCache(cache.db_path)
+        other.open()
+        other.put("монтаж перегородок", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+        other.close()
+
+        assert cache.get_similar(_blob(1, 0.1, 0), "ns") == SAMPLE_RESULTS
+
+    def test_restored_query_replaces_embedding(self, cache):
+        """Test that storing a query again replaces its in-memory row."""
+        cache.put("монтаж перегородок", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+        assert cache.get_similar(_blob(1, 0, 0), "ns") == SAMPLE_RESULTS
+
+        cache.put("монтаж перегородок", "ns", _blob(0, 1, 0), [])
+
+        assert cache.get_similar(_blob(1, 0, 0), "ns") is None
+        assert cache.get_similar(_blob(0, 1, 0), "ns") == []
+        assert len(cache._matrices["ns"]["queries"]) == 1
+
+    def test_sees_rows_committed_with_older_ts(self, cache):
+        """Test that a row committed later with an older ts is still loaded."""
+        cache.put("бетон", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+        assert cache.get_similar(_blob(0, 1, 0), "ns") is None
+
+        other = SemanticCache(cache.db_path)
+        other.open()
+        with patch(
+            "src.search.semantic_cache.time.time", return_value=time.time() - 60
+        ):
+            other.put("кирпич", "ns", _blob(0, 1, 0), [])
+        other.close()
+
+        assert cache.get_similar(_blob(0, 1, 0), "ns") == []
+
+    def test_sees_rows_stored_after_newest_deleted(self, cache):
+        """Test that ids freed by deleting the newest rows are not reused."""
+        cache.put("бетон", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+        assert cache.get_similar(_blob(0, 1, 0), "ns") is None
+
+        other = SemanticCache(cache.db_path)
+        other.open()
+        other.db_manager.execute_update("DELETE FROM cache_embeddings")
+        other.put("кирпич", "ns", _blob(0, 1, 0), [])
+        other.close()
+
+        assert cache.get_similar(_blob(0, 1, 0), "ns") == []
+
+    def test_open_recreates_table_without_id(self, tmp_path):
+        """Test that a cache file from before the id column is rebuilt."""
+        db_path = str(tmp_path / "c.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE cache_embeddings (query_hash TEXT, namespace TEXT, "
+            "query TEXT, embedding BLOB, results TEXT, ts REAL, "
+            "PRIMARY KEY (query_hash, namespace))"
+        )
+        conn.close()
+
+        cache = SemanticCache(db_path)
+        cache.open()
+        try:
+            cache.put("бетон", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+            assert cache.get_similar(_blob(1, 0, 0), "ns") == SAMPLE_RESULTS
+        finally:
+            cache.close()
+
+    def test_max_entries_keeps_newest(self, tmp_path):
+        """Test that only the newest max_entries embeddings stay in memory."""
+        cache = SemanticCache(str(tmp_path / "c.db"), max_entries=1)
+        cache.open()
+        try:
+            cache.put("бетон", "ns", _blob(1, 0, 0), SAMPLE_RESULTS)
+            cache.put("кирпич", "ns", _blob(0, 1, 0), [])
+
+            assert cache.get_similar(_blob(1, 0, 0), "ns") is None
+            assert cache.get_similar(_blob(0, 1, 0), "ns") == []
+        finally:
+            cache.close()
+
+
+class TestVectorSearchEngineCache:
+    """Test suite for VectorSearchEngine with a SemanticCache."""
+
+    @pytest.fixture
+    def engine(self, cache):
+        """VectorSearchEngine with a mocked embedding call and DB."""
+        with patch("src.search.vector_engine.OpenAI"):
+            engine = VectorSearchEngine(
+                db_manager=Mock(), api_key="test", semantic_cache=cache
+            )
+        engine._encode_query = Mock(return_value=np.array([1, 0, 0], dtype=np.float32))
+        engine.search_with_embedding = Mock(return_value=SAMPLE_RESULTS)
+        return engine
+
+    def test_repeat_query_skips_embedding(self, engine):
+        """Test that a repeated query does not call the embedding API."""
+        assert engine.search("перегородки", limit=5) == SAMPLE_RESULTS
+        assert engine.search("перегородки", limit=5) == SAMPLE_RESULTS
+
+        assert engine._encode_query.call_count == 1
+        assert engine.search_with_embedding.call_count == 1
+
+    def test_near_duplicate_skips_vector_search(self, engine):
+        """Test that a near-duplicate query reuses cached results."""
+        engine.search("перегородки", limit=5)
+        engine.search("перегородки гипсокартонные", limit=5)
+
+        assert engine._encode_query.call_count == 2
+        assert engine.search_with_embedding.call_count == 1
+
+    def test_prepare_and_store_results(self, engine):
+        """Test the split search used by callers that pool DB connections."""
+        cached, query_vector = engine.prepare_search("перегородки", limit=5)
+        assert cached is None
+        engine.store_results("перегородки", query_vector, 5, None, 0.0, SAMPLE_RESULTS)
+
+        cached, query_vector = engine.prepare_search("перегородки", limit=5)
+        assert cached == SAMPLE_RESULTS
+        assert query_vector is None
+        assert engine._encode_query.call_count == 1
@@ -0,0 +1,238 @@
+"""
+Unit Tests for SqlitePool Module
+
+This module tests the SqlitePool class that keeps a fixed set of SQLite
+connections open for concurrent readers.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.database.sqlite_pool import SqlitePool
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Create a small database with a rates table."""
+    path = tmp_path / "pool_test.db"
+    with DatabaseManager(str(path)) as db:
+        db.execute_update(
+            "CREATE TABLE rates (rate_code TEXT PRIMARY KEY, total_cost REAL)"
+        )
+        db.execute_many(
+            "INSERT INTO rates VALUES (?, ?)",
+            [("10-05-001-01", 100.0), ("10-06-037-02", 200.0)],
+        )
+    return str(path)
+
+
+@pytest.fixture
+def pool(db_path):
+    """Open a pool with two connections."""
+    pool = SqlitePool(db_path, size=2)
+    pool.open()
+    yield pool
+    pool.close()
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestSqlitePoolLifecycle:
+    """Test opening and closing the pool."""
+
+    def test_invalid_size(self, db_path):
+        """Test that non-positive size is rejected."""
+        with pytest.raises(ValueError, match="greater than 0"):
+            SqlitePool(db_path, size=0)
+
+    def test_open_and_close(self, db_path):
+        """Test that open() creates connections and close() releases them."""
+        pool = SqlitePool(db_path, size=3)
+        assert pool.is_open is False
+
+        pool.open()
+        assert pool.is_open is True
+
+        pool.close()
+        assert pool.is_open is False
+
+    def test_acquire_requires_open_pool(self, db_path):
+        """Test that acquire() fails on a pool that was not opened."""
+        pool = SqlitePool(db_path, size=1)
+        with pytest.raises(RuntimeError, match="not open"):
+            with pool.acquire():
+                pass
+
+
+class TestSqlitePoolAcquire:
+    """Test connection checkout behaviour."""
+
+    def test_acquire_returns_distinct_connections(self, pool):
+        """Test that nested acquires get different connections."""
+        with pool.acquire() as first, pool.acquire() as second:
+            assert first is not second
+            assert first.connection is not second.connection
+
+    def test_acquire_timeout_when_exhausted(self, pool):
+        """Test that acquire() times out when all connections are in use."""
+        with pool.acquire(), pool.acquire():
+            with pytest.raises(TimeoutError):
+                with pool.acquire(timeout=0.01):
+                    pass
+
+    def test_connection_returned_after_use(self, pool):
+        """Test that a released connection can be acquired again."""
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as again, pool.acquire() as other:
+            assert first in (again, other)
+
+    def test_pragmas_applied_per_connection(self, pool):
+        """Test that pool PRAGMAs are set on every connection."""
+        with pool.acquire() as first, pool.acquire() as second:
+            for db in (first, second):
+                assert db.execute_query("PRAGMA cache_size")[0][0] == -65536
+
+    def test_connections_are_read_only(self, pool):
+        """Test that pooled connections reject writes (query_only)."""
+        with pool.acquire() as db:
+            with pytest.raises(sqlite3.Error):
+                db.execute_update("DELETE FROM rates")
+
+        assert pool.execute_query("SELECT COUNT(*) FROM rates") == [(2,)]
+
+    def test_connections_opened_with_mode_ro(self, pool):
+        """Test that readers are opened read-only, not just query_only."""
+        with pool.read() as db:
+            db.execute_query("PRAGMA query_only = 0")
+            with pytest.raises(sqlite3.Error, match="readonly database"):
+                db.execute_update("DELETE FROM rates")
+
+
+class TestSqlitePoolWrite:
+    """Test the single writer connection."""
+
+    def test_write_visible_to_readers(self, pool):
+        """Test that a write through write() is seen by pooled readers."""
+        with pool.write() as db:
+            db.execute_update(
+                "INSERT INTO rates VALUES (?, ?)", ("11-01-011-01", 300.0)
+            )
+
+        assert pool.execute_query("SELECT COUNT(*) FROM rates") == [(3,)]
+
+    def test_write_reuses_one_connection(self, pool):
+        """Test that every write() yields the same connection."""
+        with pool.write() as first:
+            pass
+        with pool.write() as second:
+            assert second is first
+
+    def test_write_timeout_when_busy(self, pool):
+        """Test that a second writer times out while the first holds it."""
+        with pool.write():
+            with pytest.raises(TimeoutError):
+                with pool.write(timeout=0.01):
+                    pass
+
+    def test_write_requires_open_pool(self, db_path):
+        """Test that write() fails on a pool that was not opened."""
+        with pytest.raises(RuntimeError, match="not open"):
+            with SqlitePool(db_path, size=1).write():
+                pass
+
+
+class TestSqlitePoolExecuteQuery:
+    """Test the DatabaseManager-compatible execute_query()."""
+
+    def test_execute_query(self, pool):
+        """Test that execute_query() returns rows."""
+        rows = pool.execute_query(
+            "SELECT total_cost FROM rates WHERE rate_code = ?", ("10-05-001-01",)
+        )
+        assert rows == [(100.0,)]
+
+    def test_execute_query_times_out_when_exhausted(self, db_path):
+        """Test that execute_query() and acquire() wait at most the pool timeout."""
+        with SqlitePool(db_path, size=1, timeout=0.01) as pool:
+            with pool.acquire():
+                with pytest.raises(TimeoutError):
+                    pool.execute_query("SELECT 1")
+                with pytest.raises(TimeoutError):
+                    with pool.acquire():
+                        pass
+
+            assert pool.execute_query("SELECT 1") == [(1,)]
+
+    def test_execute_query_concurrent(self, pool):
+        """Test that concurrent queries from several threads all succeed."""
+        errors = []
+        counts = []
+
+        def worker():
+            try:
+                for _ in range(20):
+                    counts.append(pool.execute_query("SELECT COUNT(*) FROM rates")[0][0])
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert counts == [2] * 80
+
+
+class TestSqlitePoolPrewarm:
+    """Test FTS5 optimize and warmup on startup."""
+
+    @pytest.fixture
+    def fts_pool(self, db_path):
+        """Open a pool on a database with a rates_fts index."""
+        with DatabaseManager(db_path) as db:
+            db.execute_update(
+                "CREATE VIRTUAL TABLE rates_fts USING fts5(rate_code, rate_full_name)"
+            )
+            db.execute_update(
+                "INSERT INTO rates_fts VALUES ('10-05-001-01', 'Бетон монолитный')"
+            )
+        pool = SqlitePool(db_path, size=2)
+        pool.open()
+        yield pool
+        pool.close()
+
+    def test_prewarm(self, fts_pool):
+        """Test that prewarm() optimizes the index and keeps the pool usable."""
+        fts_pool.prewarm()
+
+        rows = fts_pool.execute_query(
+            "SELECT rate_code FROM rates_fts WHERE rates_fts MATCH ?", ("бетон",)
+        )
+        assert rows == [("10-05-001-01",)]
+
+    def test_prewarm_without_optimize_stays_read_only(self, fts_pool):
+        """Test that prewarm(optimize=False) does not open the writer."""
+        fts_pool.prewarm(optimize=False)
+
+        assert fts_pool._writer is None
+
+    def test_prewarm_without_fts_table(self, pool):
+        """Test that a missing FTS table only logs a warning."""
+        pool.prewarm()
+
+    def test_prewarm_requires_open_pool(self, db_path):
+        """Test that prewarm() fails on a pool that was not opened."""
+        with pytest.raises(RuntimeError, match="not open"):
+            SqlitePool(db_path, size=1).prewarm()
@@ -0,0 +1,273 @@
+"""
+Unit Tests for Vector Search Engine Module
+
+Tests for VectorSearchEngine embedding helpers with a mocked OpenAI client.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from src.database.db_manager import DatabaseManager
+from src.search.vector_engine import VectorSearchEngine
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture
+def engine():
+    """VectorSearchEngine with a mocked OpenAI client."""
+    with patch("src.search.vector_engine.OpenAI"):
+        engine = VectorSearchEngine(db_manager=Mock(), api_key="test")
+    return engine
+
+
+def _embeddings_response(*vectors):
+    """Build an OpenAI-like embeddings response."""
+    return SimpleNamespace(
+        data=[SimpleNamespace(embedding=list(v)) for v in vectors]
+    )
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+class TestEmbedMany:
+    """Test suite for batched query embedding."""
+
+    def test_single_api_call(self, engine):
+        """Test that all texts are embedded in one request."""
+        engine.client.embeddings.create.return_value = _embeddings_response(
+            [3.0, 4.0], [0.0, 2.0]
+        )
+
+        embeddings = engine.embed_many(["бетон", "перегородки"])
+
+        engine.client.embeddings.create.assert_called_once_with(
+            input=["бетон", "перегородки"], model=engine.model_name
+        )
+        assert len(embeddings) == 2
+        np.testing.assert_allclose(embeddings[0], [0.6, 0.8])
+        np.testing.assert_allclose(embeddings[1], [0.0, 1.0])
+
+    def test_single_api_call_above_embed_batch_size(self, engine):
+        """Test that 300 texts (over embed_batch()'s 256) take one request."""
+        engine.client.embeddings.create.return_value = _embeddings_response(
+            *[[1.0, 0.0]] * 300
+        )
+
+        embeddings = engine.embed_many([f"запрос {i}" for i in range(300)])
+
+        assert engine.client.embeddings.create.call_count == 1
+        assert len(embeddings) == 300
+
+    def test_empty_input(self, engine):
+        """Test that no request is made for an empty list."""
+        assert engine.embed_many([]) == []
+        engine.client.embeddings.create.assert_not_called()
+
+
+class TestEmbedQuery:
+    """Test suite for the in-memory query embedding cache."""
+
+    def test_repeat_query_skips_api_call(self, engine):
+        """Test that a repeated query (case/whitespace aside) is embedded once."""
+        engine.client.embeddings.create.return_value = _embeddings_response([3.0, 4.0])
+
+        first = engine.embed_query("Бетон  монолитный")
+        second = engine.embed_query(" бетон монолитный ")
+
+        # The query text is embedded as given; normalization is only the key
+        engine.client.embeddings.create.assert_called_once_with(
+            input="Бетон  монолитный", model=engine.model_name
+        )
+        np.testing.assert_allclose(first, [0.6, 0.8])
+        np.testing.assert_array_equal(first, second)
+
+    def test_search_uses_cached_embedding(self, engine):
+        """Test that search() embeds a repeated query only once."""
+        engine.client.embeddings.create.return_value = _embeddings_response([1.0, 0.0])
+        engine.search_with_embedding = Mock(return_value=[])
+
+        engine.search("перегородки", limit=5)
+        engine.search("перегородки", limit=5)
+
+        assert engine.client.embeddings.create.call_count == 1
+        assert engine.search_with_embedding.call_count == 2
+
+    def test_cache_disabled(self):
+        """Test that embedding_cache_size=0 embeds every call."""
+        with patch("src.search.vector_engine.OpenAI"):
+            engine = VectorSearchEngine(
+                db_manager=Mock(), api_key="test", embedding_cache_size=0
+            )
+        engine.client.embeddings.create.return_value = _embeddings_response([1.0, 0.0])
+
+        engine.embed_query("бетон")
+        engine.embed_query("бетон")
+
+        assert engine.client.embeddings.create.call_count == 2
+
+
+class TestVecIndex:
+    """Test suite for KNN search on the rates_vec vec0 index."""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Database with three embedded rates (3-dimensional vectors)."""
+        db = DatabaseManager(str(tmp_path / "vec.db"))
+        db.connect()
+        db.execute_update(
+            """
+            CREATE TABLE rates (
+                rate_code TEXT PRIMARY KEY, rate_full_name TEXT, unit_type TEXT,
+                unit_quantity REAL, total_cost REAL, labor_cost REAL,
+                machine_cost REAL, material_cost REAL, embedding BLOB
+            )
+            """
+        )
+        vectors = {
+            "10-05-001-01": [1.0, 0.0, 0.0],
+            "10-05-001-02": [0.8, 0.6, 0.0],
+            "11-01-011-01": [0.0, 0.0, 1.0],
+        }
+        db.execute_many(
+            "INSERT INTO rates VALUES (?, ?, 'м2', 100, 1000, 100, 10, 890, ?)",
+            [
+                (code, f"Перегородки {code}", np.asarray(v, np.float32).tobytes())
+                for code, v in vectors.items()
+            ],
+        )
+        yield db
+        db.disconnect()
+
+    def _engine(self, db, use_vec_index=True):
+        with patch("src.search.vector_engine.OpenAI"):
+            engine = VectorSearchEngine(
+                db_manager=db, api_key="test", use_vec_index=use_vec_index
+            )
+        engine.embedding_dim = 3
+        return engine
+
+    def test_index_matches_brute_force(self, db):
+        """Test that KNN results equal the vec_distance_cosine scan."""
+        engine = self._engine(db)
+        assert engine.sync_vec_index() == 3
+
+        query = np.array([0.9, 0.1, 0.0], dtype=np.float32)
+        indexed = engine.search_with_embedding(query, limit=2)
+        scanned = self._engine(db, use_vec_index=False).search_with_embedding(
+            query, limit=2
+        )
+
+        assert [r["rate_code"] for r in indexed] == ["10-05-001-01", "10-05-001-02"]
+        assert [r["rate_code"] for r in indexed] == [r["rate_code"] for r in scanned]
+        for a, b in zip(indexed, scanned):
+            assert a["distance"] == pytest.approx(b["distance"], abs=1e-6)
+            assert a["total_cost"] == b["total_cost"]
+
+    def test_index_similarity_threshold(self, db):
+        """Test that the threshold is applied to KNN results."""
+        engine = self._engine(db)
+        engine.sync_vec_index()
+
+        results = engine.search_with_embedding(
+            np.array([1.0, 0.0, 0.0], dtype=np.float32),
+            limit=3,
+            similarity_threshold=0.9,
+        )
+
+        assert [r["rate_code"] for r in results] == ["10-05-001-01"]
+
+    def test_missing_index_falls_back_to_scan(self, db):
+        """Test that search works on a database without rates_vec."""
+        engine = self._engine(db)
+
+        results = engine.search_with_embedding(
+            np.array([0.0, 0.0, 1.0], dtype=np.float32), limit=1
+        )
+
+        assert engine._has_vec_index is False
+        assert [r["rate_code"] for r in results] == ["11-01-011-01"]
+
+    def test_int8_index_reranks_with_float32(self, db):
+        """Test that an int8 index returns exact float32 distances."""
+        engine = self._engine(db)
+        assert engine.sync_vec_index(int8=True) == 3
+        assert db.execute_query("SELECT length(embedding) FROM rates_vec") == [
+            (3,)
+        ] * 3
+
+        query = np.array([0.9, 0.1, 0.0], dtype=np.float32)
+        indexed = engine.search_with_embedding(query, limit=2, similarity_threshold=0.5)
+        scanned = self._engine(db, use_vec_index=False).search_with_embedding(
+            query, limit=2, similarity_threshold=0.5
+        )
+
+        assert engine._vec_index_int8 is True
+        assert [r["rate_code"] for r in indexed] == [r["rate_code"] for r in scanned]
+        assert [r["distance"] for r in indexed] == [r["distance"] for r in scanned]
+
+    def test_existing_index_keeps_element_type(self, db):
+        """Test that syncing into an int8 index quantizes new rows too."""
+        self._engine(db).sync_vec_index(int8=True)
+
+        engine = self._engine(db)
+        assert engine.sync_vec_index(["10-05-001-01"]) == 1
+        assert engine._vec_index_int8 is True
+
+    def test_sync_selected_rates(self, db):
+        """Test that syncing given codes replaces only their index rows."""
+        engine = self._engine(db)
+        engine.sync_vec_index()
+        db.execute_update(
+            "UPDATE rates SET embedding = ? WHERE rate_code = ?",
+            (np.array([0.0, 0.0, 1.0], np.float32).tobytes(), "10-05-001-01"),
+        )
+
+        assert engine.sync_vec_index(["10-05-001-01"]) == 1
+
+        results = engine.search_with_embedding(
+            np.array([0.0, 0.0, 1.0], dtype=np.float32), limit=2
+        )
+        assert {r["rate_code"] for r in results} == {"10-05-001-01", "11-01-011-01"}
+
+
+class TestEmbedBatch:
+    """Test suite for chunked batch embedding."""
+
+    def test_one_request_per_batch(self, engine):
+        """Test that texts are sent batch_size at a time, order preserved."""
+        engine.client.embeddings.create.side_effect = lambda input, model: (
+            _embeddings_response(*[[float(len(t)), 0.0] for t in input])
+        )
+        texts = ["а", "бб", "ввв", "гггг", "ддддд"]
+
+        embeddings = engine.embed_batch(texts, batch_size=2)
+
+        calls = engine.client.embeddings.create.call_args_list
+        batches = [c.kwargs["input"] for c in calls]
+        assert batches == [["а", "бб"], ["ввв", "гггг"], ["ддддд"]]
+        assert len(embeddings) == 5
+        np.testing.assert_allclose(embeddings[0], [1.0, 0.0])
+
+    def test_zero_vector_not_normalized(self, engine):
+        """Test that an all-zero embedding stays zero instead of NaN."""
+        engine.client.embeddings.create.return_value = _embeddings_response(
+            [0.0, 0.0], [3.0, 4.0]
+        )
+
+        embeddings = engine.embed_batch(["а", "б"])
+
+        np.testing.assert_array_equal(embeddings[0], [0.0, 0.0])
+        np.testing.assert_allclose(embeddings[1], [0.6, 0.8])
+
+    def test_invalid_batch_size(self, engine):
+        """Test that batch_size outside 1-2048 is rejected."""
+        with pytest.raises(ValueError, match="batch_size"):
+            engine.embed_batch(["бетон"], batch_size=0)
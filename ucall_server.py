@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+UCall JSON-RPC server for the hot Construction Estimator endpoints.
+
+Serves natural_search and show_rate_details over JSON-RPC using UCall, which
+parses requests in native code (io_uring on Linux >= 5.19, POSIX sockets
+elsewhere) instead of going through FastAPI/Pydantic. Runs next to
+api_server.py on its own port; browser/CORS routes stay on FastAPI.
+
+Requires the optional ucall package:
+    pip install ucall
+
+Usage:
+    python ucall_server.py --port 8545 --db data/processed/estimates.db
+
+Example request:
+    {"jsonrpc": "2.0", "id": 1, "method": "natural_search",
+     "params": {"query": "перегородки", "limit": 5}}
+"""
+
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.database.sqlite_pool import SqlitePool
+from src.search.search_engine import SearchEngine
+from src.search.cost_calculator import CostCalculator, cost_summary
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def create_server(port: int, threads: int):
+    """
+    Create a UCall server, preferring the io_uring backend.
+
+    Args:
+        port: Port to listen on
+        threads: Number of worker threads
+
+    Returns:
+        UCall Server instance
+
+    Raises:
+        ImportError: If ucall is not installed
+    """
+    try:
+        from ucall.uring import Server
+        backend = "io_uring"
+    except ImportError:
+        # io_uring backend needs Linux >= 5.19
+        from ucall.posix import Server
+        backend = "posix"
+
+    logger.info("UCall backend: %s", backend)
+    return Server(port=port, threads=threads)
+
+
+def register_handlers(server, search_engine: SearchEngine, cost_calculator: CostCalculator):
+    """
+    Register JSON-RPC methods on the server.
+
+    Responses have the same shape as the matching api_server.py endpoints.
+    """
+
+    @server
+    def natural_search(query: str, limit: int = 20, unit_type: str = None):
+        filters = {"unit_type": unit_type} if unit_type else None
+        results = search_engine.search(query=query, filters=filters, limit=limit)
+        return {"success": True, "count": len(results), "results": results}
+
+    @server
+    def show_rate_details(rate_code: str, quantity: float = 1.0):
+        result = cost_calculator.get_detailed_breakdown(
+            rate_code=rate_code, quantity=quantity
+        )
+        return {**cost_summary(result), "breakdown": result.get("breakdown", [])}
+
+
+def start_ucall_server(port=8545, db_path='data/processed/estimates.db', threads=None):
+    """
+    Start the UCall JSON-RPC server.
+
+    Args:
+        port: Port to listen on (default: 8545)
+        db_path: Path to database file
+        threads: Worker threads (default: number of CPU cores)
+    """
+    threads = threads or os.cpu_count() or 1
+
+    if not Path(db_path).exists():
+        logger.error("Database file not found: %s", db_path)
+        sys.exit(1)
+
+    try:
+        server = create_server(port, threads)
+    except ImportError:
+        logger.error("ucall is not installed. Install it with: pip install ucall")
+        sys.exit(1)
+
+    # One pooled connection per server thread
+    db_pool = SqlitePool(db_path, size=threads)
+    db_pool.open()
+    db_pool.prewarm(optimize=False)
+
+    register_handlers(server, SearchEngine(db_pool), CostCalculator(db_pool))
+    logger.info("UCall server listening on port %d with %d threads", port, threads)
+
+    try:
+        server.run()
+    except KeyboardInterrupt:
+        logger.info("UCall server shutting down...")
+    finally:
+        db_pool.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='UCall JSON-RPC server')
+    parser.add_argument('--port', type=int, default=int(os.getenv("UCALL_PORT", "8545")),
+                        help='Port to listen on')
+    parser.add_argument('--db', type=str,
+                        default=os.getenv("DATABASE_PATH", "data/processed/estimates.db"),
+                        help='Database path')
+    parser.add_argument('--threads', type=int, default=None, help='Worker threads')
+
+    args = parser.parse_args()
+
+    start_ucall_server(port=args.port, db_path=args.db, threads=args.threads)